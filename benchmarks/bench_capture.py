@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Benchmark da captura de quadros (vazão sustentada).
+
+Renderiza um shader simples sem janela (EGL) e grava os quadros de duas
+formas: com glReadPixels síncrono seguido da gravação no mesmo laço, e com
+FrameCapture (anel de PBOs mapeados alguns quadros depois e gravados por
+outra thread). Mostra quadros por segundo e MB/s para cada destino. A
+medida começa depois de `WARMUP` quadros (fora a criação do contexto e a
+compilação dos shaders) e termina quando o último quadro foi gravado.
+
+A captura assíncrona só compensa quando a GPU e a CPU trabalham em paralelo
+(GPU dedicada, ou vários núcleos para o driver e para a thread de gravação).
+Com o llvmpipe em um núcleo só, renderização, cópia e gravação disputam o
+mesmo processador: medido com `60 1920 1080`, a leitura sem gravação ficou
+entre 1.0x e 1.2x da versão síncrona, o raw entre 0.8x e 1.0x e o PNG entre
+0.9x e 1.1x.
+
+Uso:
+    python benchmarks/bench_capture.py [quadros] [largura altura]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# O PyOpenGL escolhe a plataforma ao ser importado
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador import Renderizador
+from renderizador.core.capture import PNGSequenceWriter, RawWriter
+from renderizador.graphics.state import gl_state
+
+# Quadros renderizados antes de começar a medir
+WARMUP = 5
+
+SHADER = """
+void mainImage(out vec4 fragColor, in vec2 fragCoord) {
+    vec2 uv = fragCoord / iResolution.xy;
+    fragColor = vec4(0.5 + 0.5 * cos(iTime + uv.xyx + vec3(0, 2, 4)), 1.0);
+}
+"""
+
+
+class NullWriter:
+    """Descarta os quadros (mede só a leitura)."""
+
+    def write(self, frame, index):
+        pass
+
+    def close(self):
+        pass
+
+
+def synchronous(writer):
+    """Lê com glReadPixels (bloqueante) e grava no próprio laço de renderização."""
+    def on_frame(frame, framebuffer):
+        gl_state.bind_framebuffer(GL_READ_FRAMEBUFFER, framebuffer.fbo)
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, framebuffer.width, framebuffer.height, GL_RGB, GL_UNSIGNED_BYTE)
+        writer.write(np.frombuffer(data, np.uint8).reshape(framebuffer.height, framebuffer.width, 3), frame)
+    return on_frame
+
+
+def run(frames, size, writer, asynchronous):
+    renderizador = Renderizador(resolution=size, backend=os.environ["PYOPENGL_PLATFORM"])
+    renderizador.set_shaders(fragment_shader_source=SHADER)
+    if writer is None:
+        read = None
+    elif asynchronous:
+        renderizador.set_capture(writer, buffers=6, latency=2)
+        read = None
+    else:
+        read = synchronous(writer)
+
+    # Do fim do último quadro de aquecimento até o fim da gravação
+    stamps = []
+
+    def on_frame(frame, framebuffer):
+        if read is not None:
+            read(frame, framebuffer)
+            if frame == WARMUP + frames - 1:
+                writer.close()
+        if frame == WARMUP - 1:
+            stamps.append(time.perf_counter())
+
+    # A captura assíncrona grava os quadros pendentes em stop_capture, ao fim do laço
+    stop_capture = renderizador.stop_capture
+
+    def timed_stop_capture():
+        stop_capture()
+        stamps.append(time.perf_counter())
+
+    renderizador.stop_capture = timed_stop_capture
+    renderizador.render(frames=WARMUP + frames, fps=60.0, on_frame=on_frame)
+    return stamps[1] - stamps[0]
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    size = (int(sys.argv[2]), int(sys.argv[3])) if len(sys.argv) > 3 else (1920, 1080)
+    megabytes = size[0] * size[1] * 3 / 1e6
+
+    with tempfile.TemporaryDirectory() as folder:
+        targets = {
+            "sem gravação": lambda: NullWriter(),
+            "raw RGB": lambda: RawWriter(os.path.join(folder, "video.raw")),
+            "PNG": lambda: PNGSequenceWriter(os.path.join(folder, "quadro_{:05d}.png")),
+        }
+
+        # Aquece o compilador de shaders e o driver
+        run(2, size, NullWriter(), True)
+
+        print(f"{frames} quadros de {size[0]}x{size[1]} ({megabytes:.1f} MB por quadro)")
+        print(f"  {'sem captura':14s} {frames / run(frames, size, None, False):7.1f} fps")
+        for name, make_writer in targets.items():
+            results = []
+            for asynchronous in (False, True):
+                elapsed = run(frames, size, make_writer(), asynchronous)
+                results.append(elapsed)
+            sync_fps, async_fps = (frames / elapsed for elapsed in results)
+            print(f"  {name:14s} síncrono: {sync_fps:7.1f} fps ({sync_fps * megabytes:7.1f} MB/s)"
+                  f"   PBO + thread: {async_fps:7.1f} fps ({async_fps * megabytes:7.1f} MB/s)"
+                  f"   {results[0] / results[1]:4.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Benchmark da montagem de geometria (create_geometry_data).
+
+Compara a implementação vetorizada atual com a versão original em laços
+Python e verifica que o buffer intercalado gerado é idêntico bit a bit.
+
+Os casos indexados não passam normais nem UVs explícitos, pois a versão
+original os buscava com índices errados (index[f+1] e index[f]//3).
+
+Uso:
+    python benchmarks/bench_geometry.py [numero_de_vertices]
+"""
+
+import sys
+import time
+
+import numpy as np
+from OpenGL.GL import GL_TRIANGLE_STRIP, GL_TRIANGLES
+
+from renderizador.graphics.geometry import create_geometry_data, normalize
+
+
+def legacy_strip(vertices, normals=None, colors=None, uvs=None, create_normals=False):
+    """Versão original, vértice a vértice, do caminho GL_TRIANGLE_STRIP."""
+    vertices_flat = np.asarray(vertices, np.float32).reshape(-1)
+    normals_flat = None if normals is None else np.asarray(normals, np.float32).reshape(-1)
+    colors_flat = None if colors is None else np.asarray(colors, np.float32).reshape(-1)
+    uvs_flat = None if uvs is None else np.asarray(uvs, np.float32).reshape(-1)
+
+    data = []
+    normal = np.array([0.0, 0.0, 1.0], np.float32)
+    color = np.array([1.0, 1.0, 1.0], np.float32)
+
+    for f in range(0, vertices_flat.size, 3):
+        vertex = vertices_flat[f:f+3]
+        if normals_flat is not None:
+            normal = normals_flat[f:f+3]
+        elif create_normals and f < vertices_flat.size - (2*3):
+            vertex1 = vertices_flat[f+3:f+6]
+            vertex2 = vertices_flat[f+6:f+9]
+            if f%6==0:
+                normal = normalize(np.cross(vertex1 - vertex, vertex2 - vertex))
+            else:
+                normal = normalize(np.cross(vertex2 - vertex, vertex1 - vertex))
+        if colors_flat is not None:
+            color = colors_flat[f:f+3]
+        if uvs_flat is not None:
+            uv = uvs_flat[(f//3)*2:((f//3)*2)+2]
+        else:
+            uv = np.array([(vertex[0]+1)/2, (vertex[1]+1)/2], dtype=np.float32)
+        data.append(np.concatenate([vertex, normal, color, uv]))
+
+    return np.array(data, np.float32).flatten()
+
+
+def legacy_triangles(vertices, index, colors=None, create_normals=False):
+    """Versão original, índice a índice, do caminho GL_TRIANGLES indexado."""
+    vertices_flat = np.asarray(vertices, np.float32).reshape(-1)
+    colors_flat = None if colors is None else np.asarray(colors, np.float32).reshape(-1)
+
+    data = []
+    normal = np.array([0.0, 0.0, 1.0], np.float32)
+    color = np.array([1.0, 1.0, 1.0], np.float32)
+
+    for f in range(len(index)):
+        vertex = vertices_flat[index[f]*3:(index[f]*3)+3]
+        if create_normals and f%3==0:
+            vertex1 = vertices_flat[(index[f+1]*3):(index[f+1]*3)+3]
+            vertex2 = vertices_flat[(index[f+2]*3):(index[f+2]*3)+3]
+            normal = normalize(np.cross(vertex1 - vertex, vertex2 - vertex))
+        if colors_flat is not None:
+            color = colors_flat[index[f]*3:(index[f]*3)+3]
+        uv = np.array([(vertex[0]+1)/2, (vertex[1]+1)/2], dtype=np.float32)
+        data.append(np.concatenate([vertex, normal, color, uv]))
+
+    return np.array(data, np.float32).flatten()
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def compare(name, legacy, fast):
+    (expected, legacy_time), ((data, _, _), fast_time) = legacy, fast
+    identical = data.dtype == expected.dtype and np.array_equal(
+        data.view(np.uint32), expected.view(np.uint32)
+    )
+    print(f"  {name:16s} laço: {legacy_time*1000:9.1f} ms   vetorizado: {fast_time*1000:7.1f} ms"
+          f"   ({legacy_time/fast_time:6.1f}x)   idêntico: {identical}")
+    if not identical:
+        sys.exit(1)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    rng = np.random.default_rng(42)
+
+    vertices = rng.uniform(-1.0, 1.0, (count, 3)).astype(np.float32)
+    colors = rng.uniform(0.0, 1.0, (count, 3)).astype(np.float32)
+    uvs = rng.uniform(0.0, 1.0, (count, 2)).astype(np.float32)
+
+    # Inclui triângulos degenerados (normal nula) para cobrir o caso especial
+    vertices[10:13] = vertices[10]
+
+    cases = {
+        "posições": dict(),
+        "normais geradas": dict(create_normals=True),
+        "cores + uvs": dict(colors=colors, uvs=uvs),
+        "completo": dict(colors=colors, uvs=uvs, create_normals=True),
+    }
+
+    print(f"GL_TRIANGLE_STRIP com {count} vértices")
+    for name, kwargs in cases.items():
+        compare(name,
+                timed(legacy_strip, vertices, **kwargs),
+                timed(create_geometry_data, GL_TRIANGLE_STRIP, vertices, **kwargs))
+
+    # Malha indexada com cerca de 2 triângulos por vértice, como em malhas reais
+    index = rng.integers(0, count, 6 * count)
+    index_cases = {
+        "posições": dict(),
+        "normais geradas": dict(create_normals=True),
+        "cores": dict(colors=colors),
+    }
+
+    print(f"GL_TRIANGLES indexado com {index.size // 3} triângulos")
+    for name, kwargs in index_cases.items():
+        compare(name,
+                timed(legacy_triangles, vertices, index, **kwargs),
+                timed(create_geometry_data, GL_TRIANGLES, vertices, index=index, **kwargs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Benchmark da resolução interna (graphics/upscale.py e core/scaling.py).
+
+Renderiza sem janela (EGL) um shader pesado do ShaderToy (mandelbulb) em
+640x360 com escalas fixas e com a escala dinâmica, e mostra o tempo por
+quadro e, no modo dinâmico, a escala final e quantas vezes ela mudou. Só o
+laço de quadros é medido, depois de `WARMUP` quadros: a criação do contexto
+e a compilação dos shaders ficam de fora.
+
+Uso:
+    python benchmarks/bench_scaling.py [quadros] [fps alvo]
+"""
+
+import os
+import sys
+import time
+
+# O PyOpenGL escolhe a plataforma ao ser importado
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+from renderizador import Renderizador
+
+# Quadros renderizados antes de começar a medir
+WARMUP = 2
+
+SHADER = os.path.join(os.path.dirname(__file__), "..", "exemplos", "frag", "mandelbulb.frag")
+
+
+def run(frames, scale, target_fps=None):
+    renderizador = Renderizador(resolution=(640, 360), backend=os.environ["PYOPENGL_PLATFORM"])
+    with open(SHADER, encoding="utf-8") as file:
+        renderizador.set_shaders(fragment_shader_source=file.read())
+    if scale != 1.0 or target_fps is not None:
+        renderizador.set_render_scale(scale, target_fps=target_fps)
+
+    # Instante do fim de cada quadro: mede só o laço, sem a preparação
+    stamps = []
+    renderizador.render(frames=WARMUP + frames, fps=60.0,
+                        on_frame=lambda frame, framebuffer: stamps.append(time.perf_counter()))
+    return (stamps[-1] - stamps[WARMUP - 1]) / frames, renderizador
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    target_fps = float(sys.argv[2]) if len(sys.argv) > 2 else 30.0
+
+    # Aquece o compilador de shaders e o driver
+    run(2, 1.0)
+
+    print(f"{frames} quadros de 640x360 ({os.path.basename(SHADER)})")
+    for scale in (1.0, 0.75, 0.5):
+        period, renderizador = run(frames, scale)
+        print(f"  escala {scale:4.2f}: {period * 1e3:7.2f} ms por quadro")
+
+    period, renderizador = run(frames, 1.0, target_fps)
+    controller = renderizador.resolution_controller
+    print(f"  dinâmica ({target_fps:g} fps): {period * 1e3:7.2f} ms por quadro, "
+          f"escala final {controller.scale:.2f}, {controller.changes} mudanças")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Benchmark do cache de estado do OpenGL (graphics/state.py).
+
+Renderiza sem janela (EGL), numa resolução pequena para que o custo das
+chamadas do PyOpenGL domine, um shader com quatro texturas e algumas malhas
+instanciadas. Compara o tempo por quadro com o cache ativo e com o cache
+desligado (toda ligação é emitida) e mostra quantas chamadas foram emitidas e
+evitadas por quadro. Só o laço de quadros é medido: a criação do contexto,
+a carga das texturas, a compilação dos shaders e os primeiros `WARMUP`
+quadros ficam de fora.
+
+Uso:
+    python benchmarks/bench_state.py [quadros]
+"""
+
+import os
+import sys
+import time
+
+# O PyOpenGL escolhe a plataforma ao ser importado
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+import numpy as np
+
+from renderizador import Renderizador
+from renderizador.graphics.primitives import sphere
+from renderizador.graphics.state import gl_state
+from renderizador.utils.transformations import translate
+
+# Quadros renderizados antes de começar a medir
+WARMUP = 10
+
+TEXTURES = os.path.join(os.path.dirname(__file__), "..", "exemplos", "texture")
+
+SHADER = """
+void mainImage(out vec4 fragColor, in vec2 fragCoord) {
+    vec2 uv = fragCoord / iResolution.xy;
+    fragColor = texture(iChannel0, uv) * 0.25 + texture(iChannel1, uv) * 0.25
+              + texture(iChannel2, uv) * 0.25 + texture(iChannel3, uv) * 0.25;
+}
+"""
+
+
+def always_issue(changed):
+    """Substitui GLState.count: toda chamada é emitida, como sem o cache."""
+    gl_state.issued += 1
+    return True
+
+
+def run(frames, cached):
+    renderizador = Renderizador(resolution=(32, 32), backend=os.environ["PYOPENGL_PLATFORM"])
+    renderizador.set_shaders(fragment_shader_source=SHADER)
+    for channel, name in enumerate(("Lichen.jpg", "Wood.jpg", "Stars.jpg", "noise.jpg")):
+        renderizador.set_texture(os.path.join(TEXTURES, name), channel)
+    for row in range(4):
+        transforms = np.stack([translate(column - 2.0, row - 2.0, 0.0) for column in range(4)])
+        renderizador.add_instances(sphere(0.2, 8, 4), transforms)
+
+    if cached:
+        gl_state.__dict__.pop("count", None)
+    else:
+        gl_state.count = always_issue
+
+    # Instante do fim de cada quadro: mede só o laço, sem a preparação
+    stamps = []
+    renderizador.render(frames=WARMUP + frames, fps=60.0,
+                        on_frame=lambda frame, framebuffer: stamps.append(time.perf_counter()))
+    gl_state.__dict__.pop("count", None)
+    return (stamps[-1] - stamps[WARMUP - 1]) / frames, renderizador.state_stats()
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    # Aquece o compilador de shaders e o driver
+    run(2, True)
+
+    print(f"{frames} quadros de 32x32, 4 texturas e 4 malhas instanciadas")
+    results = {}
+    for cached in (False, True):
+        results[cached] = run(frames, cached)
+        period, stats = results[cached]
+        name = "com cache" if cached else "sem cache"
+        print(f"  {name}: {period * 1e3:6.3f} ms por quadro   ({stats})")
+    print(f"  ganho: {results[False][0] / results[True][0]:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
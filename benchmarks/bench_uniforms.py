@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Microbenchmark do envio de uniforms.
+
+Compara parse_uniforms (inspeciona tipo e formato de cada valor a cada
+quadro) com os setters montados uma vez por bind_uniforms, para um conjunto
+de uniforms típico (matrizes, vetores em listas, escalares e uma função).
+Roda sem janela (EGL).
+
+Uso:
+    python benchmarks/bench_uniforms.py [repeticoes]
+"""
+
+import os
+import sys
+import time
+
+# O PyOpenGL escolhe a plataforma ao ser importado
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.core.headless import create_headless_context
+from renderizador.graphics.shaders import compile_shader, link_shader
+from renderizador.utils.transformations import translate
+from renderizador.utils.uniforms import active_uniforms, bind_uniforms, parse_uniforms, set_uniforms
+
+VERTEX_SHADER = """#version 330 core
+uniform mat4 projection;
+uniform mat4 view;
+uniform mat4 model;
+uniform vec3 view_position;
+uniform vec3 light_position;
+uniform vec3 light_color;
+uniform float ambient_coefficient;
+uniform float specular_coefficient;
+uniform int mode;
+out vec4 color;
+void main() {
+    vec4 p = projection * view * model * vec4(view_position, 1.0);
+    color = vec4(light_color * ambient_coefficient + light_position * specular_coefficient, float(mode));
+    gl_Position = p;
+}
+"""
+
+FRAGMENT_SHADER = """#version 330 core
+in vec4 color;
+out vec4 fragColor;
+void main() { fragColor = color; }
+"""
+
+
+def timed(function, repetitions):
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        function()
+    return (time.perf_counter() - start) / repetitions
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    projection = np.identity(4, np.float32)
+    view = translate(0.0, 0.0, -5.0)
+
+    uniforms_source = {
+        "projection": lambda: projection,
+        "view": view,
+        "model": translate(1.0, 0.0, 0.0),
+        "view_position": [0.0, 0.0, 5.0],
+        "light_position": [-4.0, 2.0, 1.0],
+        "light_color": [1.0, 1.0, 1.0],
+        "ambient_coefficient": 0.4,
+        "specular_coefficient": 32.0,
+        "mode": 1,
+    }
+
+    with create_headless_context("egl"):
+        program_id = link_shader(compile_shader(GL_VERTEX_SHADER, VERTEX_SHADER),
+                                 compile_shader(GL_FRAGMENT_SHADER, FRAGMENT_SHADER))
+        glUseProgram(program_id)
+        locations = {name: info[0] for name, info in active_uniforms(program_id).items()}
+
+        dynamic = timed(lambda: parse_uniforms(uniforms_source, locations), repetitions)
+        setters = bind_uniforms(program_id, uniforms_source)
+        bound = timed(lambda: set_uniforms(setters), repetitions)
+
+        count = len(uniforms_source)
+        print(f"{count} uniforms, {repetitions} quadros")
+        print(f"  parse_uniforms: {dynamic * 1e6:7.1f} us por quadro ({dynamic * 1e6 / count:5.1f} us por uniform)")
+        print(f"  bind_uniforms:  {bound * 1e6:7.1f} us por quadro ({bound * 1e6 / count:5.1f} us por uniform)"
+              f"   {dynamic / bound:4.1f}x")
+
+        # Confere os valores que ficaram no programa (matrizes ficam por colunas)
+        set_uniforms(setters)
+        for name in ("model", "light_position", "specular_coefficient"):
+            expected = np.asarray(uniforms_source[name], np.float32)
+            expected = expected.T.ravel() if expected.ndim == 2 else expected.ravel()
+            result = np.zeros(16, np.float32)
+            glGetUniformfv(program_id, locations[name], result)
+            print(f"  {name}: {'ok' if np.array_equal(result[:expected.size], expected) else 'DIFERENTE'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Aplicação Gráfica Exemplo com vários passos (Buffer A e B do ShaderToy).
+
+O Buffer A lê o próprio quadro anterior (realimentação) e deixa um rastro das
+partículas; o Buffer B desfoca o resultado de A no mesmo quadro; a imagem
+combina os dois.
+"""
+
+from renderizador import Renderizador
+
+
+buffer_a = r'''
+void mainImage(out vec4 fragColor, in vec2 fragCoord) {
+    vec2 uv = fragCoord / iResolution.xy;
+    vec2 p = (fragCoord - 0.5 * iResolution.xy) / iResolution.y;
+
+    // Quadro anterior, apagando aos poucos
+    vec3 color = texture(iChannel0, uv).rgb * 0.95;
+
+    for (int i = 0; i < 5; i++) {
+        float t = iTime * (0.6 + 0.15 * float(i)) + float(i) * 1.3;
+        vec2 center = 0.35 * vec2(sin(t * 1.3), cos(t * 1.7));
+        vec3 tint = 0.5 + 0.5 * cos(float(i) + vec3(0.0, 2.0, 4.0));
+        color += tint * 0.00004 / (dot(p - center, p - center) + 0.0004);
+    }
+    fragColor = vec4(color, 1.0);
+}
+'''
+
+buffer_b = r'''
+void mainImage(out vec4 fragColor, in vec2 fragCoord) {
+    vec2 texel = 1.0 / iChannelResolution[0].xy;
+    vec2 uv = fragCoord * texel;
+    vec3 color = vec3(0.0);
+    for (int x = -2; x <= 2; x++)
+        for (int y = -2; y <= 2; y++)
+            color += texture(iChannel0, uv + 3.0 * texel * vec2(x, y)).rgb;
+    fragColor = vec4(color / 25.0, 1.0);
+}
+'''
+
+image = r'''
+void mainImage(out vec4 fragColor, in vec2 fragCoord) {
+    vec2 uv = fragCoord / iResolution.xy;
+    vec3 color = texture(iChannel0, uv).rgb + 0.5 * texture(iChannel1, uv).rgb;
+    fragColor = vec4(1.0 - exp(-color), 1.0);
+}
+'''
+
+
+if __name__ == '__main__':
+
+    # Criando renderizador
+    renderizador = Renderizador(resolution=(1024, 768))
+
+    # Buffer A lê a si mesmo no canal 0; Buffer B lê o Buffer A
+    renderizador.add_buffer("A", buffer_a, channels={0: "A"})
+    renderizador.add_buffer("B", buffer_b, channels={0: "A"})
+
+    # A imagem lê os dois buffers
+    renderizador.set_buffer_channel("A", 0)
+    renderizador.set_buffer_channel("B", 1)
+
+    # Passando Shaders e renderizando cena
+    renderizador.set_shaders(fragment_shader_source=image)
+
+    renderizador.render()
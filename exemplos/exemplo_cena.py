@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Aplicação Gráfica Exemplo.
+
+Cena com várias malhas compartilhando um único VBO/EBO e desenhadas com multi-draw.
+"""
+
+import numpy as np
+from OpenGL.GL import *  # para constantes GL_*
+
+from renderizador import Renderizador
+from renderizador.graphics.camera import Camera
+from renderizador.graphics.mesh import Mesh
+from renderizador.utils.transformations import *
+
+
+vertex_shader_source = r'''
+layout (location = 0) in vec3 position;
+layout (location = 1) in vec3 normal;
+layout (location = 2) in vec3 color;
+
+uniform mat4 view;
+uniform mat4 projection;
+
+out vec3 bNormal;
+out vec3 bColor;
+
+void main()
+{
+    // As transformações de cada cubo já foram aplicadas nos vértices da cena
+    bNormal = normal;
+    bColor = color;
+    gl_Position = projection * view * vec4(position, 1.0);
+}
+'''
+
+
+fragment_shader_source = r'''
+layout (location = 0) out vec4 fragColor;
+
+in vec3 bNormal;
+in vec3 bColor;
+
+uniform vec3 light_direction;
+
+void main()
+{
+    float diffuse = max(0.0, dot(normalize(bNormal), normalize(-light_direction)));
+    fragColor = vec4((0.3 + 0.7 * diffuse) * bColor, 1.0);
+}
+'''
+
+
+if __name__ == '__main__':
+
+    # Criando renderizador
+    renderizador = Renderizador(resolution=(1024, 768), lock_mouse=False)
+
+    # Criando câmera e configurando no renderizador
+    camera = Camera(type="examine", near=0.1, far=200, eye=[0.0, 0.0, 40.0])
+    renderizador.set_camera(camera)
+
+    uniforms = {}
+    uniforms["projection"] = camera.get_projection_matrix
+    uniforms["view"] = camera.get_view_matrix
+    uniforms["light_direction"] = [-1.0, -1.0, -1.0]
+
+    renderizador.set_shaders(vertex_shader_source, fragment_shader_source, uniforms)
+
+    # Cubo indexado (8 vértices) com normais suaves
+    vertices = np.array([
+        [-1.0,  1.0, -1.0], [-1.0,  1.0,  1.0], [ 1.0,  1.0,  1.0], [ 1.0,  1.0, -1.0],
+        [-1.0, -1.0, -1.0], [-1.0, -1.0,  1.0], [ 1.0, -1.0,  1.0], [ 1.0, -1.0, -1.0],
+    ], np.float32)
+
+    index = np.array([
+        0, 1, 3,  1, 2, 3,  0, 4, 1,  4, 5, 1,  1, 5, 2,  5, 6, 2,
+        2, 6, 3,  6, 7, 3,  3, 7, 0,  7, 4, 0,  4, 7, 5,  7, 6, 5,
+    ])
+
+    # Uma grade de 20x20 cubos: 400 objetos desenhados com uma chamada de multi-draw
+    for i in range(20):
+        for j in range(20):
+            colors = np.tile(np.array([i / 19, j / 19, 0.6], np.float32), (8, 1))
+            cube = Mesh(vertices=vertices, colors=colors, mode=GL_TRIANGLES, index=index)
+            cube.compute_smooth_normals(weighting="angle")
+            renderizador.add_mesh(cube, translate(2.5 * (i - 9.5), 2.5 * (j - 9.5), 0.0) @ scale(0.8, 0.8, 0.8))
+
+    # Iniciar renderização
+    renderizador.render()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Aplicação Gráfica Exemplo.
+
+Milhares de cubos desenhados com uma única chamada de renderização instanciada.
+"""
+
+import numpy as np
+from OpenGL.GL import *  # para constantes GL_*
+
+from renderizador import Renderizador
+from renderizador.graphics.camera import Camera
+from renderizador.graphics.mesh import Mesh
+from renderizador.utils.transformations import *
+
+
+vertex_shader_source = r'''
+layout (location = 0) in vec3 position;
+layout (location = 1) in vec3 normal;
+layout (location = 4) in mat4 instance_model;
+layout (location = 8) in vec3 instance_color;
+
+uniform mat4 view;
+uniform mat4 projection;
+
+out vec3 bNormal;
+out vec3 bColor;
+
+void main()
+{
+    bNormal = mat3(instance_model) * normal;
+    bColor = instance_color;
+    gl_Position = projection * view * instance_model * vec4(position, 1.0);
+}
+'''
+
+
+fragment_shader_source = r'''
+layout (location = 0) out vec4 fragColor;
+
+in vec3 bNormal;
+in vec3 bColor;
+
+void main()
+{
+    float diffuse = max(0.0, dot(normalize(bNormal), normalize(vec3(1.0, 1.0, 1.0))));
+    fragColor = vec4((0.3 + 0.7 * diffuse) * bColor, 1.0);
+}
+'''
+
+
+if __name__ == '__main__':
+
+    # Criando renderizador
+    renderizador = Renderizador(resolution=(1024, 768), lock_mouse=False)
+
+    camera = Camera(type="examine", near=0.1, far=300, eye=[0.0, 0.0, 120.0])
+    renderizador.set_camera(camera)
+
+    uniforms = {}
+    uniforms["projection"] = camera.get_projection_matrix
+    uniforms["view"] = camera.get_view_matrix
+
+    renderizador.set_shaders(vertex_shader_source, fragment_shader_source, uniforms)
+
+    vertices = np.array([
+        [-1.0,  1.0, -1.0], [-1.0,  1.0,  1.0], [ 1.0,  1.0,  1.0], [ 1.0,  1.0, -1.0],
+        [-1.0, -1.0, -1.0], [-1.0, -1.0,  1.0], [ 1.0, -1.0,  1.0], [ 1.0, -1.0, -1.0],
+    ], np.float32)
+
+    index = np.array([
+        0, 1, 3,  1, 2, 3,  0, 4, 1,  4, 5, 1,  1, 5, 2,  5, 6, 2,
+        2, 6, 3,  6, 7, 3,  3, 7, 0,  7, 4, 0,  4, 7, 5,  7, 6, 5,
+    ])
+
+    cube = Mesh(vertices=vertices, mode=GL_TRIANGLES, index=index).compute_smooth_normals("angle")
+
+    # 100x100 cubos numa grade
+    side = 100
+    grid = np.stack(np.meshgrid(np.arange(side), np.arange(side), indexing="ij"), axis=-1).reshape(-1, 2)
+    positions = (grid - side / 2) * 1.2
+
+    transforms = np.tile(scale(0.4, 0.4, 0.4), (side * side, 1, 1))
+    transforms[:, 0, 3] = positions[:, 0]
+    transforms[:, 1, 3] = positions[:, 1]
+
+    colors = np.column_stack([grid / side, np.full(side * side, 0.7)]).astype(np.float32)
+
+    cubes = renderizador.add_instances(cube, transforms, colors)
+
+    # A cada quadro apenas uma linha da grade é atualizada (caminho rápido de atualização parcial)
+    def animate(time, time_delta):
+        row = int(time * 20) % side
+        rows = slice(row * side, (row + 1) * side)
+        moved = transforms[rows].copy()
+        moved[:, 2, 3] = 3.0 * np.sin(time + positions[rows, 1] * 0.1)
+        cubes.update(rows, transforms=moved)
+
+    renderizador.set_frame_callback(animate)
+
+    # Iniciar renderização
+    renderizador.render()
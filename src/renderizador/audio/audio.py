@@ -17,6 +17,8 @@ import numpy as np
 import threading
 from OpenGL.GL import *
 
+from renderizador.graphics.state import gl_state
+
 class Audio:
     """Class representing an audio file."""
     
@@ -51,7 +53,7 @@ def parse_audios(audios):
         # Row 0: FFT (frequency domain)
         # Row 1: Waveform (time domain)
         audio._fft_tex = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, audio._fft_tex)
+        gl_state.bind_texture(audio._fft_tex)
         # allocate float RED texture (single channel, 512x2)
         try:
             glTexImage2D(GL_TEXTURE_2D, 0, GL_R32F, audio._fft_bins, 2, 0, GL_RED, GL_FLOAT, None)
@@ -62,7 +64,7 @@ def parse_audios(audios):
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-        glBindTexture(GL_TEXTURE_2D, 0)
+        gl_state.bind_texture(0)
         # position for FFT read (we will base on audio._pos updated by callback)
         audio._fft_pos = 0
 
@@ -135,6 +137,25 @@ def init_audio_streams(renderer):
             resume_audio_streams(renderer)
 
 
+def init_offline_audio(renderer):
+    """
+    Prepare the audio files for rendering without playback (headless).
+
+    The read position is driven by set_audio_time instead of an output stream.
+    """
+    for audio in renderer.audios:
+        audio.data = audio.data.astype('float32')
+        audio._pos = 0
+        audio._pos_lock = threading.Lock()
+
+
+def set_audio_time(renderer, seconds):
+    """Move the read position of every audio file to a time in seconds (looping)."""
+    for audio in renderer.audios:
+        with audio._pos_lock:
+            audio._pos = int(seconds * audio.sf) % audio.data.shape[0]
+
+
 def stop_audio_streams(renderer):
     """Stop and close all audio streams."""
     for audio in renderer.audios:
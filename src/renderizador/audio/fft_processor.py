@@ -14,6 +14,7 @@ Módulo de processamento de áudio FFT.
 import numpy as np
 from OpenGL.GL import *
 from renderizador.utils.utils import get_pointer
+from renderizador.graphics.state import gl_state
 
 def process_audio_fft(audio, time_delta, db_min, db_max, decay_tau, audio_gain):
     """
@@ -104,9 +105,9 @@ def process_audio_fft(audio, time_delta, db_min, db_max, decay_tau, audio_gain):
     tex = np.ascontiguousarray(tex)
 
     # upload to GL texture: single channel RED format, 512x2
-    glActiveTexture(GL_TEXTURE0 + audio.channel)
-    glBindTexture(GL_TEXTURE_2D, audio._fft_tex)
+    # a textura fica ligada na unidade do canal, onde o shader a lê
+    gl_state.active_texture(audio.channel)
+    gl_state.bind_texture(audio._fft_tex)
     glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, bins, 2, GL_RED, GL_FLOAT, get_pointer(tex))
-    glBindTexture(GL_TEXTURE_2D, 0)
     
     return fft_row, waveform_row
\ No newline at end of file
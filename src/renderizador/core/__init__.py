@@ -8,6 +8,11 @@ Core module containing main renderer and window management.
 from renderizador.core.renderer import Renderizador
 from renderizador.core.window import create_window, configure_window
 from renderizador.core.gui import create_gui_interface, gui_interface, init_imgui
+from renderizador.core.pacing import FramePacer, FrameTimeStats
+from renderizador.core.headless import create_headless_context
+from renderizador.core.capture import FrameCapture, open_writer
+from renderizador.core.scaling import ResolutionController
+from renderizador.core.timing import GPUTimer, FrameProfiler, FrameTimings, PassTimings
 
 __all__ = [
     'Renderizador',
@@ -15,5 +20,15 @@ __all__ = [
     'configure_window',
     'create_gui_interface',
     'gui_interface',
-    'init_imgui'
+    'init_imgui',
+    'FramePacer',
+    'FrameTimeStats',
+    'create_headless_context',
+    'FrameCapture',
+    'open_writer',
+    'ResolutionController',
+    'GPUTimer',
+    'FrameProfiler',
+    'FrameTimings',
+    'PassTimings'
 ]
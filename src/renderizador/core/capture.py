@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Asynchronous frame capture with pixel buffer objects (PBO).
+
+glReadPixels into client memory makes the CPU wait until the GPU has finished
+every pending command. Reading into a PBO instead only queues a copy on the
+GPU; FrameCapture keeps a ring of PBOs and maps each one `latency` frames
+later, when the copy is (almost always) done, so the render loop does not
+stall.
+
+The mapped memory is handed as a zero-copy NumPy view to a writer thread
+(PNG sequence, raw RGB stream or ffmpeg pipe). The thread returns the buffer
+when it is done and the render thread unmaps it (only the thread owning the
+context may call OpenGL). When the writer falls behind and the ring is full,
+capture() waits for it, so no frame is dropped.
+
+Frames are RGB uint8 with OpenGL row order (bottom row first); the writers
+flip them.
+"""
+
+import ctypes
+import os
+import queue
+import shutil
+import subprocess
+import threading
+
+import numpy as np
+from OpenGL.GL import *
+from PIL import Image
+
+from renderizador.graphics.state import gl_state
+
+# Tempo máximo de espera por uma cerca (nanossegundos)
+FENCE_TIMEOUT = 1_000_000_000
+
+
+class PNGSequenceWriter:
+    """Writes each frame to a numbered PNG file."""
+
+    def __init__(self, pattern, compress_level=1):
+        """
+        Args:
+            pattern: File name with a format field for the frame number, e.g. "out/frame_{:05d}.png"
+            compress_level: zlib level (0-9); low levels are much faster
+        """
+        self.pattern = pattern
+        self.compress_level = compress_level
+        os.makedirs(os.path.dirname(pattern.format(0)) or ".", exist_ok=True)
+
+    def write(self, frame, index):
+        Image.fromarray(frame[::-1]).save(self.pattern.format(index), compress_level=self.compress_level)
+
+    def close(self):
+        pass
+
+
+class RawWriter:
+    """Appends frames to a raw RGB24 file (rows top to bottom, no header)."""
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+
+    def write(self, frame, index):
+        # Cada linha é contígua: grava em ordem invertida sem copiar a imagem inteira
+        self.file.writelines(frame[::-1])
+
+    def close(self):
+        self.file.close()
+
+
+class FFmpegWriter:
+    """Encodes frames by piping them to the stdin of an ffmpeg process."""
+
+    def __init__(self, path, width, height, fps=60.0, codec="libx264", pixel_format="yuv420p", extra_args=()):
+        """
+        Args:
+            path: Output video file
+            width, height: Frame size
+            fps: Frame rate of the video
+            codec: ffmpeg video encoder
+            pixel_format: Pixel format of the encoded video
+            extra_args: Additional ffmpeg output arguments (e.g. ("-crf", "18"))
+        """
+        executable = shutil.which("ffmpeg")
+        if executable is None:
+            raise RuntimeError("ffmpeg não encontrado no PATH")
+        command = [
+            executable, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+            # As linhas chegam na ordem do OpenGL (de baixo para cima)
+            "-vf", "vflip", "-c:v", codec, "-pix_fmt", pixel_format, *extra_args, path,
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame, index):
+        self.process.stdin.write(frame)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg terminou com código {self.process.returncode}")
+
+
+def open_writer(path, width, height, fps=60.0):
+    """
+    Choose a writer from the output name.
+
+    Args:
+        path: "name_{:05d}.png" for a PNG sequence, "*.raw"/"*.rgb" for a raw
+            stream, any other extension for an ffmpeg video
+        width, height: Frame size
+        fps: Frame rate (videos only)
+
+    Returns:
+        Writer object
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".png":
+        if "{" not in path:
+            raise ValueError("PNG sequences need a format field in the name, e.g. frame_{:05d}.png")
+        return PNGSequenceWriter(path)
+    if extension in (".raw", ".rgb"):
+        return RawWriter(path)
+    return FFmpegWriter(path, width, height, fps)
+
+
+class FrameCapture:
+    """Ring of PBOs read asynchronously and drained by a writer thread."""
+
+    def __init__(self, width, height, writer, buffers=4, latency=2):
+        """
+        Create the PBOs and start the writer thread; needs a current context.
+
+        Args:
+            width, height: Size of the region read (from the lower-left corner)
+            writer: Object with write(frame, index) and close()
+            buffers: Number of PBOs in the ring (more absorbs slower writers)
+            latency: Frames between a read and the mapping of its PBO
+        """
+        if buffers < latency + 1:
+            raise ValueError("buffers must be at least latency + 1")
+
+        self.width = int(width)
+        self.height = int(height)
+        self.size = self.width * self.height * 3
+        self.writer = writer
+        self.latency = latency
+
+        self.buffers = [int(buffer) for buffer in np.atleast_1d(glGenBuffers(buffers))]
+        for buffer in self.buffers:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.size, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+        # PBOs livres, leituras pendentes (buffer, cerca, quadro) e buffers devolvidos pela thread
+        self.free = list(range(buffers))
+        self.pending = []
+        self.released = queue.Queue()
+        self.frames = 0
+        self.mapped = 0
+
+        self.jobs = queue.Queue()
+        self.error = None
+        self.thread = threading.Thread(target=self.work, name="FrameCapture", daemon=True)
+        self.thread.start()
+
+    def capture(self, framebuffer=None):
+        """
+        Queue the read of the current frame.
+
+        Args:
+            framebuffer: Framebuffer to read, or None for the back buffer of the window
+        """
+        self.check_error()
+        self.reclaim()
+
+        # Mapeia as leituras com pelo menos `latency` quadros de idade
+        while self.pending and self.frames - self.pending[0][2] >= self.latency:
+            self.submit(*self.pending.pop(0))
+
+        # Anel cheio: espera a thread devolver um buffer
+        while not self.free:
+            if self.pending:
+                self.submit(*self.pending.pop(0))
+            self.reclaim(block=True)
+
+        slot = self.free.pop(0)
+        if framebuffer is None:
+            gl_state.bind_framebuffer(GL_READ_FRAMEBUFFER, 0)
+            glReadBuffer(GL_BACK)
+        else:
+            gl_state.bind_framebuffer(GL_READ_FRAMEBUFFER, framebuffer.fbo)
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[slot])
+        glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+        fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self.pending.append((slot, fence, self.frames))
+        self.frames += 1
+
+    def submit(self, slot, fence, index):
+        """Map a pending PBO and hand its memory to the writer thread."""
+        glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, FENCE_TIMEOUT)
+        glDeleteSync(fence)
+
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[slot])
+        pointer = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, self.size, GL_MAP_READ_BIT)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+        # Visão NumPy direto sobre a memória mapeada (sem cópia)
+        memory = (ctypes.c_ubyte * self.size).from_address(pointer)
+        frame = np.frombuffer(memory, np.uint8).reshape(self.height, self.width, 3)
+        self.mapped += 1
+        self.jobs.put((slot, frame, index))
+
+    def reclaim(self, block=False):
+        """Unmap the PBOs the writer has finished with."""
+        while True:
+            try:
+                slot = self.released.get(block=block, timeout=None)
+            except queue.Empty:
+                return
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[slot])
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+            self.mapped -= 1
+            self.free.append(slot)
+            block = False
+
+    def work(self):
+        """Writer thread: write each mapped frame and give its buffer back (the view is invalid afterwards)."""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            slot, frame, index = job
+            try:
+                if self.error is None:
+                    self.writer.write(frame, index)
+            except Exception as error:
+                self.error = error
+            finally:
+                self.released.put(slot)
+
+    def check_error(self):
+        """Raise, in the render thread, an error that happened in the writer thread."""
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError(f"Erro ao gravar quadro: {error}") from error
+
+    def close(self):
+        """Write the pending frames, stop the thread and release the PBOs."""
+        while self.pending:
+            self.submit(*self.pending.pop(0))
+        while self.mapped:
+            self.reclaim(block=True)
+        self.jobs.put(None)
+        self.thread.join()
+        glDeleteBuffers(len(self.buffers), self.buffers)
+        self.buffers = []
+        self.writer.close()
+        self.check_error()
@@ -8,6 +8,7 @@ GUI interface using ImGui.
 import imgui
 from imgui.integrations.glfw import GlfwRenderer
 import glfw
+import numpy as np
 from renderizador.audio.audio import reset_audio_streams, set_audio_volume
 from renderizador.utils.callbacks import Callbacks
 
@@ -42,12 +43,22 @@ def create_gui_interface(renderer):
         imgui.text(f"   {renderer.fps:.1f} fps  ")
         imgui.same_line()
         imgui.text(f"  {Callbacks.resolution[0]} x {Callbacks.resolution[1]}  ")
+        if renderer.upscaler is not None:
+            imgui.same_line()
+            imgui.text(f" {renderer.render_scale:.0%} ")
+        if renderer.progressive is not None:
+            imgui.same_line()
+            imgui.text(f" {renderer.progressive.progress:.0%} ")
         imgui.same_line()
         label = "X" if renderer.mute else "M"
         if imgui.button(label):
             renderer.mute = not renderer.mute
             set_audio_volume(renderer, 0.0 if renderer.mute else 1.0)
 
+        imgui.same_line()
+        if imgui.button('T'):
+            renderer.show_timings = not renderer.show_timings
+
         imgui.same_line()
         if imgui.button('[]'):
             if glfw.get_window_attrib(renderer.window, glfw.MAXIMIZED):
@@ -56,6 +67,35 @@ def create_gui_interface(renderer):
                 glfw.maximize_window(renderer.window)
 
 
+def timing_interface(renderer):
+    """Window with the recent frame times and the CPU/GPU time of each pass."""
+    profiler = renderer.profiler
+    timings = profiler.stats(60)
+    if timings is None:
+        return
+
+    viewport = imgui.get_main_viewport()
+    imgui.set_next_window_position(viewport.pos.x + 10, viewport.pos.y + 10)
+    imgui.set_next_window_size(0, 0)
+    flags = imgui.WINDOW_NO_DECORATION | imgui.WINDOW_NO_SAVED_SETTINGS
+
+    with imgui.begin("timings", flags=flags):
+        # Históricos em ms; o deslocamento começa no quadro mais antigo do buffer circular
+        offset = profiler.slot
+        frame = profiler.frame_times * 1000.0
+        gpu = (profiler.gpu_total() * 1000.0).astype(np.float32)
+        top = max(float(np.percentile(frame, 95)) * 1.5, 1.0)
+        imgui.plot_lines("##frame", frame, values_offset=offset, overlay_text=f"quadro {timings.frame:.2f} ms",
+                         scale_min=0.0, scale_max=top, graph_size=(240, 50))
+        imgui.plot_lines("##gpu", gpu, values_offset=offset, overlay_text=f"GPU {timings.gpu:.2f} ms",
+                         scale_min=0.0, scale_max=top, graph_size=(240, 50))
+        imgui.text(f"CPU {timings.cpu:.2f} ms   GPU {timings.gpu:.2f} ms")
+        for pass_timings in timings.passes:
+            imgui.text(str(pass_timings))
+
+
 def gui_interface(renderer):
     """Wrapper function for the GUI interface."""
     create_gui_interface(renderer)
+    if renderer.show_timings:
+        timing_interface(renderer)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Headless OpenGL contexts (no window, no display server).
+
+Two backends are supported:
+    "egl":    EGL without surfaces; uses the GPU when the driver exposes an
+              EGL device, or Mesa's software rasterizer (llvmpipe) otherwise
+    "osmesa": Mesa's off-screen rendering library (CPU only)
+
+The context has no default framebuffer of its own, so the renderer draws into
+a Framebuffer object (graphics/framebuffer.py).
+
+PyOpenGL picks its platform (GLX, EGL, OSMesa) from the PYOPENGL_PLATFORM
+environment variable the first time OpenGL is imported, and function pointers
+of one platform do not work with contexts of another. select_platform must
+therefore run before anything imports OpenGL, e.g. by running the program with
+PYOPENGL_PLATFORM=egl.
+"""
+
+import contextlib
+import ctypes
+import os
+import sys
+
+BACKENDS = ("egl", "osmesa")
+
+# Plataformas EGL (extensões EXT_platform_device e MESA_platform_surfaceless)
+EGL_PLATFORM_DEVICE_EXT = 0x313F
+EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+
+
+def select_platform(backend):
+    """
+    Ask PyOpenGL to use the platform of a headless backend.
+
+    Args:
+        backend: "egl" or "osmesa"
+
+    Raises:
+        RuntimeError: if OpenGL was already imported with another platform
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}")
+    if "OpenGL" not in sys.modules:
+        os.environ["PYOPENGL_PLATFORM"] = backend
+    check_platform(backend)
+
+
+def check_platform(backend):
+    """
+    Make sure the PyOpenGL platform matches the backend.
+
+    Raises:
+        RuntimeError: if PYOPENGL_PLATFORM selects another platform
+    """
+    platform = os.environ.get("PYOPENGL_PLATFORM", "")
+    if "OpenGL" in sys.modules and platform != backend:
+        raise RuntimeError(
+            f"O backend '{backend}' precisa de PYOPENGL_PLATFORM={backend} antes de importar o OpenGL "
+            f"(atual: '{platform or 'padrão'}')"
+        )
+
+
+@contextlib.contextmanager
+def create_headless_context(backend="egl", width=1, height=1, version=(3, 3)):
+    """
+    Create an OpenGL core profile context without a window and make it current.
+
+    Args:
+        backend: "egl" or "osmesa"
+        width, height: Size of the OSMesa buffer (EGL contexts have none)
+        version: (major, minor) OpenGL version requested
+
+    Yields:
+        The context handle
+    """
+    select_platform(backend)
+    if backend == "egl":
+        with egl_context(version) as context:
+            yield context
+    else:
+        with osmesa_context(width, height, version) as context:
+            yield context
+
+
+def egl_display():
+    """
+    Open an EGL display that does not need a display server.
+
+    Tries the first EGL device (GPU or software), then Mesa's surfaceless
+    platform, then the default display.
+
+    Returns:
+        Initialized EGLDisplay
+    """
+    from OpenGL import EGL
+
+    candidates = []
+    try:
+        from OpenGL.EGL.EXT.device_enumeration import eglQueryDevicesEXT
+        from OpenGL.EGL.EXT.platform_base import eglGetPlatformDisplayEXT
+
+        devices = (EGL.EGLDeviceEXT * 8)()
+        count = EGL.EGLint()
+        if eglQueryDevicesEXT(8, devices, ctypes.pointer(count)) and count.value:
+            candidates.append(lambda: eglGetPlatformDisplayEXT(EGL_PLATFORM_DEVICE_EXT, devices[0], None))
+        candidates.append(lambda: eglGetPlatformDisplayEXT(EGL_PLATFORM_SURFACELESS_MESA, None, None))
+    except Exception:
+        # Sem as extensões de plataforma: usa só o display padrão
+        pass
+    candidates.append(lambda: EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY))
+
+    for open_display in candidates:
+        try:
+            display = open_display()
+            major, minor = EGL.EGLint(), EGL.EGLint()
+            if display and EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor)):
+                return display
+        except Exception:
+            continue
+    raise RuntimeError("Não foi possível abrir um display EGL")
+
+
+@contextlib.contextmanager
+def egl_context(version=(3, 3)):
+    """Surfaceless EGL context (needs EGL_KHR_surfaceless_context)."""
+    from OpenGL import EGL
+
+    display = egl_display()
+    try:
+        if not EGL.eglBindAPI(EGL.EGL_OPENGL_API):
+            raise RuntimeError("EGL sem suporte a OpenGL de desktop")
+
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        config_attributes = (EGL.EGLint * 3)(EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT, EGL.EGL_NONE)
+        EGL.eglChooseConfig(display, config_attributes, ctypes.pointer(config), 1, ctypes.pointer(count))
+        # Sem configuração compatível usa EGL_NO_CONFIG_KHR (contexto sem superfície não precisa)
+        config = config if count.value else None
+
+        context_attributes = (EGL.EGLint * 7)(
+            EGL.EGL_CONTEXT_MAJOR_VERSION, version[0],
+            EGL.EGL_CONTEXT_MINOR_VERSION, version[1],
+            EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+            EGL.EGL_NONE,
+        )
+        context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, context_attributes)
+        if not context:
+            raise RuntimeError("Não foi possível criar o contexto EGL")
+        try:
+            if not EGL.eglMakeCurrent(display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, context):
+                raise RuntimeError("Não foi possível ativar o contexto EGL")
+            yield context
+        finally:
+            EGL.eglMakeCurrent(display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroyContext(display, context)
+    finally:
+        EGL.eglTerminate(display)
+
+
+@contextlib.contextmanager
+def osmesa_context(width, height, version=(3, 3)):
+    """OSMesa context drawing into a small RGBA buffer in memory."""
+    from OpenGL import GL, osmesa
+
+    attributes = (ctypes.c_int * 9)(
+        osmesa.OSMESA_FORMAT, osmesa.OSMESA_RGBA,
+        osmesa.OSMESA_PROFILE, osmesa.OSMESA_CORE_PROFILE,
+        osmesa.OSMESA_CONTEXT_MAJOR_VERSION, version[0],
+        osmesa.OSMESA_CONTEXT_MINOR_VERSION, version[1],
+        0,
+    )
+    context = osmesa.OSMesaCreateContextAttribs(attributes, None)
+    if not context:
+        raise RuntimeError("Não foi possível criar o contexto OSMesa")
+
+    # O desenho vai para um FBO; este buffer só existe porque o OSMesa exige um
+    buffer = (ctypes.c_ubyte * (width * height * 4))()
+    try:
+        if not osmesa.OSMesaMakeCurrent(context, buffer, GL.GL_UNSIGNED_BYTE, width, height):
+            raise RuntimeError("Não foi possível ativar o contexto OSMesa")
+        yield context
+    finally:
+        osmesa.OSMesaDestroyContext(context)
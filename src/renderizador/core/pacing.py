@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Frame pacing: controls when each frame ends and measures frame times.
+
+Modes:
+    "vsync":    the driver waits for the display (swap interval 1)
+    "uncapped": no wait at all (swap interval 0)
+    "fixed":    frames end on a fixed deadline (target_fps), with swap interval 0
+    "adaptive": like "fixed", but the target is the highest integer fraction of
+                the display refresh rate (60, 30, 20, ...) that the recent frame
+                times can sustain, so the pace stays even instead of
+                alternating between fast and slow frames; when the driver
+                supports swap_control_tear, late frames swap immediately
+                (swap interval -1) instead of waiting a whole refresh
+
+Deadlines are met with a sleep-then-spin wait: time.sleep covers most of the
+interval (its resolution can be a few milliseconds on some systems) and the
+last `spin` seconds are spent polling time.perf_counter.
+"""
+
+import time
+from dataclasses import dataclass
+
+import glfw
+import numpy as np
+
+MODES = ("vsync", "uncapped", "fixed", "adaptive")
+
+
+@dataclass
+class FrameTimeStats:
+    """Distribution of the measured frame times, in milliseconds."""
+
+    frames: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    fps: float
+
+    def __str__(self):
+        return (
+            f"{self.frames} quadros, média {self.mean:.2f} ms ({self.fps:.1f} fps), "
+            f"p50 {self.p50:.2f} ms, p95 {self.p95:.2f} ms, p99 {self.p99:.2f} ms, máx {self.max:.2f} ms"
+        )
+
+
+class FramePacer:
+    """Ends frames according to a pacing mode and records frame times."""
+
+    def __init__(self, mode="vsync", target_fps=60.0, spin=0.002, history=1000):
+        """
+        Initialize the pacer.
+
+        Args:
+            mode: "vsync", "uncapped", "fixed" or "adaptive"
+            target_fps: Frame rate of the "fixed" mode
+            spin: Seconds before the deadline spent busy-waiting instead of sleeping
+            history: Number of recent frame times kept for the statistics
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        if target_fps <= 0:
+            raise ValueError("target_fps must be positive")
+
+        self.mode = mode
+        self.target_fps = float(target_fps)
+        self.spin = spin
+        self.refresh_rate = 60.0
+
+        # Tempos dos quadros (segundos) num buffer circular
+        self.frame_times = np.zeros(history)
+        self.work_times = np.zeros(history)
+        self.frames = 0
+
+        self.deadline = None
+        self.frame_start = None
+        self.work_end = None
+
+        # Verdadeiro depois de configure (quando já existe um contexto GLFW)
+        self.configured = False
+
+    @property
+    def period(self):
+        """Current frame interval in seconds (0 when frames are not paced by the CPU)."""
+        if self.mode == "fixed":
+            return 1.0 / self.target_fps
+        if self.mode == "adaptive":
+            return self.adaptive_period()
+        return 0.0
+
+    def configure(self, window=None):
+        """
+        Set the swap interval of the current context; call after the context is created.
+
+        Args:
+            window: GLFW window, used to find the refresh rate of its monitor
+        """
+        monitor = glfw.get_window_monitor(window) if window is not None else None
+        monitor = monitor or glfw.get_primary_monitor()
+        if monitor:
+            mode = glfw.get_video_mode(monitor)
+            if mode and mode.refresh_rate > 0:
+                self.refresh_rate = float(mode.refresh_rate)
+
+        glfw.swap_interval(swap_interval(self.mode))
+        self.configured = True
+        self.deadline = None
+        self.frame_start = time.perf_counter()
+        self.work_end = None
+
+    def set_mode(self, mode, target_fps=None):
+        """Change the pacing mode at run time (the swap interval is updated too)."""
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.mode = mode
+        if target_fps is not None:
+            self.target_fps = float(target_fps)
+        if self.configured:
+            glfw.swap_interval(swap_interval(mode))
+        self.deadline = None
+
+    def mark_work_done(self):
+        """
+        Record the end of the frame's work; call just before swapping buffers.
+
+        The swap can block until the next vertical blank, so the time measured
+        after it is about one refresh period even for fast frames; the adaptive
+        mode needs the time spent before it.
+        """
+        self.work_end = time.perf_counter()
+
+    def end_frame(self):
+        """
+        Wait for the deadline of the current frame (if paced) and record its duration.
+
+        Call once per frame, after swapping buffers.
+        """
+        now = time.perf_counter()
+        if self.frame_start is None:
+            self.frame_start = now
+        # Sem mark_work_done o trabalho inclui a espera da troca de buffers
+        work = (now if self.work_end is None else self.work_end) - self.frame_start
+        self.work_end = None
+
+        period = self.period
+        if period > 0:
+            if self.deadline is None or now - self.deadline > period:
+                # Primeiro quadro ou atraso maior que um intervalo: recomeça a contagem
+                self.deadline = now + period
+            else:
+                self.deadline += period
+            wait_until(self.deadline, self.spin)
+            now = time.perf_counter()
+
+        slot = self.frames % self.frame_times.size
+        self.frame_times[slot] = now - self.frame_start
+        self.work_times[slot] = work
+        self.frames += 1
+        self.frame_start = now
+
+    def adaptive_period(self):
+        """Interval of the highest refresh-rate fraction the recent frames can sustain."""
+        size = self.work_times.size
+        count = min(120, self.frames, size)
+        # Buffer circular: os últimos quadros terminam na posição frames % size
+        recent = self.work_times[np.arange(self.frames - count, self.frames) % size]
+        work = np.percentile(recent, 90) if recent.size else 0.0
+        divisor = max(1, int(np.ceil(work * self.refresh_rate)))
+        return divisor / self.refresh_rate
+
+    def stats(self):
+        """
+        Distribution of the recorded frame times.
+
+        Returns:
+            FrameTimeStats (milliseconds), or None before the first frame
+        """
+        count = min(self.frames, self.frame_times.size)
+        if count == 0:
+            return None
+        times = self.frame_times[:count] * 1000.0
+        p50, p95, p99 = np.percentile(times, [50, 95, 99])
+        mean = float(times.mean())
+        return FrameTimeStats(count, mean, float(p50), float(p95), float(p99), float(times.max()), 1000.0 / mean)
+
+
+def swap_interval(mode):
+    """
+    Swap interval used by a pacing mode; needs a current context.
+
+    Args:
+        mode: Pacing mode
+
+    Returns:
+        1 for "vsync", -1 for "adaptive" when swap_control_tear is available, 0 otherwise
+    """
+    if mode == "vsync":
+        return 1
+    if mode == "adaptive" and (glfw.extension_supported("GLX_EXT_swap_control_tear")
+                               or glfw.extension_supported("WGL_EXT_swap_control_tear")):
+        return -1
+    return 0
+
+
+def wait_until(deadline, spin=0.002):
+    """
+    Wait until time.perf_counter() reaches the deadline.
+
+    Sleeps while more than `spin` seconds remain, then busy-waits.
+
+    Args:
+        deadline: Target value of time.perf_counter()
+        spin: Busy-wait margin in seconds
+    """
+    remaining = deadline - time.perf_counter()
+    if remaining > spin:
+        time.sleep(remaining - spin)
+    while time.perf_counter() < deadline:
+        pass
@@ -8,12 +8,15 @@ Core renderer for OpenGL.
 import numpy as np
 from OpenGL.GL import *
 import glfw
-import time
-import re
 import imgui
 
 from renderizador.core.window import create_window, configure_window
 from renderizador.core.gui import init_imgui, gui_interface
+from renderizador.core.pacing import FramePacer
+from renderizador.core.headless import BACKENDS, create_headless_context
+from renderizador.core.capture import FrameCapture, open_writer
+from renderizador.core.scaling import ResolutionController
+from renderizador.core.timing import FrameProfiler
 from renderizador.graphics.shaders import (
     compile_shader,
     link_shader,
@@ -21,16 +24,28 @@ from renderizador.graphics.shaders import (
     default_fragment_shader,
 )
 from renderizador.graphics.texture import Texture, parse_textures
-from renderizador.graphics.geometry import create_geometry_data, parse_geometry
+from renderizador.graphics.geometry import create_indexed_geometry_data, geometry_attributes, index_array, index_type, parse_geometry
 from renderizador.graphics.primitives import fullscreen_quad
+from renderizador.graphics.scene import Scene
+from renderizador.graphics.instancing import InstancedMesh
+from renderizador.graphics.dynamic import DynamicGeometry
+from renderizador.graphics.streaming import StreamingGeometry
+from renderizador.graphics.framebuffer import Framebuffer
+from renderizador.graphics.progressive import ProgressiveTiles
+from renderizador.graphics.multipass import BUFFER_NAMES, BufferPass, MultiPass
+from renderizador.graphics.shadertoy import ShaderToyUniforms, shadertoy_source
+from renderizador.graphics.state import gl_state
+from renderizador.graphics.upscale import Upscaler
 from renderizador.utils.callbacks import Callbacks
-from renderizador.utils.uniforms import parse_uniforms
+from renderizador.utils.uniforms import bind_uniforms, set_uniforms
 from renderizador.audio.audio import (
     Audio,
     init_audio_streams,
+    init_offline_audio,
     parse_audios,
     pause_audio_streams,
     resume_audio_streams,
+    set_audio_time,
     stop_audio_streams,
 )
 from renderizador.audio.fft_processor import process_audio_fft
@@ -47,8 +62,15 @@ class Renderizador:
         self.background_color = color
 
     # Cria a janela de renderização
-    def __init__(self, resolution=(1024, 768), lock_mouse=False, shader_toy=True):
+    def __init__(self, resolution=(1024, 768), lock_mouse=False, shader_toy=True, backend="glfw"):
+        if backend != "glfw" and backend not in BACKENDS:
+            raise ValueError(f"backend must be 'glfw' or one of {BACKENDS}")
+
         self.window = None
+
+        # "glfw" abre uma janela; "egl" ou "osmesa" renderizam sem janela num framebuffer
+        self.backend = backend
+        self.framebuffer = None
  
         Callbacks.resolution = resolution
 
@@ -67,10 +89,34 @@ class Renderizador:
         # Armazena os audios
         self.audios = []
 
+        # Passos Buffer A-D do ShaderToy e os canais da imagem ligados a eles
+        self.buffers = MultiPass()
+        self.buffer_channels = {}
+
         self.data = []
+        self.index = None
         self.mode = None
         self.count = 0
 
+        # Layout compacto dos vértices (None para o padrão de 11 floats)
+        self.layout = None
+        self.position_transform = np.identity(4, np.float32)
+
+        # Cena com várias malhas em buffers compartilhados (desenhadas com multi-draw)
+        self.scene = Scene()
+
+        # Malhas desenhadas com instanciamento (uma chamada de desenho por malha)
+        self.instances = []
+
+        # Geometrias dinâmicas, com vértices enviados a cada quadro
+        self.dynamic_geometries = []
+
+        # Geometrias montadas em blocos (fora da memória), enviadas em fatias
+        self.streamed_geometries = []
+
+        # Função chamada a cada quadro, antes do desenho, com (tempo, delta de tempo)
+        self.frame_callback = None
+
         self.vertex_shader_source = default_vertex_shader
         self.fragment_shader_source = default_fragment_shader
         self.uniforms_source = {}
@@ -79,6 +125,29 @@ class Renderizador:
         self.time = 0
         self.fps = 0
 
+        # Controle do ritmo dos quadros (vsync, uncapped, fixed ou adaptive)
+        self.pacer = FramePacer()
+
+        # Resolução interna: escala fixa, ou ajustada pelo controlador para manter o FPS alvo
+        self.render_scale = 1.0
+        self.upscaler = None
+        self.resolution_controller = None
+
+        # Renderização progressiva em ladrilhos, espalhada por vários quadros
+        self.progressive = None
+
+        # Tempos de CPU e GPU de cada passo do quadro (consultas GL_TIME_ELAPSED)
+        self.profiler = FrameProfiler()
+        self.show_timings = False
+
+        # Estatísticas (tempos de quadro, estado GL, tempos por passo) impressas ao fechar a janela
+        self.report_stats = False
+
+        # Captura assíncrona dos quadros (PBOs + thread de gravação), criada em render()
+        self.capture_output = None
+        self.capture_options = {}
+        self.capture = None
+
         # audio control state
         self._audio_initialized = False
         self._prev_play_state = None
@@ -115,6 +184,37 @@ class Renderizador:
 
     def set_audio(self, filename, channel):
         self.audios.append(Audio(filename, channel))
+
+    def add_buffer(self, name, fragment_shader_source, channels=None, internal_format=GL_RGBA16F, filter=GL_LINEAR):
+        """
+        Add a ShaderToy buffer pass (Buffer A-D), drawn before the image.
+
+        Args:
+            name: "A", "B", "C" or "D"
+            fragment_shader_source: Shader source using mainImage
+            channels: Dictionary of channel number (0-3) to input: a buffer
+                name (e.g. its own name for feedback) or an image file name
+            internal_format: GL_RGBA16F (default) or GL_RGBA32F
+            filter: Filter used when the buffer is sampled
+
+        Returns:
+            The BufferPass
+        """
+        buffer_pass = BufferPass(name, fragment_shader_source, channels, internal_format, filter)
+        self.buffers.add(buffer_pass)
+        return buffer_pass
+
+    def set_buffer_channel(self, name, channel):
+        """
+        Read the output of a buffer pass in a channel of the image.
+
+        Args:
+            name: "A", "B", "C" or "D"
+            channel: Channel number (0-3)
+        """
+        if name not in BUFFER_NAMES:
+            raise ValueError(f"buffer name must be one of {BUFFER_NAMES}")
+        self.buffer_channels[channel] = name
         
     def set_camera(self, camera):
         """
@@ -126,86 +226,301 @@ class Renderizador:
         self.camera = camera
         Callbacks.camera = camera
         
-    def add_geometry(self, mode, vertices, normals=None, colors=None, uvs=None, create_normals=False, index=None):
-        self.data, self.mode, self.count = create_geometry_data(
+    def add_geometry(self, mode, vertices, normals=None, colors=None, uvs=None, create_normals=False, index=None,
+                     vertex_format=None):
+        """
+        Set the geometry to be rendered.
+
+        Args:
+            mode: OpenGL drawing mode (GL_TRIANGLES, GL_TRIANGLE_STRIP, ...)
+            vertices: Array of vertex coordinates
+            normals: Array of normals, "smooth" for area-weighted vertex normals
+                (keeps the mesh indexed) or "flat" for per-face normals
+            colors: Array of color values
+            uvs: Array of texture coordinates
+            create_normals: Whether to create flat normals (same as normals="flat")
+            index: Optional index array, drawn with glDrawElements
+            vertex_format: Optional VertexFormat packing the vertices into a compact
+                layout (half floats, normalized integers); missing attributes are
+                left out of the buffer
+
+        Returns:
+            4x4 matrix mapping the stored positions back to the original ones; it is
+            the identity unless positions are quantized to int16, in which case the
+            vertex shader must apply it (e.g. as a uniform)
+        """
+        self.layout = None
+        self.position_transform = np.identity(4, np.float32)
+
+        if vertex_format is None:
+            self.data, self.index, self.mode, self.count = create_indexed_geometry_data(
+                mode, vertices, normals, colors, uvs, create_normals, index
+            )
+            return self.position_transform
+
+        attributes, self.index, self.count = geometry_attributes(
             mode, vertices, normals, colors, uvs, create_normals, index
         )
+        self.mode = mode
+        if attributes is None:
+            self.data = np.array([], np.uint8)
+        else:
+            self.data, self.layout, self.position_transform = vertex_format.pack(*attributes)
+        return self.position_transform
 
-    def render(self):
-        """Main rendering loop."""
+    def set_mesh(self, mesh):
+        """
+        Set a Mesh as the geometry to be rendered.
 
-        imgui.create_context()
+        The vertex buffer holds only the attributes present in the mesh and the
+        VAO is configured from the layout reported by Mesh.interleaved.
 
-        with create_window(self) as window:
-            if self.window is None:
-                raise Exception("Janela não foi criada")
-            
-            impl = init_imgui(window)
-            configure_window(self, window)
+        Args:
+            mesh: Mesh object (with an optional index array)
+        """
+        self.data, self.layout = mesh.vertex_layout()
+        self.mode = mesh.mode
+        self.position_transform = np.identity(4, np.float32)
+        if mesh.index is None:
+            self.index = None
+            self.count = mesh.vertices.shape[0]
+        else:
+            self.index = index_array(mesh.index, mesh.vertices.shape[0])
+            self.count = self.index.size
 
-            if self.mode is None:
-                # Use the structured fullscreen quad primitive instead of raw arrays
-                quad = fullscreen_quad()  # Mesh with vertices/colors/uvs and mode GL_TRIANGLE_STRIP
-                self.add_geometry(quad.mode, quad.vertices, colors=quad.colors, uvs=quad.uvs, create_normals=False)
+    def add_mesh(self, mesh, transform=None):
+        """
+        Add a mesh to the scene, batched with the others into shared buffers.
 
-            vao, count = parse_geometry(self.data, self.mode, self.count)
-            parse_textures(self.textures)
-            parse_audios(self.audios)
+        Args:
+            mesh: Mesh object, or LODChain whose level is picked every frame
+                from the projected size of the object on the active camera
+            transform: Optional 4x4 model matrix baked into the mesh vertices
 
-            init_audio_streams(self)
+        Returns:
+            Position of the mesh in the scene
+        """
+        return self.scene.add(mesh, transform)
 
-            self.vertex_shader_source = str(self.vertex_shader_source)
+    def add_instances(self, mesh, transforms, colors=None):
+        """
+        Add many copies of a mesh drawn with a single instanced draw call.
 
-            # Configura os Uniforms para os shaders
-            uniforms = {}
+        Args:
+            mesh: Mesh object shared by every instance
+            transforms: (N,4,4) array of model matrices, read in the vertex
+                shader as `layout (location = 4) in mat4 instance_model`
+            colors: Optional (N,3) array, read as `layout (location = 8) in vec3 instance_color`
 
-            # Caso os parâmetros do Shader Toy estejam habilidatos
-            if self.shader_toy:
-                # Adiciona os parâmetros automaticamente do Shader Toy
-                shadertoy_frag = f"#define HW_PERFORMANCE {0 if self.shader_toy_mIsLowEnd else 1}\n"
-                shadertoy_uniforms = "uniform vec2 iResolution;"+ \
-                                    "uniform float iTime;"+ \
-                                    "uniform float iTimeDelta;"+ \
-                                    "uniform float iFrameRate;"+ \
-                                    "uniform uint iFrame;"+ \
-                                    "uniform vec4 iMouse;"+ \
-                                    "uniform vec4 iDate;"+ \
-                                    "uniform sampler2D iChannel0;" + \
-                                    "uniform sampler2D iChannel1;" + \
-                                    "uniform sampler2D iChannel2;" + \
-                                    "uniform sampler2D iChannel3;" + \
-                                    "uniform vec2 iChannelResolution[4];\n"  # (x=width,y=height)
-
-                shadertoy_frag += shadertoy_uniforms
-
-                # Define a nonlocal reference to shadertoy_frag that can be modified inside the function
-                nonlocal_shadertoy_frag = [shadertoy_frag]
-                
-                def mainImage(match):
-                    signature = str(match.group())
-                    signature = re.search(r'\((.*?)\)',signature).group(1)
-                    result = [x.strip() for x in signature.split(',')]
-                    
-                    for r in result:
-                        txt = r.split()
-                        if txt[0] == "out":
-                            nonlocal_shadertoy_frag[0] += f"out vec4 {txt[2]};\n"
-                        elif txt[0] == "in":
-                            nonlocal_shadertoy_frag[0] += f"in vec4 gl_FragCoord;vec2 {txt[2]} = gl_FragCoord.xy;\n"
-                    return "void main(){\n"
-            
-                self.fragment_shader_source = re.sub("void\s*mainImage\(([^\)]+)\)\s*\{", mainImage, self.fragment_shader_source)
-                self.fragment_shader_source = nonlocal_shadertoy_frag[0] + self.fragment_shader_source
+        Returns:
+            InstancedMesh; call its update() to change a subset of instances
+        """
+        instanced = InstancedMesh(mesh, transforms, colors)
+        self.instances.append(instanced)
+        return instanced
+
+    def add_dynamic_geometry(self, mode, capacity, index=None, strategy="ring"):
+        """
+        Add geometry whose vertices are streamed to the GPU every frame.
+
+        Args:
+            mode: OpenGL drawing mode
+            capacity: Maximum number of vertices
+            index: Optional static index array
+            strategy: "ring" (triple-buffered ring with fences) or "orphan" (buffer orphaning)
+
+        Returns:
+            DynamicGeometry; call its update() (e.g. from the frame callback) with new vertices
+        """
+        dynamic = DynamicGeometry(mode, capacity, index, strategy)
+        self.dynamic_geometries.append(dynamic)
+        return dynamic
+
+    def add_streaming_geometry(self, mode, vertex_count, index_count=0, path=None):
+        """
+        Add geometry built from chunks, for meshes too large to hold several copies in RAM.
+
+        Args:
+            mode: OpenGL drawing mode
+            vertex_count: Total number of vertices
+            index_count: Total number of indices (0 for glDrawArrays geometry)
+            path: Optional file prefix to keep the buffers in np.memmap files
+
+        Returns:
+            StreamingGeometry; fill it with consume()/add_vertices()/add_index()
+            before render() is called
+        """
+        streamed = StreamingGeometry(mode, vertex_count, index_count, path)
+        self.streamed_geometries.append(streamed)
+        return streamed
+
+    def set_frame_callback(self, callback):
+        """
+        Set a function called every frame, before drawing.
+
+        Args:
+            callback: function receiving (time, time_delta) in seconds
+        """
+        self.frame_callback = callback
+
+    def set_capture(self, output, fps=60.0, buffers=4, latency=2):
+        """
+        Record the rendered frames.
+
+        Args:
+            output: Writer object (write(frame, index) and close()) or a file name:
+                "frame_{:05d}.png" (PNG sequence), "*.raw" (raw RGB24) or a video
+                file encoded by ffmpeg (e.g. "video.mp4")
+            fps: Frame rate of the video
+            buffers: Number of pixel buffer objects in the ring
+            latency: Frames between reading a frame and mapping it
+        """
+        self.capture_output = output
+        self.capture_options = dict(fps=fps, buffers=buffers, latency=latency)
+
+    def start_capture(self, width, height):
+        """Create the FrameCapture configured by set_capture (needs a current context)."""
+        if self.capture_output is None:
+            return
+        options = dict(self.capture_options)
+        fps = options.pop("fps")
+        writer = self.capture_output
+        if isinstance(writer, str):
+            writer = open_writer(writer, width, height, fps)
+        self.capture = FrameCapture(width, height, writer, **options)
+
+    def stop_capture(self):
+        """Write the remaining frames and release the capture."""
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
+
+    def set_frame_pacing(self, mode, target_fps=None):
+        """
+        Choose how frames are paced.
+
+        Args:
+            mode: "vsync", "uncapped", "fixed" (target_fps) or "adaptive"
+            target_fps: Frame rate of the "fixed" mode
+        """
+        self.pacer.set_mode(mode, target_fps)
+
+    def set_stats_report(self, enabled=True):
+        """
+        Print the frame time, GL state and per-pass statistics when the window closes.
+
+        The same values are always available from frame_time_stats(),
+        state_stats() and frame_timings().
+
+        Args:
+            enabled: Print the statistics at exit
+        """
+        self.report_stats = enabled
+
+    def frame_time_stats(self):
+        """Distribution of the recent frame times (see FramePacer.stats)."""
+        return self.pacer.stats()
+
+    def set_render_scale(self, scale=1.0, filter="bilinear", target_fps=None, min_scale=0.25, max_scale=1.0,
+                         sharpness=0.5):
+        """
+        Render the scene at a fraction of the output resolution and upscale it.
 
-            self.vertex_shader_source = "#version 330 core\n" + self.vertex_shader_source
-            self.fragment_shader_source = "#version 330 core\n" + self.fragment_shader_source
+        Args:
+            scale: Fraction of the output width and height (1.0 disables it
+                unless target_fps is given)
+            filter: "bilinear" or "sharpen" (bilinear plus a sharpening filter)
+            target_fps: If given, the scale changes every frame, between
+                min_scale and max_scale, from the measured GPU time to hold
+                this frame rate
+            min_scale, max_scale: Limits of the dynamic scale
+            sharpness: Strength of the sharpening filter (0-1)
+        """
+        if not 0 < scale <= 1:
+            raise ValueError("scale must be in (0, 1]")
+        if not 0 < min_scale <= max_scale <= 1:
+            raise ValueError("scales must satisfy 0 < min_scale <= max_scale <= 1")
+
+        self.render_scale = scale
+        self.resolution_controller = None
+        if target_fps is not None:
+            self.resolution_controller = ResolutionController(target_fps, scale, min_scale, max_scale)
+        if scale == 1 and target_fps is None:
+            self.upscaler = None
+        else:
+            self.upscaler = Upscaler(filter, sharpness)
+
+    def set_progressive(self, enabled=True, tile_size=128, budget=0.010):
+        """
+        Draw very expensive shaders progressively, a few tiles per frame.
+
+        The image is accumulated in a framebuffer and shown partially updated,
+        so the window and the GUI keep running at the display rate. Every
+        sweep over the tiles uses the time of the frame that started it; the
+        buffer passes, the audio and the frame callback advance once per sweep.
+
+        Args:
+            enabled: False goes back to drawing the whole frame
+            tile_size: Width and height of the tiles in pixels
+            budget: Time per frame (seconds) spent drawing tiles
+        """
+        self.progressive = ProgressiveTiles(tile_size, budget) if enabled else None
+
+    def set_profiling(self, enabled=True, history=240):
+        """
+        Measure the CPU and GPU time of each pass (on by default).
 
-            # Compila os shaders
-            vertexShader_id = compile_shader(GL_VERTEX_SHADER, self.vertex_shader_source)
-            fragmentShader_id = compile_shader(GL_FRAGMENT_SHADER, self.fragment_shader_source)
+        The dynamic render scale (set_render_scale with target_fps) needs the
+        GPU times, so it keeps profiling on.
 
-            # Conecta (link) os shaders para a aplicação
-            program_id = link_shader(vertexShader_id, fragmentShader_id)
+        Args:
+            enabled: False stops issuing the timer queries
+            history: Number of frames kept for the graph and the statistics
+        """
+        self.profiler = FrameProfiler(history)
+        self.profiler.enabled = enabled
+
+    def frame_timings(self, frames=120):
+        """Mean frame interval and CPU/GPU time of each pass (see FrameProfiler.stats)."""
+        return self.profiler.stats(frames)
+
+    def state_stats(self):
+        """GL state changes issued and elided in the last frame (see GLState)."""
+        return gl_state.last_frame
+
+    def render(self, frames=None, fps=60.0, on_frame=None):
+        """
+        Main rendering loop.
+
+        With the "glfw" backend the loop runs until the window is closed. With a
+        headless backend ("egl" or "osmesa") it renders a fixed number of frames
+        into an offscreen framebuffer, with time advancing exactly 1/fps per frame.
+
+        Args:
+            frames: Number of frames to render (headless backends only)
+            fps: Frame rate of the headless clock (iTime = frame / fps)
+            on_frame: Optional function called after each headless frame with
+                (frame, framebuffer), e.g. to read the pixels
+        """
+        if self.backend != "glfw":
+            self.render_headless(frames, fps, on_frame)
+            return
+
+        imgui.create_context()
+
+        with create_window(self) as window:
+            if self.window is None:
+                raise Exception("Janela não foi criada")
+            
+            # Contexto novo: nada do que o cache lembra vale para ele
+            gl_state.invalidate()
+
+            impl = init_imgui(window)
+            configure_window(self, window)
+            self.pacer.configure(window)
+
+            self.setup_pipeline()
+            init_audio_streams(self)
 
             # recursos usados para tratar valores gerais
             frame = 0
@@ -214,39 +529,6 @@ class Renderizador:
             count_second = 0
             count_frames = 0
 
-            # Caso os parâmetros do Shader Toy estejam habilidatos
-            if self.shader_toy:
-                # Cadastra os Uniforms básicos do ShaderToy
-                uniforms["iResolution"] = glGetUniformLocation(program_id, 'iResolution')
-                uniforms["iTime"] = glGetUniformLocation(program_id, 'iTime')
-                uniforms["iTimeDelta"] = glGetUniformLocation(program_id, 'iTimeDelta')
-                uniforms["iFrameRate"] = glGetUniformLocation(program_id, 'iFrameRate')
-                uniforms["iFrame"] = glGetUniformLocation(program_id, 'iFrame')
-                uniforms["iMouse"] = glGetUniformLocation(program_id, 'iMouse')
-                uniforms["iDate"] = glGetUniformLocation(program_id, 'iDate')
-                uniforms["iChannel0"] = glGetUniformLocation(program_id, 'iChannel0')
-                uniforms["iChannel1"] = glGetUniformLocation(program_id, 'iChannel1')
-                uniforms["iChannel2"] = glGetUniformLocation(program_id, 'iChannel2')
-                uniforms["iChannel3"] = glGetUniformLocation(program_id, 'iChannel3')
-
-                uniforms["iChannelResolution"] = [
-                    glGetUniformLocation(program_id, f'iChannelResolution[{i}]') for i in range(4)
-                ]
-                uniforms["iChannelTime"] = [
-                    glGetUniformLocation(program_id, f'iChannelTime{i}') for i in range(4)
-                ]  # iChannelTime0, 1, 2, 3 = tempo do áudio em segundos
-                
-            # Cadastra os Uniforms
-            for field in self.uniforms_source:
-                uniforms[field] = glGetUniformLocation(program_id, field)
-
-            # remove os shaders da memória
-            glDeleteShader(vertexShader_id)
-            glDeleteShader(fragmentShader_id)
-
-            # Define no contexto qual a cor para limpar o buffer de cores
-            glClearColor(*self.background_color)
-
             # Passa para o Callbacks o real tamanho do Framebuffer
             width, height = glfw.get_framebuffer_size(window)
             Callbacks.framebuffer_size = [width, height]
@@ -255,12 +537,12 @@ class Renderizador:
             if self.lock_mouse:
                 glfw.set_input_mode(self.window, glfw.CURSOR, glfw.CURSOR_DISABLED)
 
-            # Ativa o Z-Buffer
-            glEnable(GL_DEPTH_TEST)
-
             # Call back do resize do Framebuffer precisa ser configurado no final do processo de iniciação
             glfw.set_framebuffer_size_callback(self.window, Callbacks.framebuffer_size_callback)
 
+            # A captura lê sempre o tamanho inicial do framebuffer
+            self.start_capture(width, height)
+
             # Realiza a renderização enquanto a janela não for fechada
             while (
                 glfw.get_key(window, glfw.KEY_ESCAPE) != glfw.PRESS and
@@ -276,12 +558,6 @@ class Renderizador:
 
                 # Detalhes da interface da janela
                 gui_interface(self)
-                
-                # Limpa a janela com a cor de fundo e apagar o z-buffer
-                glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-
-                # use our own rendering program
-                glUseProgram(program_id)
 
                 # controla play/pause do render e do áudio
                 if self.play:
@@ -314,72 +590,11 @@ class Renderizador:
                 else:        
                     count_frames += 1 
 
-                # Fazendo os uniforms básicos do ShaderToy
-                if self.shader_toy:    
-                    glUniform2f(uniforms["iResolution"], Callbacks.framebuffer_size[0], Callbacks.framebuffer_size[1])
-                    glUniform1f(uniforms["iTime"], passed_time)
-                    glUniform1f(uniforms["iTimeDelta"], time_delta)
-                    glUniform1f(uniforms["iFrameRate"], self.fps)
-                    glUniform1ui(uniforms["iFrame"], frame)
-                    glUniform4fv(uniforms["iMouse"], 1, Callbacks.get_mouse_clicked())
-
-                    # pass date as (year, month, day, seconds in day)
-                    ts = time.time()  # epoch com fração
-                    lt = time.localtime(ts)
-                    seconds_in_day = lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec + (ts % 1.0)
-                    # ShaderToy expects month in 1..12 (not zero-based)
-                    glUniform4f(uniforms["iDate"], float(lt.tm_year), float(lt.tm_mon), float(lt.tm_mday), float(seconds_in_day))
-
-                # Case existam texturas
-                for texture in self.textures:
-                    # Liga a textura para o OpenGL
-                    glActiveTexture(GL_TEXTURE0 + texture.channel)
-                    glBindTexture(GL_TEXTURE_2D, texture.texture_id)
-
-                    # Se for shaderToy, faça o binding do sampler iChannelN -> texture unit N
-                    if self.shader_toy:
-                        glUniform2f(uniforms["iChannelResolution"][texture.channel], texture.image.shape[1], texture.image.shape[0])
-                        sampler_name = f"iChannel{texture.channel}"
-                        if sampler_name in uniforms and uniforms[sampler_name] != -1:
-                            # define qual texture unit o sampler deve usar
-                            glUniform1i(uniforms[sampler_name], int(texture.channel))
-                
-                # Atualiza texturas de audio (FFT)
-                for audio in self.audios:
-                    # Process FFT if available
-                    if getattr(audio, '_fft_tex', None) is not None:
-                        process_audio_fft(audio, time_delta, self.audio_db_min, self.audio_db_max, 
-                                          self.audio_decay_tau, self.audio_gain)
-                        
-                        #bind audio FFT texture to texture unit and set sampler uniform (iChannelN)
-                        glActiveTexture(GL_TEXTURE0 + audio.channel)
-                        glBindTexture(GL_TEXTURE_2D, audio._fft_tex)
-                    if self.shader_toy:
-                        glUniform2f(uniforms["iChannelResolution"][audio.channel], 512, 2)  # FFT texture size
-                        glUniform1f(uniforms["iChannelTime"][audio.channel], float(passed_time))  # Passed time for audio channel
-                        sampler_name = f"iChannel{audio.channel}"
-                        if sampler_name in uniforms and uniforms[sampler_name] != -1:
-                            glUniform1i(uniforms[sampler_name], int(audio.channel))
-
-                    #pass audio position/time uniform if present
-                    pos_uniform = f"iChannelTime{audio.channel}"
-                    if pos_uniform in uniforms and uniforms[pos_uniform] != -1:
-                        # pass normalized time in seconds - safely read position with lock
-                        with audio._pos_lock:
-                            current_pos = float(audio._pos)
-                        glUniform1f(uniforms[pos_uniform], current_pos / float(audio.sf))
-
-                # Passa todos os uniforms para os shaders
-                parse_uniforms(self.uniforms_source, uniforms)
-
-                # Ativa (bind) VAO
-                glBindVertexArray(vao)
-
-                # Desenha os vértices como triângulos
-                glDrawArrays(self.mode, 0, self.count)
-                
-                # Desativa (unbind) o VAO
-                glBindVertexArray(0)
+                self.draw_frame(frame, passed_time, time_delta)
+
+                # Lê o quadro antes da interface ser desenhada por cima
+                if self.capture is not None:
+                    self.capture.capture()
 
                 # Detecta e armazena as chamadas de teclado
                 if Callbacks.camera is not None:
@@ -390,20 +605,419 @@ class Renderizador:
                 # Aumenta em um no contador de frames
                 frame += 1
 
+                self.profiler.begin("gui")
                 imgui.render()
                 impl.render(imgui.get_draw_data())
+                self.profiler.end()
+                # O imgui restaura a textura da unidade 0 com a da unidade que estava ativa
+                gl_state.forget_texture(0)
 
-                # Faz a troca dos framebuffer (swap frame buffer)
+                # Faz a troca dos framebuffer (swap frame buffer); a troca pode esperar o vblank
+                self.pacer.mark_work_done()
                 glfw.swap_buffers(self.window)
 
-                time.sleep(0.01)
+                # Espera o prazo do quadro conforme o modo de ritmo e mede o tempo do quadro
+                self.pacer.end_frame()
+                gl_state.end_frame()
+                self.profiler.end_frame()
 
-            # Limpa o VAO 
-            glDeleteVertexArrays(1, [vao])
+            self.stop_capture()
+            self.release_pipeline()
 
             stop_audio_streams(self)
 
+            if self.report_stats:
+                self.print_stats()
+
             impl.shutdown()
 
             # finaliza o glfw
             glfw.terminate()
+
+    def print_stats(self):
+        """Print the frame time, GL state and per-pass statistics."""
+        stats = self.pacer.stats()
+        if stats is not None:
+            print(f"Tempos de quadro ({self.pacer.mode}): {stats}")
+        if gl_state.last_frame is not None:
+            print(f"Estado GL por quadro: {gl_state.last_frame}")
+        timings = self.profiler.stats()
+        if timings is not None:
+            print(f"Tempos por passo: {timings}")
+
+    def render_headless(self, frames, fps=60.0, on_frame=None):
+        """
+        Render a fixed number of frames without a window (see render).
+
+        Args:
+            frames: Number of frames to render
+            fps: Frame rate of the offline clock
+            on_frame: Optional function called with (frame, framebuffer)
+        """
+        if frames is None or frames < 1:
+            raise ValueError("headless rendering needs a positive number of frames")
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+
+        width, height = Callbacks.resolution
+        with create_headless_context(self.backend, width, height):
+            gl_state.invalidate()
+            self.framebuffer = Framebuffer(width, height)
+            Callbacks.framebuffer_size = [width, height]
+
+            self.setup_pipeline()
+            init_offline_audio(self)
+            self.start_capture(width, height)
+
+            # Relógio fixo: cada quadro avança exatamente 1/fps, independente do tempo de desenho
+            self.fps = fps
+            for frame in range(frames):
+                passed_time = frame / fps
+                self.time = passed_time
+                set_audio_time(self, passed_time)
+
+                # Sem framebuffer padrão, o FBO fica ligado (o cache pula as ligações repetidas)
+                self.framebuffer.bind()
+                self.draw_frame(frame, passed_time, 1.0 / fps if frame else 0.0)
+
+                if self.capture is not None:
+                    self.capture.capture(self.framebuffer)
+
+                if on_frame is not None:
+                    on_frame(frame, self.framebuffer)
+                gl_state.end_frame()
+                self.profiler.end_frame()
+
+            self.stop_capture()
+            glFinish()
+            self.release_pipeline()
+            self.framebuffer.delete()
+            self.framebuffer = None
+
+    def setup_pipeline(self):
+        """Upload the geometry, textures and audio textures and compile the shaders (needs a current context)."""
+        if self.mode is None and not (self.scene or self.instances or self.dynamic_geometries or self.streamed_geometries):
+            # Use the structured fullscreen quad primitive instead of raw arrays
+            quad = fullscreen_quad()  # Mesh with vertices/colors/uvs and mode GL_TRIANGLE_STRIP
+            self.set_mesh(quad)
+
+        self.vao = None
+        if self.mode is not None:
+            self.vao, count = parse_geometry(self.data, self.mode, self.count, self.index, self.layout)
+        if self.scene:
+            self.scene.upload()
+        for instanced in self.instances:
+            instanced.upload()
+        for dynamic in self.dynamic_geometries:
+            dynamic.upload()
+        for streamed in self.streamed_geometries:
+            streamed.upload()
+        parse_textures(self.textures)
+        parse_audios(self.audios)
+
+        # Fontes finais em variáveis locais: as do usuário continuam valendo para o próximo render()
+        vertex_shader_source = str(self.vertex_shader_source)
+        fragment_shader_source = self.fragment_shader_source
+
+        # Configura os Uniforms para os shaders
+        uniforms = {}
+
+        # Caso os parâmetros do Shader Toy estejam habilidatos
+        if self.shader_toy:
+            # Adiciona o bloco de uniforms do Shader Toy e troca mainImage por main
+            fragment_shader_source = shadertoy_source(fragment_shader_source,
+                                                      0 if self.shader_toy_mIsLowEnd else 1)
+
+        vertex_shader_source = "#version 330 core\n" + vertex_shader_source
+        fragment_shader_source = "#version 330 core\n" + fragment_shader_source
+
+        # Compila os shaders
+        vertexShader_id = compile_shader(GL_VERTEX_SHADER, vertex_shader_source)
+        fragmentShader_id = compile_shader(GL_FRAGMENT_SHADER, fragment_shader_source)
+
+        # Conecta (link) os shaders para a aplicação
+        program_id = link_shader(vertexShader_id, fragmentShader_id)
+
+        # Caso os parâmetros do Shader Toy estejam habilidatos
+        self.shadertoy = None
+        if self.shader_toy:
+            # Bloco de uniforms do ShaderToy, enviado com uma única chamada por quadro
+            self.shadertoy = ShaderToyUniforms()
+            self.shadertoy.attach(program_id)
+            for texture in self.textures:
+                self.shadertoy.set_channel(texture.channel, (texture.image.shape[1], texture.image.shape[0]))
+            for audio in self.audios:
+                self.shadertoy.set_channel(audio.channel, (512, 2))  # FFT texture size
+
+            # Compila só os buffers cuja saída chega à imagem
+            self.buffers.setup(set(self.buffer_channels.values()), self.shadertoy,
+                               0 if self.shader_toy_mIsLowEnd else 1, self.uniforms_source)
+        elif self.buffer_channels:
+            raise ValueError("buffer passes need shader_toy=True")
+
+        # Cadastra os Uniforms
+        for field in self.uniforms_source:
+            uniforms[field] = glGetUniformLocation(program_id, field)
+
+        # remove os shaders da memória
+        glDeleteShader(vertexShader_id)
+        glDeleteShader(fragmentShader_id)
+
+        # Alvo em escala reduzida; o controlador usa os tempos de GPU do passo da cena
+        if self.upscaler is not None and self.progressive is not None:
+            raise ValueError("progressive rendering cannot be combined with a render scale")
+        if self.upscaler is not None:
+            self.upscaler.setup()
+        if self.resolution_controller is not None:
+            self.profiler.enabled = True
+
+        # Define no contexto qual a cor para limpar o buffer de cores
+        glClearColor(*self.background_color)
+
+        # Ativa o Z-Buffer
+        glEnable(GL_DEPTH_TEST)
+
+        self.program_id = program_id
+        self.uniforms = uniforms
+
+        # Funções de envio dos uniforms, montadas uma vez com os tipos reais do GLSL
+        self.uniform_setters = bind_uniforms(program_id, self.uniforms_source)
+
+    def draw_frame(self, frame, passed_time, time_delta):
+        """
+        Draw the frame into the output, at the render scale if one is set.
+
+        Args:
+            frame: Frame number (iFrame)
+            passed_time: Time in seconds (iTime)
+            time_delta: Time since the previous frame (iTimeDelta)
+        """
+        output = 0 if self.framebuffer is None else self.framebuffer.fbo
+        width, height = Callbacks.framebuffer_size
+        if self.progressive is not None and width > 0 and height > 0:
+            self.draw_progressive(passed_time, output, width, height)
+            return
+
+        profiler = self.profiler
+        if self.audios:
+            profiler.begin("audio")
+            self.update_audio(passed_time, time_delta)
+            profiler.end()
+
+        if self.upscaler is None or width <= 0 or height <= 0:
+            profiler.begin("scene")
+            self.draw_scene(frame, passed_time, time_delta, output, (width, height))
+            profiler.end()
+            return
+
+        # Tempo de GPU da cena (de alguns quadros atrás) lido no fim do quadro anterior
+        if self.resolution_controller is not None:
+            self.render_scale = self.resolution_controller.update(profiler.latest.get("scene"))
+
+        # Desenha no canto do alvo reduzido e amplia para a saída
+        target, size = self.upscaler.begin(width, height, self.render_scale)
+        profiler.begin("scene")
+        self.draw_scene(frame, passed_time, time_delta, target, size)
+        profiler.end()
+        profiler.begin("upscale")
+        self.upscaler.present(output, width, height)
+        profiler.end()
+
+    def draw_progressive(self, passed_time, output, width, height):
+        """
+        Draw the next tiles of the progressive image and show it.
+
+        Args:
+            passed_time: Time of the frame
+            output: Output framebuffer
+            width, height: Output size
+        """
+        tiles = self.progressive
+        profiler = self.profiler
+        target = tiles.begin(width, height)
+        if tiles.start_sweep(passed_time):
+            if self.audios:
+                profiler.begin("audio")
+                self.update_audio(tiles.time, tiles.time_delta)
+                profiler.end()
+
+            # Uma varredura é um quadro da animação: iFrame conta as varreduras
+            profiler.begin("scene")
+            self.update_scene(tiles.sweeps - 1, tiles.time, tiles.time_delta, target, (width, height))
+        else:
+            profiler.begin("scene")
+            self.bind_scene()
+
+        def draw_tile():
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            self.draw_geometry()
+
+        tiles.draw(draw_tile)
+        tiles.present(output, width, height)
+        profiler.end()
+
+    def draw_scene(self, frame, passed_time, time_delta, target, size):
+        """
+        Clear the current framebuffer, set the uniforms and textures and draw everything.
+
+        Args:
+            frame: Frame number (iFrame)
+            passed_time: Time in seconds (iTime)
+            time_delta: Time since the previous frame (iTimeDelta)
+            target: Framebuffer drawn into (bound again after the buffer passes)
+            size: (width, height) drawn, used as iResolution
+        """
+        self.update_scene(frame, passed_time, time_delta, target, size)
+
+        # Limpa a janela com a cor de fundo e apagar o z-buffer
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+        self.draw_geometry()
+
+    def update_audio(self, passed_time, time_delta):
+        """
+        Upload the FFT textures of the audio channels (before update_scene).
+
+        Args:
+            passed_time: Time in seconds (iChannelTime of the ShaderToy block)
+            time_delta: Time since the previous update, for the decay
+        """
+        # Atualiza texturas de audio (FFT)
+        for audio in self.audios:
+            # Process FFT if available
+            if getattr(audio, '_fft_tex', None) is not None:
+                process_audio_fft(audio, time_delta, self.audio_db_min, self.audio_db_max, 
+                                  self.audio_decay_tau, self.audio_gain)
+            if self.shader_toy:
+                self.shadertoy.set_channel(audio.channel, time=passed_time)  # Passed time for audio channel
+
+    def update_scene(self, frame, passed_time, time_delta, target, size):
+        """
+        Advance the frame state: uniforms, buffer passes and the frame callback.
+
+        Leaves the program and the textures of the image bound (see bind_scene).
+        The arguments are the same as in draw_scene.
+        """
+        uniforms = self.uniforms
+
+        # Fazendo os uniforms básicos do ShaderToy (um único glBufferSubData)
+        if self.shader_toy:
+            # O mouse está em pixels da saída; iMouse usa os pixels desenhados
+            mouse = Callbacks.get_mouse_clicked()
+            if size[0] != Callbacks.framebuffer_size[0]:
+                mouse = mouse * (size[0] / Callbacks.framebuffer_size[0])
+            self.shadertoy.update(size, passed_time, time_delta, self.fps, frame, mouse)
+
+        # Passos Buffer A-D, desenhados nos seus framebuffers antes da imagem
+        if self.buffers.active:
+            self.draw_buffers(target, size)
+
+        self.bind_scene()
+
+        for audio in self.audios:
+            #pass audio position/time uniform if present
+            pos_uniform = f"iChannelTime{audio.channel}"
+            if pos_uniform in uniforms and uniforms[pos_uniform] != -1:
+                # pass normalized time in seconds - safely read position with lock
+                with audio._pos_lock:
+                    current_pos = float(audio._pos)
+                glUniform1f(uniforms[pos_uniform], current_pos / float(audio.sf))
+
+        # Atualizações da aplicação para este quadro (geometria, instâncias, etc.)
+        if self.frame_callback is not None:
+            self.frame_callback(passed_time, time_delta)
+
+        # Passa todos os uniforms para os shaders (uma chamada por uniform)
+        set_uniforms(self.uniform_setters)
+
+    def bind_scene(self):
+        """Bind the program of the image and the textures of its channels."""
+        # use our own rendering program (o cache pula as ligações que não mudam)
+        gl_state.use_program(self.program_id)
+
+        # Case existam texturas
+        for texture in self.textures:
+            # Liga a textura para o OpenGL (o sampler iChannelN usa a unidade N)
+            gl_state.bind_texture(texture.texture_id, texture.channel)
+
+        # Saídas dos buffers lidas pela imagem
+        for channel, name in self.buffer_channels.items():
+            gl_state.bind_texture(self.buffers.texture(name), channel)
+
+        for audio in self.audios:
+            if getattr(audio, '_fft_tex', None) is not None:
+                #bind audio FFT texture to texture unit (iChannelN)
+                gl_state.bind_texture(audio._fft_tex, audio.channel)
+
+    def draw_geometry(self):
+        """Draw the geometry with the state set by update_scene."""
+        if self.mode is not None:
+            # Ativa (bind) VAO; fica ligado até outro VAO ser usado
+            gl_state.bind_vertex_array(self.vao)
+
+            # Desenha os vértices como triângulos (pelos índices do EBO, se houver)
+            if self.index is not None:
+                glDrawElements(self.mode, self.count, index_type(self.index), None)
+            else:
+                glDrawArrays(self.mode, 0, self.count)
+
+        # Desenha todas as malhas da cena com poucas chamadas de multi-draw
+        if self.scene:
+            self.scene.draw(self.camera)
+
+        # Desenha as malhas instanciadas
+        for instanced in self.instances:
+            instanced.draw()
+
+        # Envia e desenha as geometrias dinâmicas
+        for dynamic in self.dynamic_geometries:
+            dynamic.draw()
+
+        # Desenha as geometrias montadas em blocos
+        for streamed in self.streamed_geometries:
+            streamed.draw()
+
+    def draw_buffers(self, target, size):
+        """
+        Draw the buffer passes and bind the target framebuffer again.
+
+        Args:
+            target: Framebuffer of the image pass
+            size: (width, height) of the image pass
+        """
+        width, height = size
+        if self.buffers.resize(width, height):
+            # Alvos realocados: a imagem lê os buffers com o novo tamanho
+            for channel in self.buffer_channels:
+                self.shadertoy.set_channel(channel, (width, height))
+            self.shadertoy.upload()
+
+        self.buffers.draw(self.shadertoy)
+
+        gl_state.bind_framebuffer(GL_FRAMEBUFFER, target)
+        gl_state.viewport(0, 0, width, height)
+
+    def release_pipeline(self):
+        """Delete the GL objects created by setup_pipeline."""
+        # Limpa o VAO 
+        if self.vao is not None:
+            gl_state.delete_vertex_array(self.vao)
+            self.vao = None
+        self.scene.delete()
+        for instanced in self.instances:
+            instanced.delete()
+        for dynamic in self.dynamic_geometries:
+            dynamic.delete()
+        for streamed in self.streamed_geometries:
+            streamed.delete()
+        glDeleteProgram(self.program_id)
+        if self.shadertoy is not None:
+            self.shadertoy.delete()
+            self.shadertoy = None
+        self.buffers.delete()
+        if self.upscaler is not None:
+            self.upscaler.delete()
+        self.profiler.delete()
+        if self.progressive is not None:
+            self.progressive.delete()
+        gl_state.invalidate()
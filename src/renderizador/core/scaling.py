@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Dynamic resolution: picks the render scale that holds a target frame rate.
+
+The cost of a fragment-bound frame is roughly proportional to the number of
+pixels, that is, to the square of the scale. From the smoothed GPU time of
+the scaled pass the controller estimates the scale that fits the frame
+budget, and changes the scale only when that estimate leaves a dead band
+around the current one (hysteresis), in steps of `step`, and at least
+`cooldown` frames after the previous change. Every change reallocates the
+buffer passes, so the scale must not oscillate from frame to frame.
+
+GPU times arrive a few frames late, so the first `warmup` measurements after
+a change (which belong to the old scale or include the reallocation) are
+discarded.
+"""
+
+import math
+
+
+class ResolutionController:
+    """Adjusts the render scale from measured frame times."""
+
+    def __init__(self, target_fps=60.0, scale=1.0, min_scale=0.25, max_scale=1.0,
+                 headroom=0.9, step=0.05, hysteresis=0.1, cooldown=30, warmup=4, smoothing=0.1):
+        """
+        Args:
+            target_fps: Frame rate to hold
+            scale: Initial scale (fraction of the output width and height)
+            min_scale, max_scale: Limits of the scale
+            headroom: Fraction of the frame interval the scaled pass may use
+            step: Scales are multiples of this value (fewer distinct sizes)
+            hysteresis: Relative difference between the estimated and the
+                current scale needed to change it
+            cooldown: Frames to wait after a change before the next one
+            warmup: Measurements discarded after a change
+            smoothing: Weight of each new measurement in the moving average
+        """
+        if target_fps <= 0:
+            raise ValueError("target_fps must be positive")
+        if not 0 < min_scale <= max_scale:
+            raise ValueError("scales must satisfy 0 < min_scale <= max_scale")
+
+        self.target_fps = float(target_fps)
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.headroom = headroom
+        self.step = step
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+        self.warmup = warmup
+        self.smoothing = smoothing
+
+        self.scale = self.clamp(scale)
+        self.average = None
+        self.frames = 0
+        self.changes = 0
+
+    @property
+    def budget(self):
+        """Time available for the scaled pass, in seconds."""
+        return self.headroom / self.target_fps
+
+    def clamp(self, scale):
+        return min(max(scale, self.min_scale), self.max_scale)
+
+    def update(self, time):
+        """
+        Add a measurement and possibly change the scale.
+
+        Args:
+            time: GPU (or frame) time of the scaled pass in seconds, or None
+
+        Returns:
+            The scale for the next frame
+        """
+        self.frames += 1
+        if time is None or time <= 0 or self.frames <= self.warmup:
+            return self.scale
+        if self.average is None:
+            self.average = time
+        else:
+            self.average += self.smoothing * (time - self.average)
+        if self.frames < self.cooldown:
+            return self.scale
+
+        # Custo proporcional ao número de pixels: escala ao quadrado
+        ideal = self.clamp(self.scale * math.sqrt(self.budget / self.average))
+        if abs(ideal - self.scale) <= self.hysteresis * self.scale:
+            return self.scale
+
+        # Arredonda para baixo para sobrar folga no orçamento
+        scale = self.clamp(round(math.floor(ideal / self.step + 1e-6) * self.step, 6))
+        if scale != self.scale:
+            self.scale = scale
+            self.changes += 1
+            # As medidas antigas eram de outra escala
+            self.average = None
+            self.frames = 0
+        return self.scale
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+GPU timing with GL_TIME_ELAPSED queries.
+
+The GPU runs a few frames behind the CPU, so asking for a query result right
+after the frame stalls until the GPU catches up. GPUTimer keeps a ring of
+queries instead: each frame starts a new one, and only results that are
+already available (usually from two or three frames ago) are read.
+
+FrameProfiler times the passes of a frame (audio upload, scene, upscale,
+GUI) on the CPU and, with one GPUTimer per pass, on the GPU. The results are
+tagged with their frame number, so the late GPU times land in the history
+slot of the frame that issued them. GL_TIME_ELAPSED queries cannot overlap,
+so the passes must not be nested.
+"""
+
+import ctypes
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.raw.GL.VERSION.GL_1_5 import glGetQueryObjectiv as raw_query_objectiv
+from OpenGL.raw.GL.VERSION.GL_3_3 import glGetQueryObjectui64v as raw_query_objectui64v
+
+
+class GPUTimer:
+    """Ring of GL_TIME_ELAPSED queries read without stalling."""
+
+    def __init__(self, size=4):
+        """
+        Create the queries; needs a current context.
+
+        Args:
+            size: Number of queries in flight (frames of latency tolerated)
+        """
+        self.queries = [int(query) for query in np.atleast_1d(glGenQueries(size))]
+        self.free = deque(self.queries)
+        self.pending = deque()
+        self.active = None
+        self.last = None
+
+        # Saídas reutilizadas pelas chamadas cruas (evita conversões do PyOpenGL)
+        self.available = ctypes.c_int()
+        self.elapsed = ctypes.c_uint64()
+
+    def begin(self, tag=None):
+        """
+        Start timing; the frame is skipped if every query is still in flight.
+
+        Args:
+            tag: Value returned with the result (e.g. the frame number)
+        """
+        if not self.free:
+            return
+        # Guarda o instante do início para descartar resultados impossíveis
+        self.active = (self.free.popleft(), tag, time.perf_counter())
+        glBeginQuery(GL_TIME_ELAPSED, self.active[0])
+
+    def end(self):
+        """Stop timing the commands issued since begin()."""
+        if self.active is None:
+            return
+        glEndQuery(GL_TIME_ELAPSED)
+        self.pending.append(self.active)
+        self.active = None
+
+    def results(self):
+        """
+        Read the results that are ready, oldest first.
+
+        Returns:
+            List of (tag, GPU time in seconds); self.last keeps the latest time.
+            Times longer than the wall time since begin() are invalid (some
+            drivers, e.g. llvmpipe, return an absolute timestamp for the
+            first query of a context) and are dropped
+        """
+        results = []
+        while self.pending:
+            query, tag, start = self.pending[0]
+            raw_query_objectiv(query, GL_QUERY_RESULT_AVAILABLE, ctypes.byref(self.available))
+            if not self.available.value:
+                break
+            raw_query_objectui64v(query, GL_QUERY_RESULT, ctypes.byref(self.elapsed))
+            self.pending.popleft()
+            self.free.append(query)
+            elapsed = self.elapsed.value * 1e-9
+            if elapsed > time.perf_counter() - start:
+                continue
+            self.last = elapsed
+            results.append((tag, elapsed))
+        return results
+
+    def collect(self):
+        """
+        Read the results that are ready.
+
+        Returns:
+            GPU time in seconds of the newest measurement finished since the
+            last call, or None if none finished (self.last keeps the latest)
+        """
+        results = self.results()
+        return results[-1][1] if results else None
+
+    def delete(self):
+        """Release the queries."""
+        if self.queries:
+            glDeleteQueries(len(self.queries), self.queries)
+        self.queries = []
+        self.free.clear()
+        self.pending.clear()
+
+
+@dataclass
+class PassTimings:
+    """Mean CPU and GPU time of one pass over the recent frames, in milliseconds."""
+
+    name: str
+    cpu: float
+    gpu: float
+
+    def __str__(self):
+        gpu = "-" if np.isnan(self.gpu) else f"{self.gpu:.2f} ms"
+        return f"{self.name}: CPU {self.cpu:.2f} ms, GPU {gpu}"
+
+
+@dataclass
+class FrameTimings:
+    """Mean frame interval and CPU/GPU time of the passes, in milliseconds."""
+
+    frames: int
+    frame: float
+    cpu: float
+    gpu: float
+    passes: list
+
+    def __str__(self):
+        passes = "; ".join(str(timings) for timings in self.passes)
+        return (
+            f"{self.frames} quadros, quadro {self.frame:.2f} ms, CPU {self.cpu:.2f} ms, "
+            f"GPU {self.gpu:.2f} ms ({passes})"
+        )
+
+
+class FrameProfiler:
+    """CPU and GPU time of each pass of the recent frames."""
+
+    def __init__(self, history=240, queries=4):
+        """
+        Args:
+            history: Number of frames kept
+            queries: Queries in flight per pass (see GPUTimer)
+        """
+        self.enabled = True
+        self.history = history
+        self.queries = queries
+
+        # Por passo: tempos de CPU e de GPU (segundos) num buffer circular de quadros
+        self.timers = {}
+        self.cpu = {}
+        self.gpu = {}
+        self.frame_times = np.zeros(history, np.float32)
+        self.frames = 0
+        self.frame_start = None
+
+        # Tempos de GPU recebidos no último end_frame, por passo
+        self.latest = {}
+
+        self.active = None
+        self.start = None
+
+    @property
+    def slot(self):
+        """History slot of the current frame."""
+        return self.frames % self.history
+
+    def begin(self, name):
+        """
+        Start timing a pass (needs a current context; passes cannot be nested).
+
+        Args:
+            name: Name of the pass
+        """
+        if not self.enabled:
+            return
+        if name not in self.timers:
+            self.timers[name] = GPUTimer(self.queries)
+        if name not in self.cpu:
+            self.cpu[name] = np.zeros(self.history, np.float32)
+            self.gpu[name] = np.full(self.history, np.nan, np.float32)
+        self.active = name
+        self.timers[name].begin(self.frames)
+        self.start = time.perf_counter()
+
+    def end(self):
+        """Stop timing the current pass."""
+        if self.active is None:
+            return
+        self.cpu[self.active][self.slot] += time.perf_counter() - self.start
+        self.timers[self.active].end()
+        self.active = None
+
+    def end_frame(self):
+        """Record the frame interval, read the finished GPU times and start a new frame."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.frame_times[self.slot] = now - self.frame_start
+        self.frame_start = now
+
+        self.latest = {}
+        for name, timer in self.timers.items():
+            for frame, elapsed in timer.results():
+                # Resultado atrasado: vai para o quadro que emitiu a consulta
+                if self.frames - frame < self.history:
+                    self.gpu[name][frame % self.history] = elapsed
+                self.latest[name] = elapsed
+
+        self.frames += 1
+        slot = self.slot
+        for name in self.cpu:
+            self.cpu[name][slot] = 0.0
+            self.gpu[name][slot] = np.nan
+
+    def recent(self, frames):
+        """Slots of the last finished frames, oldest first."""
+        count = min(frames, self.frames, self.history - 1)
+        return (self.frames - count + np.arange(count)) % self.history
+
+    def gpu_total(self):
+        """GPU time of every pass summed per frame (seconds, 0 when unknown), by slot."""
+        if not self.gpu:
+            return np.zeros(self.history, np.float32)
+        return np.nansum(np.stack(list(self.gpu.values())), axis=0)
+
+    def stats(self, frames=120):
+        """
+        Mean timings of the last frames.
+
+        Args:
+            frames: Number of finished frames averaged
+
+        Returns:
+            FrameTimings (milliseconds), or None before the first frame
+        """
+        slots = self.recent(frames)
+        if slots.size == 0:
+            return None
+        passes = []
+        for name in self.cpu:
+            gpu = self.gpu[name][slots]
+            gpu = gpu[~np.isnan(gpu)]
+            passes.append(PassTimings(
+                name,
+                float(self.cpu[name][slots].mean()) * 1e3,
+                float(gpu.mean()) * 1e3 if gpu.size else float("nan"),
+            ))
+        # O primeiro quadro não tem intervalo medido
+        frame = self.frame_times[slots]
+        frame = frame[frame > 0]
+        return FrameTimings(
+            int(slots.size),
+            float(frame.mean()) * 1e3 if frame.size else 0.0,
+            sum(timings.cpu for timings in passes),
+            sum(timings.gpu for timings in passes if not np.isnan(timings.gpu)),
+            passes,
+        )
+
+    def delete(self):
+        """Release the queries (the history is kept)."""
+        for timer in self.timers.values():
+            timer.delete()
+        self.timers = {}
+        self.active = None
@@ -11,13 +11,27 @@ Data: 12 de Outubro de 2025
 Módulo de gráficos contendo geometria, shaders, manipulação de texturas e câmera.
 """
 
-from renderizador.graphics.geometry import create_geometry_data, parse_geometry
+from renderizador.graphics.geometry import create_geometry_data, create_indexed_geometry_data, parse_geometry
 from renderizador.graphics.shaders import compile_shader, link_shader, default_vertex_shader, default_fragment_shader
 from renderizador.graphics.texture import Texture, parse_textures
 from renderizador.graphics.camera import Camera
+from renderizador.graphics.mesh import Mesh
+from renderizador.graphics.scene import Scene
+from renderizador.graphics.instancing import InstancedMesh
+from renderizador.graphics.dynamic import DynamicGeometry
+from renderizador.graphics.framebuffer import Framebuffer
+from renderizador.graphics.shadertoy import ShaderToyUniforms
+from renderizador.graphics.multipass import BufferPass, MultiPass
+from renderizador.graphics.state import GLState, gl_state
+from renderizador.graphics.upscale import Upscaler
+from renderizador.graphics.progressive import ProgressiveTiles
+from renderizador.graphics.loaders import load_mesh
+from renderizador.graphics.lod import LODChain, load_lod_chain
+from renderizador.graphics.vertex_format import VertexFormat, VertexLayout
 
 __all__ = [
     'create_geometry_data',
+    'create_indexed_geometry_data',
     'parse_geometry',
     'compile_shader',
     'link_shader',
@@ -25,5 +39,22 @@ __all__ = [
     'default_fragment_shader',
     'Texture',
     'parse_textures',
-    'Camera'
+    'Camera',
+    'Mesh',
+    'Scene',
+    'InstancedMesh',
+    'DynamicGeometry',
+    'Framebuffer',
+    'ShaderToyUniforms',
+    'BufferPass',
+    'MultiPass',
+    'GLState',
+    'gl_state',
+    'Upscaler',
+    'ProgressiveTiles',
+    'load_mesh',
+    'LODChain',
+    'load_lod_chain',
+    'VertexFormat',
+    'VertexLayout'
 ]
\ No newline at end of file
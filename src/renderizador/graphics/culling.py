@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Bounding volumes and view frustum culling.
+
+Objects get an axis-aligned bounding box (AABB) and a bounding sphere. A
+bounding volume hierarchy (BVH) groups nearby objects so a node outside the
+view frustum removes its whole subtree with a single test, and a node fully
+inside accepts its subtree without testing its objects.
+
+The BVH is traversed breadth-first: every node of a level is tested against
+the six frustum planes with one NumPy expression, so the cost per frame is a
+few array operations per tree level instead of one test per object.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Objetos por folha da BVH
+LEAF_SIZE = 4
+
+
+@dataclass
+class CullingStats:
+    """Counters of the last culling pass."""
+
+    nodes_tested: int = 0
+    objects_tested: int = 0
+    objects_culled: int = 0
+    objects_visible: int = 0
+
+
+def aabb(vertices):
+    """
+    Axis-aligned bounding box of a set of points.
+
+    Args:
+        vertices: (N,3) array
+
+    Returns:
+        Tuple of ((3,) minimum, (3,) maximum)
+    """
+    if vertices.shape[0] == 0:
+        return np.zeros(3, np.float32), np.zeros(3, np.float32)
+    return vertices.min(axis=0), vertices.max(axis=0)
+
+
+def bounding_sphere(vertices):
+    """
+    Bounding sphere centered on the bounding box of the vertices.
+
+    Args:
+        vertices: (N,3) array
+
+    Returns:
+        Tuple of ((3,) center, radius)
+    """
+    if vertices.shape[0] == 0:
+        return np.zeros(3, np.float32), 0.0
+    low, high = aabb(vertices)
+    center = (low + high) / 2
+    return center, float(np.sqrt(np.max(np.sum((vertices - center) ** 2, axis=1))))
+
+
+def frustum_planes(matrix):
+    """
+    Extract the six frustum planes from a projection @ view matrix.
+
+    Uses the Gribb-Hartmann method: each plane is a sum or difference of the
+    last row and another row of the matrix (column vector convention).
+
+    Args:
+        matrix: 4x4 clip matrix (projection @ view)
+
+    Returns:
+        (6,4) array of planes (a, b, c, d), normalized and pointing inwards:
+        a point p is inside a plane when a*x + b*y + c*z + d >= 0
+    """
+    m = np.asarray(matrix, np.float64)
+    planes = np.array([
+        m[3] + m[0],    # esquerda
+        m[3] - m[0],    # direita
+        m[3] + m[1],    # baixo
+        m[3] - m[1],    # cima
+        m[3] + m[2],    # perto
+        m[3] - m[2],    # longe
+    ])
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+
+def classify_boxes(planes, low, high):
+    """
+    Classify AABBs against the frustum.
+
+    For each plane only the box corner furthest along the plane normal
+    (p-vertex) and the nearest one (n-vertex) need to be tested.
+
+    Args:
+        planes: (6,4) array from frustum_planes
+        low: (K,3) box minimums
+        high: (K,3) box maximums
+
+    Returns:
+        Tuple of ((K,) bool outside, (K,) bool fully inside)
+    """
+    positive = planes[:, :3] >= 0
+    # (K,6,3): canto mais à frente e mais atrás de cada caixa para cada plano
+    p_vertex = np.where(positive, high[:, None, :], low[:, None, :])
+    n_vertex = np.where(positive, low[:, None, :], high[:, None, :])
+    p_distance = np.einsum("kpi,pi->kp", p_vertex, planes[:, :3]) + planes[:, 3]
+    n_distance = np.einsum("kpi,pi->kp", n_vertex, planes[:, :3]) + planes[:, 3]
+    return np.any(p_distance < 0, axis=1), np.all(n_distance >= 0, axis=1)
+
+
+class BVH:
+    """Bounding volume hierarchy over object AABBs, stored in flat arrays."""
+
+    def __init__(self, low, high, leaf_size=LEAF_SIZE):
+        """
+        Build the hierarchy with median splits along the longest axis.
+
+        Args:
+            low: (N,3) object AABB minimums
+            high: (N,3) object AABB maximums
+            leaf_size: Maximum number of objects in a leaf
+        """
+        self.object_low = np.asarray(low, np.float32)
+        self.object_high = np.asarray(high, np.float32)
+        count = self.object_low.shape[0]
+
+        # Objetos reordenados de forma que cada nó cubra um intervalo contíguo
+        self.objects = np.arange(count)
+        nodes_low, nodes_high, children, ranges = [], [], [], []
+        centers = (self.object_low + self.object_high) / 2
+
+        def build(start, stop):
+            node = len(ranges)
+            members = self.objects[start:stop]
+            nodes_low.append(self.object_low[members].min(axis=0))
+            nodes_high.append(self.object_high[members].max(axis=0))
+            children.append((-1, -1))
+            ranges.append((start, stop))
+            if stop - start > leaf_size:
+                extent = centers[members].max(axis=0) - centers[members].min(axis=0)
+                axis = int(np.argmax(extent))
+                middle = (stop - start) // 2
+                split = np.argpartition(centers[members, axis], middle)
+                self.objects[start:stop] = members[split]
+                left = build(start, start + middle)
+                right = build(start + middle, stop)
+                children[node] = (left, right)
+            return node
+
+        if count:
+            build(0, count)
+
+        self.low = np.array(nodes_low, np.float32).reshape(-1, 3)
+        self.high = np.array(nodes_high, np.float32).reshape(-1, 3)
+        self.children = np.array(children, np.int64).reshape(-1, 2)
+        self.ranges = np.array(ranges, np.int64).reshape(-1, 2)
+
+    def cull(self, planes, stats=None):
+        """
+        Find the objects whose AABB intersects the frustum.
+
+        Args:
+            planes: (6,4) array from frustum_planes
+            stats: Optional CullingStats updated with the counters of this pass
+
+        Returns:
+            (N,) bool array, True for visible objects
+        """
+        visible = np.zeros(self.objects.size, bool)
+        nodes_tested = objects_tested = 0
+
+        frontier = np.zeros(1, np.int64) if self.objects.size else np.zeros(0, np.int64)
+        while frontier.size:
+            outside, inside = classify_boxes(planes, self.low[frontier], self.high[frontier])
+            nodes_tested += frontier.size
+
+            # Nós totalmente dentro: toda a subárvore é visível sem mais testes
+            for start, stop in self.ranges[frontier[inside]]:
+                visible[self.objects[start:stop]] = True
+
+            crossing = frontier[~outside & ~inside]
+            leaves = crossing[self.children[crossing, 0] < 0]
+            if leaves.size:
+                # Folhas cortadas por algum plano: testa cada objeto
+                members = np.concatenate([self.objects[start:stop] for start, stop in self.ranges[leaves]])
+                object_outside, _ = classify_boxes(planes, self.object_low[members], self.object_high[members])
+                visible[members[~object_outside]] = True
+                objects_tested += members.size
+
+            inner = crossing[self.children[crossing, 0] >= 0]
+            frontier = self.children[inner].reshape(-1)
+
+        if stats is not None:
+            stats.nodes_tested = nodes_tested
+            stats.objects_tested = objects_tested
+            stats.objects_visible = int(np.count_nonzero(visible))
+            stats.objects_culled = self.objects.size - stats.objects_visible
+        return visible
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Dynamic geometry module: vertex data streamed to the GPU every frame.
+
+Meant for simulation output (cloth, fluid surfaces) that changes every frame.
+Two upload strategies avoid making the CPU wait for the GPU still drawing the
+previous frame:
+
+- "orphan": full updates re-specify the buffer storage (glBufferData with no
+  data) before writing, so the driver hands out fresh memory while the GPU
+  keeps reading the old one.
+- "ring": the buffer holds several copies (segments) of the geometry. Each
+  frame writes the next segment through an unsynchronized glMapBufferRange
+  and a fence marks when the GPU is done with it.
+
+Partial updates (a range of vertices) are supported by both strategies.
+"""
+
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.graphics.geometry import index_array, index_type, interleave_attributes, set_vertex_layout, vertex_attributes
+from renderizador.graphics.instancing import merge_runs
+from renderizador.graphics.state import gl_state
+
+FLOATS_PER_VERTEX = 11
+VERTEX_BYTES = FLOATS_PER_VERTEX * 4
+
+
+class DynamicGeometry:
+    """Geometry whose vertices are replaced or partially updated every frame."""
+
+    def __init__(self, mode, capacity, index=None, strategy="ring", segments=3):
+        """
+        Initialize the dynamic geometry.
+
+        Args:
+            mode: OpenGL drawing mode
+            capacity: Maximum number of vertices
+            index: Optional static index array (the topology does not change)
+            strategy: "ring" (fenced ring of segments) or "orphan" (buffer orphaning)
+            segments: Number of segments in the ring (3 = triple buffering)
+        """
+        if strategy not in ("ring", "orphan"):
+            raise ValueError('strategy must be "ring" or "orphan"')
+
+        self.mode = mode
+        self.capacity = int(capacity)
+        self.strategy = strategy
+        self.segments = segments if strategy == "ring" else 1
+        self.index = None if index is None else index_array(index, self.capacity)
+
+        # Cópia na CPU do conteúdo atual, escrita diretamente pelo update()
+        self.data = interleave_attributes(np.zeros((self.capacity, 3), np.float32))
+        self.vertex_count = 0
+
+        self.vao = None
+        self.buffer = None
+        self.index_buffer = None
+        self.segment = 0
+        self.fences = [None] * self.segments
+
+        # Intervalos [início, fim) de vértices ainda não enviados, por segmento
+        self.pending = [[] for _ in range(self.segments)]
+
+        # Estatísticas: vezes em que foi preciso esperar a GPU liberar um segmento
+        self.stalls = 0
+
+    @property
+    def count(self):
+        """Number of vertices (or indices) drawn."""
+        return self.index.size if self.index is not None else self.vertex_count
+
+    def update(self, vertices, normals=None, colors=None, uvs=None, first=0):
+        """
+        Replace the vertices starting at `first` with new data.
+
+        The arrays are interleaved straight into the CPU copy; the GPU upload
+        happens on the next draw.
+
+        Args:
+            vertices: (N,3) array of positions
+            normals: Optional (N,3) array of normals
+            colors: Optional (N,3) array of colors
+            uvs: Optional (N,2) array of texture coordinates
+            first: Index of the first vertex to replace
+        """
+        vertices, normals, colors, uvs = vertex_attributes(vertices, normals, colors, uvs)
+        stop = first + vertices.shape[0]
+        if first < 0 or stop > self.capacity:
+            raise ValueError("update exceeds the capacity of the dynamic geometry")
+
+        interleave_attributes(vertices, normals, colors, uvs, out=self.data[first:stop])
+        self.mark_dirty(first, stop)
+
+    def update_interleaved(self, data, first=0):
+        """
+        Replace vertices with data already in the 11-float interleaved layout.
+
+        Args:
+            data: (N,11) float32 array
+            first: Index of the first vertex to replace
+        """
+        data = np.asarray(data, np.float32).reshape(-1, FLOATS_PER_VERTEX)
+        stop = first + data.shape[0]
+        if first < 0 or stop > self.capacity:
+            raise ValueError("update exceeds the capacity of the dynamic geometry")
+
+        self.data[first:stop] = data
+        self.mark_dirty(first, stop)
+
+    def mark_dirty(self, start, stop):
+        """Record that vertices [start, stop) must be sent to every segment."""
+        self.vertex_count = max(self.vertex_count, stop)
+        for pending in self.pending:
+            pending.append((start, stop))
+
+    def upload(self):
+        """Create the VAO and allocate the (possibly segmented) vertex buffer."""
+        self.vao = glGenVertexArrays(1)
+        gl_state.bind_vertex_array(self.vao)
+
+        self.buffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.segments * self.capacity * VERTEX_BYTES, None, GL_STREAM_DRAW)
+        set_vertex_layout()
+
+        if self.index is not None:
+            self.index_buffer = glGenBuffers(1)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.index.nbytes, self.index, GL_STATIC_DRAW)
+
+        gl_state.bind_vertex_array(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        return self.vao
+
+    def flush(self):
+        """Send pending vertex ranges to the GPU using the configured strategy."""
+        if self.strategy == "ring":
+            self.flush_ring()
+        else:
+            self.flush_orphan()
+
+    def flush_orphan(self):
+        pending = merge_runs(self.pending[0], max_gap=0)
+        if not pending:
+            return
+        self.pending[0] = []
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        if pending == [(0, self.vertex_count)]:
+            # Atualização completa: orfana o armazenamento antigo e escreve num novo
+            glBufferData(GL_ARRAY_BUFFER, self.capacity * VERTEX_BYTES, None, GL_STREAM_DRAW)
+        for start, stop in pending:
+            glBufferSubData(GL_ARRAY_BUFFER, start * VERTEX_BYTES, (stop - start) * VERTEX_BYTES, self.data[start:stop])
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def flush_ring(self):
+        # Avança para o próximo segmento; ele foi usado pela GPU há `segments` quadros
+        self.segment = (self.segment + 1) % self.segments
+        pending = merge_runs(self.pending[self.segment], max_gap=0)
+        if not pending:
+            return
+        self.pending[self.segment] = []
+
+        self.wait_segment(self.segment)
+
+        base = self.segment * self.capacity
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        for start, stop in pending:
+            size = (stop - start) * VERTEX_BYTES
+            pointer = glMapBufferRange(
+                GL_ARRAY_BUFFER, (base + start) * VERTEX_BYTES, size,
+                GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_RANGE_BIT | GL_MAP_UNSYNCHRONIZED_BIT
+            )
+            ctypes.memmove(pointer, self.data[start:stop].ctypes.data, size)
+            glUnmapBuffer(GL_ARRAY_BUFFER)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def wait_segment(self, segment):
+        """Wait until the GPU has finished reading a segment (normally already done)."""
+        fence = self.fences[segment]
+        if fence is None:
+            return
+        status = glClientWaitSync(fence, 0, 0)
+        if status == GL_TIMEOUT_EXPIRED:
+            self.stalls += 1
+            while glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 1_000_000) == GL_TIMEOUT_EXPIRED:
+                pass
+        glDeleteSync(fence)
+        self.fences[segment] = None
+
+    def draw(self):
+        """Upload pending changes and draw the current segment."""
+        if self.vertex_count == 0:
+            return
+        self.flush()
+
+        base = self.segment * self.capacity
+        gl_state.bind_vertex_array(self.vao)
+        if self.index is not None:
+            glDrawElementsBaseVertex(self.mode, self.count, index_type(self.index), None, base)
+        else:
+            glDrawArrays(self.mode, base, self.count)
+
+        # Marca quando a GPU terminar de ler este segmento
+        if self.strategy == "ring":
+            if self.fences[self.segment] is not None:
+                glDeleteSync(self.fences[self.segment])
+            self.fences[self.segment] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+    def delete(self):
+        """Release the GL resources."""
+        if self.vao is None:
+            return
+        for fence in self.fences:
+            if fence is not None:
+                glDeleteSync(fence)
+        self.fences = [None] * self.segments
+        buffers = [self.buffer] + ([self.index_buffer] if self.index is not None else [])
+        glDeleteBuffers(len(buffers), buffers)
+        gl_state.delete_vertex_array(self.vao)
+        self.vao = None
+
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Offscreen framebuffer objects (FBO).
+
+A Framebuffer has a color texture and a depth renderbuffer of any size, so
+the renderer can draw without a window (headless) or into intermediate
+images, and the color texture can be sampled by later passes.
+"""
+
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.graphics.state import gl_state
+
+
+class Framebuffer:
+    """Framebuffer object with a color texture and a depth renderbuffer."""
+
+    def __init__(self, width, height, internal_format=GL_RGBA8, depth=True, filter=GL_LINEAR):
+        """
+        Create the framebuffer; needs a current OpenGL context.
+
+        Args:
+            width: Width in pixels
+            height: Height in pixels
+            internal_format: Format of the color texture (e.g. GL_RGBA8, GL_RGBA32F)
+            depth: Attach a depth renderbuffer
+            filter: Minification/magnification filter of the color texture
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("framebuffer size must be positive")
+
+        self.width = int(width)
+        self.height = int(height)
+        self.internal_format = internal_format
+
+        self.fbo = glGenFramebuffers(1)
+        gl_state.bind_framebuffer(GL_FRAMEBUFFER, self.fbo)
+
+        self.texture = glGenTextures(1)
+        gl_state.bind_texture(self.texture)
+        pixel_type = GL_FLOAT if internal_format in (GL_RGBA16F, GL_RGBA32F) else GL_UNSIGNED_BYTE
+        glTexImage2D(GL_TEXTURE_2D, 0, internal_format, self.width, self.height, 0, GL_RGBA, pixel_type, None)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, filter)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, filter)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        gl_state.bind_texture(0)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.texture, 0)
+
+        self.depth = None
+        if depth:
+            self.depth = glGenRenderbuffers(1)
+            glBindRenderbuffer(GL_RENDERBUFFER, self.depth)
+            glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH24_STENCIL8, self.width, self.height)
+            glBindRenderbuffer(GL_RENDERBUFFER, 0)
+            glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_STENCIL_ATTACHMENT, GL_RENDERBUFFER, self.depth)
+
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        gl_state.bind_framebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            self.delete()
+            raise RuntimeError(f"Framebuffer incompleto (status 0x{int(status):x})")
+
+    @property
+    def size(self):
+        """(width, height) in pixels."""
+        return self.width, self.height
+
+    def bind(self):
+        """Make this framebuffer the drawing target and set the viewport to cover it."""
+        gl_state.bind_framebuffer(GL_FRAMEBUFFER, self.fbo)
+        gl_state.viewport(0, 0, self.width, self.height)
+
+    def unbind(self):
+        """Go back to the default framebuffer."""
+        gl_state.bind_framebuffer(GL_FRAMEBUFFER, 0)
+
+    def read(self, flip=True):
+        """
+        Read the color attachment synchronously with glReadPixels.
+
+        Args:
+            flip: Return the rows top to bottom (image order) instead of OpenGL order
+
+        Returns:
+            (height, width, 4) uint8 array
+        """
+        gl_state.bind_framebuffer(GL_READ_FRAMEBUFFER, self.fbo)
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE)
+        image = np.frombuffer(data, np.uint8).reshape(self.height, self.width, 4)
+        return image[::-1] if flip else image
+
+    def delete(self):
+        """Release the GL objects."""
+        if self.fbo is None:
+            return
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteTextures(1, [self.texture])
+        if self.depth is not None:
+            glDeleteRenderbuffers(1, [self.depth])
+        self.fbo = self.texture = self.depth = None
+        # Objetos apagados deixam de estar ligados; os nomes podem ser reutilizados
+        gl_state.invalidate()
@@ -10,6 +10,8 @@ from OpenGL.GL import *
 from OpenGL.arrays import vbo
 import ctypes
 
+from renderizador.graphics.state import gl_state
+
 def create_geometry_data(mode, vertices, normals=None, colors=None, uvs=None, create_normals=False, index=None):
     """
     Create geometry data from input parameters.
@@ -26,9 +28,75 @@ def create_geometry_data(mode, vertices, normals=None, colors=None, uvs=None, cr
     Returns:
         Tuple of (data, mode, count)
     """
-    data = []
-    count = 0
+    attributes, count = deindexed_attributes(mode, vertices, normals, colors, uvs, create_normals, index)
+    if attributes is None:
+        return np.empty(0, np.float32), mode, 0
+    return interleave_attributes(*attributes).reshape(-1), mode, count
+
+def deindexed_attributes(mode, vertices, normals=None, colors=None, uvs=None, create_normals=False, index=None):
+    """
+    Build per-vertex attribute arrays in drawing order, expanding any index.
+
+    Args:
+        Same as create_geometry_data
+
+    Returns:
+        Tuple of ((vertices, normals, colors, uvs), count); the attributes are
+        (N,k) float32 arrays or None when missing. The attribute tuple is None
+        for modes other than GL_TRIANGLE_STRIP and GL_TRIANGLES.
+    """
+    vertices_2d, normals_2d, colors_2d, uvs_2d = vertex_attributes(vertices, normals, colors, uvs)
+    vertex_count = vertices_2d.shape[0]
+
+    if mode == GL_TRIANGLE_STRIP:
+        # identificando normais
+        if normals_2d is None and create_normals and vertex_count >= 3:
+            normals_2d = strip_normals(vertices_2d)
+
+        # number of vertices, not number of floats
+        return (vertices_2d, normals_2d, colors_2d, uvs_2d), vertex_count
+
+    if mode == GL_TRIANGLES:
+        # Sem índices os vértices já estão em sequência de triângulos
+        if index is None:
+            index = np.arange(vertex_count)
+        index = check_index(index, vertex_count)
+
+        # Expande os atributos de uma vez pelos índices (um registro por canto)
+        corners = np.take(vertices_2d, index, axis=0)
+
+        # identificando normais
+        if normals_2d is not None:
+            corner_normals = np.take(normals_2d, index, axis=0)
+        elif create_normals:
+            if index.size % 3 != 0:
+                raise ValueError("index size must be a multiple of 3 to create normals")
+            corner_normals = np.repeat(face_normals(corners.reshape(-1, 3, 3)), 3, axis=0)
+        else:
+            corner_normals = None
+
+        corner_colors = None if colors_2d is None else np.take(colors_2d, index, axis=0)
+        corner_uvs = None if uvs_2d is None else np.take(uvs_2d, index, axis=0)
+
+        # number of vertices emitted equals number of indices processed
+        return (corners, corner_normals, corner_colors, corner_uvs), index.size
 
+    return None, 0
+
+def vertex_attributes(vertices, normals=None, colors=None, uvs=None):
+    """
+    Validate vertex attributes and reshape them to one row per vertex.
+
+    Args:
+        vertices: Flat or (N,3) array of vertex coordinates
+        normals: Flat or (N,3) array of normal vectors (optional)
+        colors: Flat or (N,3) array of color values (optional)
+        uvs: Flat or (N,2) array of texture coordinates (optional)
+
+    Returns:
+        Tuple of float32 arrays (vertices, normals, colors, uvs) shaped (N,3),
+        (N,3), (N,3) and (N,2); missing attributes are returned as None
+    """
     # Normalize inputs to flattened 1D float32 arrays (Mesh inputs may be 2D)
     vertices = np.asarray(vertices, dtype=np.float32)
     if vertices.ndim == 2:
@@ -87,80 +155,138 @@ def create_geometry_data(mode, vertices, normals=None, colors=None, uvs=None, cr
             uvs_flat = uvs
         else:
             raise ValueError("uvs must be either 1D or 2D (N,2)")
-    
-    # Valores padrões (normal, cor)
-    normal = np.array([0.0, 0.0, 1.0], np.float32)
-    color = np.array([1.0, 1.0, 1.0], np.float32)
-    uv = np.array([0.0, 0.0], np.float32)
 
-    if mode == GL_TRIANGLE_STRIP:
-        for f in range(0, vertices_flat.size, 3):
-            
-            # identificando vértice
-            vertex = vertices_flat[f:f+3]
-
-            # identificando normal
-            if normals_flat is not None:
-                normal = normals_flat[f:f+3]
-            elif create_normals and f < vertices_flat.size - (2*3):
-                vertex1 = vertices_flat[f+3:f+6]
-                vertex2 = vertices_flat[f+6:f+9]
-                if f%6==0:
-                    normal = normalize(np.cross(vertex1 - vertex, vertex2 - vertex))
-                else:
-                    normal = normalize(np.cross(vertex2 - vertex, vertex1 - vertex))
-            
-            # identificando cor
-            if colors_flat is not None:
-                color = colors_flat[f:f+3]
-
-            # identificando coordenadas de textura
-            if uvs_flat is not None:
-                uv = uvs_flat[(f//3)*2:((f//3)*2)+2]
-            else:
-                # Deixa os UVs proporcionais a posição na tela
-                uv = np.array([(vertex[0]+1)/2, (vertex[1]+1)/2], dtype=np.float32)
-
-            data.append(np.concatenate([vertex, normal, color, uv]))
+    vertices_2d = vertices_flat.reshape(-1, 3)
+    normals_2d = None if normals_flat is None else normals_flat.reshape(-1, 3)
+    colors_2d = None if colors_flat is None else colors_flat.reshape(-1, 3)
+    uvs_2d = None if uvs_flat is None else uvs_flat.reshape(-1, 2)
+    return vertices_2d, normals_2d, colors_2d, uvs_2d
 
-        # number of vertices, not number of floats
-        count = vertex_count
+def check_index(index, vertex_count):
+    """
+    Validate an index array against the number of vertices.
 
-    if mode == GL_TRIANGLES:
-        if index is not None:
-            for f in range(len(index)):
-                # identificando vértice
-                vertex = vertices_flat[index[f]*3:(index[f]*3)+3]
-
-                if len(vertex) != 3:
-                    raise Exception("Vetor não possui 3 dimensões")
-
-                # identificando normal
-                if normals_flat is not None:
-                    normal = normals_flat[index[f+1]*3:(index[f+1]*3)+3]
-                elif create_normals:
-                    if f%3==0:
-                        vertex1 = vertices_flat[(index[f+1]*3):(index[f+1]*3)+3]
-                        vertex2 = vertices_flat[(index[f+2]*3):(index[f+2]*3)+3]
-                        normal = normalize(np.cross(vertex1 - vertex, vertex2 - vertex))
-                
-                # identificando cor
-                if colors_flat is not None:
-                    color = colors_flat[index[f]*3:(index[f]*3)+3]
-
-                # identificando coordenadas de textura
-                if uvs_flat is not None:
-                    uv = uvs_flat[(index[f]//3)*2:((index[f]//3)*2)+2]
-                else:
-                    # Deixa os UVs proporcionais a posição na tela
-                    uv = np.array([(vertex[0]+1)/2, (vertex[1]+1)/2], dtype=np.float32)
-
-                data.append(np.concatenate([vertex, normal, color, uv]))
+    Args:
+        index: Array-like of vertex indices
+        vertex_count: Number of vertices the indices refer to
 
-        # number of vertices emitted equals number of indices processed
-        count = len(index) if index is not None else 0
+    Returns:
+        Flat integer NumPy array
+    """
+    index = np.asarray(index).reshape(-1)
+    if index.size and not np.issubdtype(index.dtype, np.integer):
+        raise ValueError("index must contain integers")
+    if index.size and (index.min() < 0 or index.max() >= vertex_count):
+        raise ValueError("index refers to vertices out of range")
+    return index
+
+def create_indexed_geometry_data(mode, vertices, normals=None, colors=None, uvs=None, create_normals=False, index=None):
+    """
+    Create geometry data keeping the index buffer for indexed drawing.
 
-    return np.array(data, np.float32).flatten(), mode, count
+    The vertex buffer holds one record per input vertex and the index buffer
+    is kept for glDrawElements. Vertices are only duplicated (de-indexed) when
+    attributes really differ per corner, i.e. flat normals created with
+    `create_normals` on GL_TRIANGLES.
+
+    Args:
+        mode: OpenGL drawing mode (GL_TRIANGLE_STRIP, GL_TRIANGLES, etc.)
+        vertices: Array of vertex coordinates
+        normals: Array of normal vectors, "smooth" for area-weighted vertex
+            normals or "flat" for per-face normals (same as create_normals)
+        colors: Array of color values
+        uvs: Array of texture coordinates
+        create_normals: Whether to automatically create normals
+        index: Optional index array for indexed geometry
+
+    Returns:
+        Tuple of (data, index, mode, count); index is None when the geometry
+        must be drawn with glDrawArrays
+    """
+    attributes, index, count = geometry_attributes(mode, vertices, normals, colors, uvs, create_normals, index)
+    if attributes is None:
+        return np.empty(0, np.float32), None, mode, 0
+    return interleave_attributes(*attributes).reshape(-1), index, mode, count
+
+def geometry_attributes(mode, vertices, normals=None, colors=None, uvs=None, create_normals=False, index=None):
+    """
+    Build the per-vertex attribute arrays and index buffer for indexed drawing.
+
+    This is the layout-independent part of create_indexed_geometry_data: the
+    arrays can then be interleaved as floats or packed into a compact format.
+
+    Args:
+        Same as create_indexed_geometry_data
+
+    Returns:
+        Tuple of ((vertices, normals, colors, uvs), index, count); missing
+        attributes are None and index is None for glDrawArrays geometry
+    """
+    if isinstance(normals, str):
+        if normals == "smooth":
+            vertices_2d = vertex_attributes(vertices)[0]
+            normals = smooth_normals(vertices_2d, triangle_index(mode, index, vertices_2d.shape[0]))
+        elif normals == "flat":
+            normals, create_normals = None, True
+        else:
+            raise ValueError('normals must be an array, "smooth" or "flat"')
+
+    # Normais planas diferem por canto, então os vértices precisam ser duplicados
+    if index is None or (create_normals and normals is None):
+        attributes, count = deindexed_attributes(mode, vertices, normals, colors, uvs, create_normals, index)
+        return attributes, None, count
+
+    attributes = vertex_attributes(vertices, normals, colors, uvs)
+    index = index_array(index, attributes[0].shape[0])
+    return attributes, index, index.size
+
+def index_array(index, vertex_count):
+    """
+    Convert an index array to the smallest unsigned type able to address the vertices.
+
+    Args:
+        index: Array-like of vertex indices
+        vertex_count: Number of vertices in the vertex buffer
+
+    Returns:
+        Contiguous uint16 array when every vertex fits in 16 bits, uint32 otherwise
+    """
+    index = check_index(index, vertex_count)
+    dtype = np.uint16 if vertex_count <= 0x10000 else np.uint32
+    return np.ascontiguousarray(index, dtype=dtype)
+
+def index_type(index):
+    """Return the OpenGL type enum (GL_UNSIGNED_SHORT/GL_UNSIGNED_INT) of an index array."""
+    return GL_UNSIGNED_SHORT if index.dtype == np.uint16 else GL_UNSIGNED_INT
+
+def interleave_attributes(vertices, normals=None, colors=None, uvs=None, out=None):
+    """
+    Pack per-vertex attributes into the renderer's 11-float layout.
+
+    Missing attributes receive the default values: normal (0,0,1), white color
+    and UVs proportional to the vertex position on screen.
+
+    Args:
+        vertices: (N,3) float32 array
+        normals: (N,3) float32 array or None
+        colors: (N,3) float32 array or None
+        uvs: (N,2) float32 array or None
+        out: Optional (N,11) float32 array to write into (e.g. a slice of a larger buffer)
+
+    Returns:
+        (N,11) float32 array (position, normal, color, uv)
+    """
+    data = np.empty((vertices.shape[0], 11), np.float32) if out is None else out
+    data[:, 0:3] = vertices
+    data[:, 3:6] = (0.0, 0.0, 1.0) if normals is None else normals
+    data[:, 6:9] = (1.0, 1.0, 1.0) if colors is None else colors
+    if uvs is None:
+        # Deixa os UVs proporcionais a posição na tela
+        np.add(vertices[:, 0:2], 1, out=data[:, 9:11])
+        data[:, 9:11] /= 2
+    else:
+        data[:, 9:11] = uvs
+    return data
 
 def normalize(v):
     """Normalize a vector."""
@@ -169,14 +295,143 @@ def normalize(v):
         return v
     return v / norm
 
-def parse_geometry(data, mode, count):
+def normalize_rows(v):
+    """
+    Normalize each row of an (N,3) array.
+
+    Rows with zero length are returned unchanged, like in `normalize`. The
+    squared length goes through `np.matmul` so that the result matches,
+    bit for bit, calling `normalize` row by row (both end up in the same
+    BLAS dot kernel).
+
+    Args:
+        v: (N,3) float32 array
+
+    Returns:
+        (N,3) float32 array with unit-length rows
+    """
+    norm = np.sqrt(np.matmul(v[:, None, :], v[:, :, None])[:, 0, 0])
+    return np.divide(v, norm[:, None], out=v.copy(), where=norm[:, None] != 0)
+
+def strip_normals(vertices):
+    """
+    Compute per-vertex normals for a GL_TRIANGLE_STRIP.
+
+    Each vertex receives the normal of the triangle it starts, alternating the
+    winding between even and odd triangles. The last two vertices repeat the
+    normal of the last triangle.
+
+    Args:
+        vertices: (N,3) float32 array with N >= 3
+
+    Returns:
+        (N,3) float32 array of normals
+    """
+    edge1 = vertices[1:-1] - vertices[:-2]
+    edge2 = vertices[2:] - vertices[:-2]
+
+    # Triângulos ímpares invertem a ordem para manter a orientação da faixa
+    odd = (np.arange(edge1.shape[0]) % 2 == 1)[:, None]
+    first = np.where(odd, edge2, edge1)
+    second = np.where(odd, edge1, edge2)
+
+    normals = np.empty_like(vertices)
+    normals[:-2] = normalize_rows(np.cross(first, second))
+    normals[-2:] = normals[-3]
+    return normals
+
+def triangle_index(mode, index, vertex_count):
+    """
+    Build the (T,3) vertex index of every triangle described by a primitive.
+
+    Args:
+        mode: GL_TRIANGLES or GL_TRIANGLE_STRIP
+        index: Optional index array (None means vertices in sequence)
+        vertex_count: Number of vertices
+
+    Returns:
+        (T,3) integer array, with odd strip triangles flipped to keep the winding
+    """
+    index = np.arange(vertex_count) if index is None else check_index(index, vertex_count)
+    if mode == GL_TRIANGLES:
+        if index.size % 3 != 0:
+            raise ValueError("index size must be a multiple of 3 for GL_TRIANGLES")
+        return index.reshape(-1, 3)
+    if mode == GL_TRIANGLE_STRIP:
+        if index.size < 3:
+            return np.empty((0, 3), index.dtype)
+        triangles = np.stack([index[:-2], index[1:-1], index[2:]], axis=1)
+        triangles[1::2, 1:] = triangles[1::2, 2:0:-1]
+        return triangles
+    raise ValueError("normals can only be computed for GL_TRIANGLES or GL_TRIANGLE_STRIP")
+
+def smooth_normals(vertices, triangles, weighting="area"):
+    """
+    Compute smooth per-vertex normals by accumulating the normals of adjacent faces.
+
+    Face contributions are scattered onto their three corners with
+    `np.bincount` (the same accumulation as `np.add.at`, but much faster),
+    so the vertex count of indexed meshes is preserved.
+
+    Args:
+        vertices: (N,3) float32 array
+        triangles: (T,3) integer array of vertex indices
+        weighting: "area" weights each face by its area, "angle" by the angle
+            of the face at the vertex
+
+    Returns:
+        (N,3) float32 array of unit normals (zero for unused vertices)
+    """
+    corners = np.take(vertices, triangles, axis=0)
+    edge1 = corners[:, 1] - corners[:, 0]
+    edge2 = corners[:, 2] - corners[:, 0]
+
+    # O produto vetorial tem módulo igual a duas vezes a área do triângulo
+    cross = np.cross(edge1, edge2)
+
+    if weighting == "area":
+        contributions = np.repeat(cross[:, None, :], 3, axis=1)
+    elif weighting == "angle":
+        # Ângulo interno em cada canto, entre as duas arestas que saem dele
+        edges_out = normalize_rows((np.roll(corners, -1, axis=1) - corners).reshape(-1, 3))
+        edges_in = normalize_rows((np.roll(corners, 1, axis=1) - corners).reshape(-1, 3))
+        cosines = np.clip(np.einsum('ij,ij->i', edges_out, edges_in), -1.0, 1.0)
+        angles = np.arccos(cosines).reshape(-1, 3, 1)
+        contributions = normalize_rows(cross)[:, None, :] * angles
+    else:
+        raise ValueError('weighting must be "area" or "angle"')
+
+    flat_index = triangles.reshape(-1)
+    contributions = contributions.reshape(-1, 3)
+    normals = np.empty_like(vertices)
+    for axis in range(3):
+        normals[:, axis] = np.bincount(flat_index, weights=contributions[:, axis], minlength=vertices.shape[0])
+    return normalize_rows(normals)
+
+def face_normals(triangles):
+    """
+    Compute one unit normal per triangle.
+
+    Args:
+        triangles: (T,3,3) float32 array with the corners of each triangle
+
+    Returns:
+        (T,3) float32 array of normals (counter-clockwise winding)
+    """
+    edge1 = triangles[:, 1] - triangles[:, 0]
+    edge2 = triangles[:, 2] - triangles[:, 0]
+    return normalize_rows(np.cross(edge1, edge2))
+
+def parse_geometry(data, mode, count, index=None, layout=None):
     """
     Parse geometry data into OpenGL buffers.
     
     Args:
         data: Flattened array of vertex data
         mode: OpenGL drawing mode
-        count: Number of vertices
+        count: Number of vertices (or indices, for indexed geometry)
+        index: Optional uint16/uint32 index array uploaded as the element buffer
+        layout: Optional VertexLayout of packed data (default: 11 floats per vertex)
     
     Returns:
         Tuple of (VAO, count)
@@ -187,7 +442,7 @@ def parse_geometry(data, mode, count):
 
     # Cria e ativa o VAO (Vertex Array Object) para gerenciar os VBOs
     triangleVAO = glGenVertexArrays(1)
-    glBindVertexArray(triangleVAO)
+    gl_state.bind_vertex_array(triangleVAO)
 
     # Ativa o VBO para o contexto atual
     verticesVBO.bind()
@@ -195,6 +450,37 @@ def parse_geometry(data, mode, count):
     # buffer data into OpenGL
     verticesVBO.copy_data()
 
+    # Configura os atributos (posição, normal, cor e uv) do VBO ativo
+    set_vertex_layout(layout)
+
+    # Desativa (unbind) o VBO
+    verticesVBO.unbind()
+
+    # Cria o EBO (Element Buffer Object) com os índices, que fica associado ao VAO
+    if index is not None:
+        indexEBO = vbo.VBO(index, usage='GL_STATIC_DRAW', target='GL_ELEMENT_ARRAY_BUFFER')
+        indexEBO.bind()
+
+    # Desativa (unbind) o VAO
+    gl_state.bind_vertex_array(0)
+
+    return triangleVAO, count
+
+def set_vertex_layout(layout=None):
+    """
+    Configure the vertex attributes of the bound VAO.
+
+    Without a layout, the buffer bound to GL_ARRAY_BUFFER must hold interleaved
+    records of position (3), normal (3), color (3) and uv (2) floats.
+
+    Args:
+        layout: Optional VertexLayout describing a packed vertex record
+    """
+    # Formato compacto: os ponteiros vêm da descrição do layout
+    if layout is not None:
+        layout.apply()
+        return
+
     # Configuração para posição dos vértices
     # Coloca no ID 0, vértices 3D, com um stride de 3*4 (3 vertices de float = 4)
     glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, (3+3+3+2) * 4, ctypes.c_void_p(0))
@@ -214,11 +500,3 @@ def parse_geometry(data, mode, count):
     # Coloca no ID 3, vértices 2D (u,v), com um stride de 11*4 (11 floats total) e um ofset de (9*4)
     glVertexAttribPointer(3, 2, GL_FLOAT, GL_FALSE, (3+3+3+2) * 4, ctypes.c_void_p(9 * 4))
     glEnableVertexAttribArray(3)
-
-    # Desativa (unbind) o VBO
-    verticesVBO.unbind()
-
-    # Desativa (unbind) o VAO
-    glBindVertexArray(0)
-
-    return triangleVAO, count
\ No newline at end of file
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Instanced rendering module.
+
+Draws thousands of copies of one mesh with a single glDrawArraysInstanced or
+glDrawElementsInstanced call. Each copy reads its model matrix and color from
+per-instance attribute buffers (glVertexAttribDivisor), so no uniform has to be
+set per copy.
+
+Attribute locations used by the instances (after the mesh attributes 0-3):
+    layout (location = 4) in mat4 instance_model;   // ocupa as locations 4, 5, 6 e 7
+    layout (location = 8) in vec3 instance_color;
+"""
+
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.graphics.geometry import create_indexed_geometry_data, index_type, parse_geometry
+from renderizador.graphics.state import gl_state
+
+INSTANCE_MODEL_LOCATION = 4
+INSTANCE_COLOR_LOCATION = 8
+
+
+class InstancedMesh:
+    """A mesh drawn many times, each copy with its own transform and color."""
+
+    def __init__(self, mesh, transforms, colors=None):
+        """
+        Initialize the instances.
+
+        Args:
+            mesh: Mesh object shared by every instance
+            transforms: (N,4,4) array of model matrices (as built by translate/rotate/scale)
+            colors: Optional (N,3) array of instance colors (default: white)
+        """
+        mesh.validate()
+        self.mesh = mesh
+
+        transforms = np.asarray(transforms, np.float32)
+        if transforms.ndim != 3 or transforms.shape[1:] != (4, 4):
+            raise ValueError("transforms must have shape (N,4,4)")
+        self.instance_count = transforms.shape[0]
+
+        # O GLSL lê mat4 por colunas: guardamos as matrizes transpostas para o upload direto
+        self.transforms = np.ascontiguousarray(transforms.transpose(0, 2, 1))
+
+        if colors is None:
+            colors = np.ones((self.instance_count, 3), np.float32)
+        self.colors = np.ascontiguousarray(colors, dtype=np.float32)
+        if self.colors.shape != (self.instance_count, 3):
+            raise ValueError("colors must have shape (N,3)")
+
+        self.vao = None
+        self.index = None
+        self.mode = mesh.mode
+        self.count = 0
+        self.transform_buffer = None
+        self.color_buffer = None
+
+        # Intervalos [início, fim) alterados desde o último envio, por buffer
+        self._dirty = {"transforms": [], "colors": []}
+
+    def update(self, instances, transforms=None, colors=None):
+        """
+        Update a subset of instances.
+
+        Only the CPU copy is changed here; the modified ranges are sent with
+        glBufferSubData on the next draw, merged into contiguous runs.
+
+        Args:
+            instances: slice or array of instance indices
+            transforms: (K,4,4) array of new model matrices for those instances
+            colors: (K,3) array of new colors for those instances
+        """
+        runs = instance_runs(instances, self.instance_count)
+        if transforms is not None:
+            self.transforms[instances] = np.asarray(transforms, np.float32).transpose(0, 2, 1)
+            self._dirty["transforms"].extend(runs)
+        if colors is not None:
+            self.colors[instances] = np.asarray(colors, np.float32)
+            self._dirty["colors"].extend(runs)
+
+    def upload(self):
+        """Create the mesh VAO and attach the per-instance attribute buffers."""
+        mesh = self.mesh
+        data, self.index, self.mode, self.count = create_indexed_geometry_data(
+            mesh.mode, mesh.vertices, mesh.normals, mesh.colors, mesh.uvs, index=mesh.index
+        )
+        self.vao, _ = parse_geometry(data, self.mode, self.count, self.index)
+
+        gl_state.bind_vertex_array(self.vao)
+
+        # Matriz de modelo: um mat4 ocupa 4 locations consecutivas, uma por coluna
+        self.transform_buffer = create_instance_buffer(self.transforms)
+        for column in range(4):
+            location = INSTANCE_MODEL_LOCATION + column
+            glVertexAttribPointer(location, 4, GL_FLOAT, GL_FALSE, 16 * 4, ctypes.c_void_p(column * 4 * 4))
+            glEnableVertexAttribArray(location)
+            glVertexAttribDivisor(location, 1)
+
+        # Cor da instância
+        self.color_buffer = create_instance_buffer(self.colors)
+        glVertexAttribPointer(INSTANCE_COLOR_LOCATION, 3, GL_FLOAT, GL_FALSE, 3 * 4, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(INSTANCE_COLOR_LOCATION)
+        glVertexAttribDivisor(INSTANCE_COLOR_LOCATION, 1)
+
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        gl_state.bind_vertex_array(0)
+
+        self._dirty = {"transforms": [], "colors": []}
+        return self.vao
+
+    def flush(self):
+        """Send the instance ranges changed by update() to the GPU."""
+        for name, buffer in (("transforms", self.transform_buffer), ("colors", self.color_buffer)):
+            runs = self._dirty[name]
+            if not runs:
+                continue
+            array = getattr(self, name)
+            row_bytes = array[0].nbytes
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            for start, stop in merge_runs(runs):
+                glBufferSubData(GL_ARRAY_BUFFER, start * row_bytes, (stop - start) * row_bytes, array[start:stop])
+            self._dirty[name] = []
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        """Draw every instance with a single instanced draw call."""
+        if self._dirty["transforms"] or self._dirty["colors"]:
+            self.flush()
+
+        gl_state.bind_vertex_array(self.vao)
+        if self.index is not None:
+            glDrawElementsInstanced(self.mode, self.count, index_type(self.index), None, self.instance_count)
+        else:
+            glDrawArraysInstanced(self.mode, 0, self.count, self.instance_count)
+
+    def delete(self):
+        """Release the GL resources of the instances."""
+        if self.vao is not None:
+            glDeleteBuffers(2, [self.transform_buffer, self.color_buffer])
+            gl_state.delete_vertex_array(self.vao)
+            self.vao = None
+
+
+def create_instance_buffer(array):
+    """Create a GL_DYNAMIC_DRAW buffer with the array contents, leaving it bound."""
+    buffer = glGenBuffers(1)
+    glBindBuffer(GL_ARRAY_BUFFER, buffer)
+    glBufferData(GL_ARRAY_BUFFER, array.nbytes, array, GL_DYNAMIC_DRAW)
+    return buffer
+
+
+def instance_runs(instances, instance_count):
+    """
+    Convert a slice or an index array into contiguous [start, stop) runs.
+
+    Args:
+        instances: slice or array-like of instance indices
+        instance_count: total number of instances
+
+    Returns:
+        List of (start, stop) tuples
+    """
+    if isinstance(instances, slice):
+        start, stop, step = instances.indices(instance_count)
+        if step == 1:
+            return [(start, stop)] if stop > start else []
+        instances = np.arange(start, stop, step)
+
+    instances = np.unique(np.asarray(instances).reshape(-1) % instance_count)
+    if instances.size == 0:
+        return []
+
+    # Quebra a sequência ordenada onde os índices deixam de ser consecutivos
+    breaks = np.flatnonzero(np.diff(instances) != 1) + 1
+    starts = instances[np.concatenate(([0], breaks))]
+    stops = instances[np.concatenate((breaks - 1, [instances.size - 1]))] + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+def merge_runs(runs, max_gap=64):
+    """
+    Merge overlapping or nearby runs to reduce the number of glBufferSubData calls.
+
+    Args:
+        runs: List of (start, stop) tuples
+        max_gap: Runs separated by fewer instances than this are uploaded together
+
+    Returns:
+        Sorted list of merged (start, stop) tuples
+    """
+    merged = []
+    for start, stop in sorted(runs):
+        if merged and start <= merged[-1][1] + max_gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
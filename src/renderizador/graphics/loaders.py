@@ -0,0 +1,640 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Mesh file loaders: Wavefront OBJ, PLY (ASCII and binary) and STL (ASCII and binary).
+
+Binary formats are read with np.fromfile in a single call; text formats are
+read in chunks of lines and each chunk is converted to numbers with one NumPy
+call per attribute, never one Python call per value.
+
+Every load writes the final interleaved vertex buffer and index buffer to a
+cache directory as .npy files keyed by the hash of the file contents. The next
+load of the same file memory-maps the cache instead of parsing it again.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from OpenGL.GL import GL_POINTS, GL_TRIANGLES
+
+from renderizador.graphics.mesh import Mesh
+
+# Versão do formato do cache: mudar quando o conteúdo gerado mudar
+CACHE_VERSION = 1
+
+# Tamanho aproximado (em bytes) de cada bloco de linhas lido dos formatos texto
+CHUNK_BYTES = 1 << 24
+
+# Ordem dos atributos no buffer intercalado guardado no cache
+LAYOUT = ("position", "normal", "color", "uv")
+
+
+def default_cache_dir():
+    """Directory used for the mesh cache (~/.cache/renderizador/meshes)."""
+    return os.path.join(os.path.expanduser("~"), ".cache", "renderizador", "meshes")
+
+
+def load_mesh(path, cache=True, cache_dir=None):
+    """
+    Load a mesh file, using the binary cache when available.
+
+    Args:
+        path: Path to an .obj, .ply or .stl file
+        cache: Whether to read and write the .npy cache
+        cache_dir: Cache directory (default: ~/.cache/renderizador/meshes)
+
+    Returns:
+        Mesh; when loaded from the cache, its attributes are read-only views
+        into a memory-mapped interleaved buffer
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in LOADERS:
+        raise ValueError(f"unsupported mesh format: {extension}")
+
+    if not cache:
+        return LOADERS[extension](path)
+
+    cache_dir = cache_dir or default_cache_dir()
+    key = file_hash(path, cache_dir)
+    mesh = read_cache(cache_dir, key)
+    if mesh is None:
+        mesh = LOADERS[extension](path)
+        write_cache(cache_dir, key, mesh)
+    return mesh
+
+
+def file_hash(path, cache_dir):
+    """
+    Hash of the file contents, memoized by path, size and modification time.
+
+    Hashing a large scan takes a few seconds, so the digest is remembered in a
+    small file named after the file stat; an unchanged file is not read again.
+
+    Args:
+        path: Path to the mesh file
+        cache_dir: Cache directory
+
+    Returns:
+        Hex digest string
+    """
+    stat = os.stat(path)
+    stat_key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}:{CACHE_VERSION}"
+    stat_file = os.path.join(cache_dir, hashlib.blake2b(stat_key.encode(), digest_size=16).hexdigest() + ".stat")
+    if os.path.exists(stat_file):
+        with open(stat_file) as f:
+            return f.read().strip()
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(CACHE_VERSION).encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_BYTES), b""):
+            digest.update(block)
+    key = digest.hexdigest()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    write_atomic(stat_file, key.encode())
+    return key
+
+
+def read_cache(cache_dir, key):
+    """
+    Memory-map a cached mesh.
+
+    Args:
+        cache_dir: Cache directory
+        key: Content hash of the mesh file
+
+    Returns:
+        Mesh or None if the cache has no entry for the key
+    """
+    base = os.path.join(cache_dir, key)
+    if not os.path.exists(base + ".json"):
+        return None
+
+    with open(base + ".json") as f:
+        meta = json.load(f)
+    data = np.load(base + ".vertices.npy", mmap_mode="r")
+    index = np.load(base + ".index.npy", mmap_mode="r") if meta["indexed"] else None
+
+    # Cada atributo é uma visão das colunas do buffer intercalado (sem cópia)
+    attributes = {}
+    column = 0
+    for name in LAYOUT:
+        components = meta["attributes"].get(name)
+        if components:
+            attributes[name] = data[:, column:column + components]
+            column += components
+
+    return Mesh(
+        vertices=attributes["position"],
+        normals=attributes.get("normal"),
+        colors=attributes.get("color"),
+        uvs=attributes.get("uv"),
+        mode=meta["mode"],
+        index=index,
+    )
+
+
+def write_cache(cache_dir, key, mesh):
+    """
+    Write the interleaved vertex buffer and index buffer of a mesh to the cache.
+
+    Args:
+        cache_dir: Cache directory
+        key: Content hash of the mesh file
+        mesh: Mesh to store
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    base = os.path.join(cache_dir, key)
+
+    data, stride, offsets = mesh.interleaved(LAYOUT)
+    vertex_count = mesh.vertices.shape[0]
+    save_atomic(base + ".vertices.npy", data.reshape(vertex_count, stride // 4))
+    if mesh.index is not None:
+        save_atomic(base + ".index.npy", np.ascontiguousarray(mesh.index, np.uint32))
+
+    arrays = {"position": mesh.vertices, "normal": mesh.normals, "color": mesh.colors, "uv": mesh.uvs}
+    meta = {
+        "mode": int(mesh.mode),
+        "indexed": mesh.index is not None,
+        "attributes": {name: arrays[name].shape[1] for name in offsets},
+    }
+    # O .json é escrito por último: marca que a entrada está completa
+    write_atomic(base + ".json", json.dumps(meta).encode())
+
+
+def save_atomic(path, array):
+    """Save an array to an .npy file, replacing it only once fully written."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        np.save(f, array)
+    os.replace(temporary, path)
+
+
+def write_atomic(path, content):
+    """Write bytes to a file, replacing it only once fully written."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(content)
+    os.replace(temporary, path)
+
+
+def load_obj(path):
+    """
+    Load a Wavefront OBJ file.
+
+    Polygons are triangulated as fans. Corners sharing the same position,
+    texture and normal indices become a single vertex of the indexed mesh.
+    Per-vertex colors written after the position ("v x y z r g b") are read.
+
+    Args:
+        path: Path to the .obj file
+
+    Returns:
+        Mesh (GL_TRIANGLES with index, or GL_POINTS without faces)
+    """
+    positions, texcoords, normals = [], [], []
+    corners, sizes = [], []
+    counts = np.zeros(3, np.int64)
+
+    with open(path, "rb") as f:
+        while True:
+            lines = f.readlines(CHUNK_BYTES)
+            if not lines:
+                break
+
+            chunk_positions = parse_rows([l[2:] for l in lines if l.startswith(b"v ")])
+            chunk_texcoords = parse_rows([l[3:] for l in lines if l.startswith(b"vt ")])
+            chunk_normals = parse_rows([l[3:] for l in lines if l.startswith(b"vn ")])
+            for array, store in ((chunk_positions, positions), (chunk_texcoords, texcoords), (chunk_normals, normals)):
+                if array is not None:
+                    store.append(array)
+
+            # Índices negativos são relativos aos atributos lidos antes de cada face:
+            # contagem acumulada de cada tipo de linha até a posição da face no bloco
+            prefix = np.array([l[:3] for l in lines], "S3").view(np.uint8).reshape(-1, 3)
+            kinds = np.column_stack([
+                (prefix[:, 0] == ord("v")) & (prefix[:, 1] == ord(" ")),
+                (prefix[:, 0] == ord("v")) & (prefix[:, 1] == ord("t")) & (prefix[:, 2] == ord(" ")),
+                (prefix[:, 0] == ord("v")) & (prefix[:, 1] == ord("n")) & (prefix[:, 2] == ord(" ")),
+            ]).astype(np.int64)
+            before = counts + np.cumsum(kinds, axis=0) - kinds
+            is_face = (prefix[:, 0] == ord("f")) & (prefix[:, 1] == ord(" "))
+            counts = counts + kinds.sum(axis=0)
+
+            faces = [l[2:] for l in lines if l.startswith(b"f ")]
+            if faces:
+                chunk_corners, chunk_sizes = parse_obj_faces(faces, before[is_face])
+                corners.append(chunk_corners)
+                sizes.append(chunk_sizes)
+
+    if not positions:
+        raise ValueError(f"no vertices in {path}")
+    positions = np.concatenate(positions) if len(positions) > 1 else positions[0]
+    colors = positions[:, 3:6] if positions.shape[1] >= 6 else None
+    positions = positions[:, :3]
+
+    if not corners:
+        return Mesh(vertices=to_float32(positions), colors=to_float32(colors), mode=GL_POINTS)
+
+    width = max(c.shape[1] for c in corners)
+    corners = np.concatenate([pad_columns(c, width) for c in corners])
+    triangles = fan_triangulate(corners.shape[0], np.concatenate(sizes))
+    corners = corners[triangles.reshape(-1)]
+
+    if width == 1:
+        # Só posições: os vértices do arquivo são usados diretamente
+        return Mesh(
+            vertices=to_float32(positions), colors=to_float32(colors),
+            mode=GL_TRIANGLES, index=corners[:, 0].astype(np.uint32),
+        )
+
+    # Cada combinação distinta (posição, textura, normal) vira um vértice
+    unique, index = np.unique(corners, axis=0, return_inverse=True)
+    texcoords = np.concatenate(texcoords) if texcoords else None
+    normals = np.concatenate(normals) if normals else None
+
+    def gather(array, column):
+        if array is None or width <= column or np.any(unique[:, column] < 0):
+            return None
+        return to_float32(array[unique[:, column]])
+
+    return Mesh(
+        vertices=to_float32(positions[unique[:, 0]]),
+        normals=gather(normals, 2),
+        colors=None if colors is None else to_float32(colors[unique[:, 0]]),
+        uvs=None if gather(texcoords, 1) is None else gather(texcoords, 1)[:, :2].copy(),
+        mode=GL_TRIANGLES,
+        index=index.reshape(-1).astype(np.uint32),
+    )
+
+
+def parse_obj_faces(faces, counts):
+    """
+    Parse a chunk of OBJ face lines.
+
+    Args:
+        faces: List of byte strings (face lines without the "f " prefix)
+        counts: Number of positions, texture coordinates and normals read
+            before each face, as a (F,3) array (or one triple for every face)
+
+    Returns:
+        Tuple of ((K,C) int64 array of zero-based corner indices, with -1 for
+        missing texture or normal indices; (F,) array of corners per face)
+    """
+    sizes = np.fromiter((len(face.split()) for face in faces), np.int64, len(faces))
+
+    # Formato do primeiro canto: v, v/vt, v//vn ou v/vt/vn
+    first = faces[0].split()[0]
+    width = first.count(b"/") + 1
+    text = b" ".join(faces)
+    if b"//" in first:
+        text = text.replace(b"//", b"/0/")
+    values = np.fromstring(text.replace(b"/", b" "), dtype=np.int64, sep=" ")
+    if values.size != sizes.sum() * width:
+        raise ValueError("OBJ faces must use the same index format for every corner")
+
+    corners = values.reshape(-1, width)
+    counts = np.repeat(np.broadcast_to(np.asarray(counts, np.int64), (len(faces), 3)), sizes, axis=0)
+    for column in range(width):
+        indices = corners[:, column]
+        # Índices do OBJ começam em 1; negativos contam a partir do fim; 0 = ausente
+        corners[:, column] = np.where(indices > 0, indices - 1,
+                                      np.where(indices < 0, indices + counts[:, column], -1))
+    return corners, sizes
+
+
+def fan_triangulate(corner_count, sizes):
+    """
+    Triangulate polygons as fans (0, i, i+1).
+
+    Args:
+        corner_count: Total number of corners
+        sizes: (F,) array of corners per polygon
+
+    Returns:
+        (T,3) array of corner indices
+    """
+    sizes = np.asarray(sizes, np.int64)
+    starts = np.cumsum(sizes) - sizes
+    triangle_counts = np.maximum(sizes - 2, 0)
+    face = np.repeat(np.arange(sizes.size), triangle_counts)
+    local = np.arange(face.size) - np.repeat(np.cumsum(triangle_counts) - triangle_counts, triangle_counts)
+
+    first = starts[face]
+    return np.column_stack([first, first + local + 1, first + local + 2])
+
+
+def load_ply(path):
+    """
+    Load a PLY file (ascii, binary_little_endian or binary_big_endian).
+
+    Reads x/y/z, nx/ny/nz, red/green/blue (8-bit colors are scaled to [0,1])
+    and s/t, u/v or texture_u/texture_v vertex properties. Polygons are
+    triangulated as fans.
+
+    Args:
+        path: Path to the .ply file
+
+    Returns:
+        Mesh (GL_TRIANGLES with index, or GL_POINTS without faces)
+    """
+    with open(path, "rb") as f:
+        fmt, elements = parse_ply_header(f)
+
+        vertices, faces = None, None
+        for name, count, properties in elements:
+            if fmt == "ascii":
+                rows = read_text_rows(f, count)
+                if name == "vertex":
+                    vertices = ply_text_vertices(rows, properties)
+                elif name == "face":
+                    faces = ply_text_faces(rows, properties)
+            else:
+                endian = "<" if fmt == "binary_little_endian" else ">"
+                if name == "vertex":
+                    vertices = np.fromfile(f, ply_dtype(properties, endian), count)
+                elif name == "face":
+                    faces = read_ply_binary_faces(f, count, properties, endian)
+                else:
+                    # Elementos sem listas têm tamanho fixo e podem ser pulados
+                    if any(kind == "list" for _, kind, _ in properties):
+                        break
+                    f.seek(count * ply_dtype(properties, endian).itemsize, os.SEEK_CUR)
+            if vertices is not None and faces is not None:
+                break
+
+    if vertices is None:
+        raise ValueError(f"no vertex element in {path}")
+
+    fields = vertices.dtype.names
+    positions = to_float32(np.column_stack([vertices["x"], vertices["y"], vertices["z"]]))
+    normals = None
+    if {"nx", "ny", "nz"} <= set(fields):
+        normals = to_float32(np.column_stack([vertices["nx"], vertices["ny"], vertices["nz"]]))
+    colors = None
+    if {"red", "green", "blue"} <= set(fields):
+        colors = to_float32(np.column_stack([vertices["red"], vertices["green"], vertices["blue"]]))
+        if vertices.dtype["red"].kind in "ui":
+            colors /= np.float32(np.iinfo(vertices.dtype["red"]).max)
+    uvs = None
+    for u, v in (("s", "t"), ("u", "v"), ("texture_u", "texture_v")):
+        if {u, v} <= set(fields):
+            uvs = to_float32(np.column_stack([vertices[u], vertices[v]]))
+            break
+
+    if faces is None or faces.size == 0:
+        return Mesh(vertices=positions, normals=normals, colors=colors, uvs=uvs, mode=GL_POINTS)
+
+    return Mesh(
+        vertices=positions, normals=normals, colors=colors, uvs=uvs,
+        mode=GL_TRIANGLES, index=faces.reshape(-1).astype(np.uint32),
+    )
+
+
+# Tipos escalares do PLY e seus equivalentes NumPy
+PLY_TYPES = {
+    "char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2", "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4", "double": "f8", "float64": "f8",
+}
+
+
+def parse_ply_header(f):
+    """
+    Read the PLY header, leaving the file positioned at the start of the data.
+
+    Args:
+        f: File opened in binary mode
+
+    Returns:
+        Tuple of (format, elements): elements is a list of (name, count,
+        properties) and each property is (name, "scalar" or "list", types)
+    """
+    if f.readline().strip() != b"ply":
+        raise ValueError("not a PLY file")
+
+    fmt, elements = None, []
+    for line in iter(f.readline, b""):
+        words = line.decode("ascii").split()
+        if not words or words[0] in ("comment", "obj_info"):
+            continue
+        if words[0] == "format":
+            fmt = words[1]
+        elif words[0] == "element":
+            elements.append((words[1], int(words[2]), []))
+        elif words[0] == "property":
+            if words[1] == "list":
+                elements[-1][2].append((words[4], "list", (PLY_TYPES[words[2]], PLY_TYPES[words[3]])))
+            else:
+                elements[-1][2].append((words[2], "scalar", PLY_TYPES[words[1]]))
+        elif words[0] == "end_header":
+            break
+
+    if fmt not in ("ascii", "binary_little_endian", "binary_big_endian"):
+        raise ValueError(f"unsupported PLY format: {fmt}")
+    return fmt, elements
+
+
+def ply_dtype(properties, endian):
+    """Structured dtype of a PLY element made only of scalar properties."""
+    return np.dtype([(name, endian + types) for name, kind, types in properties if kind == "scalar"])
+
+
+def read_ply_binary_faces(f, count, properties, endian):
+    """
+    Read the binary face element of a PLY file.
+
+    When every face has the same number of corners (the usual case) the whole
+    element is read with a single np.fromfile of a structured dtype. Mixed
+    polygons fall back to walking the records.
+
+    Args:
+        f: File positioned at the start of the face element
+        count: Number of faces
+        properties: Properties of the face element
+        endian: "<" or ">"
+
+    Returns:
+        (T,3) array of vertex indices
+    """
+    if count == 0:
+        return np.zeros((0, 3), np.uint32)
+
+    lists = [name for name, kind, _ in properties if kind == "list"]
+    start = f.tell()
+
+    if len(lists) == 1:
+        # O tamanho da lista é lido do primeiro registro
+        list_position = [name for name, _, _ in properties].index(lists[0])
+        prefix = np.dtype([
+            (name, endian + (types if kind == "scalar" else types[0]))
+            for name, kind, types in properties[:list_position + 1]
+        ])
+        corners = int(np.fromfile(f, prefix, 1)[lists[0]][0])
+        f.seek(start)
+
+        dtype = np.dtype([
+            (name, endian + types) if kind == "scalar" else
+            (name, [("count", endian + types[0]), ("items", endian + types[1], (corners,))])
+            for name, kind, types in properties
+        ])
+        records = np.fromfile(f, dtype, count)
+        if records.shape[0] == count and np.all(records[lists[0]]["count"] == corners):
+            polygons = records[lists[0]]["items"].astype(np.int64).reshape(-1)
+            return polygons[fan_triangulate(polygons.size, np.full(count, corners))]
+
+    # Polígonos com números de cantos diferentes: lê registro a registro
+    f.seek(start)
+    polygons, sizes = [], []
+    for _ in range(count):
+        for name, kind, t in properties:
+            if kind == "scalar":
+                np.fromfile(f, endian + t, 1)
+                continue
+            size = int(np.fromfile(f, endian + t[0], 1)[0])
+            polygons.append(np.fromfile(f, endian + t[1], size))
+            sizes.append(size)
+    polygons = np.concatenate(polygons).astype(np.int64)
+    return polygons[fan_triangulate(polygons.size, np.array(sizes))]
+
+
+def read_text_rows(f, count):
+    """Read the next `count` non-empty lines of a text file."""
+    rows = []
+    while len(rows) < count:
+        line = f.readline()
+        if not line:
+            break
+        if line.strip():
+            rows.append(line)
+    return rows
+
+
+def ply_text_vertices(rows, properties):
+    """Convert ASCII PLY vertex lines into a structured array."""
+    names = [name for name, kind, _ in properties if kind == "scalar"]
+    values = parse_chunked(rows, len(names))
+    vertices = np.zeros(values.shape[0], [(name, types) for name, kind, types in properties if kind == "scalar"])
+    for column, name in enumerate(names):
+        vertices[name] = values[:, column]
+    return vertices
+
+
+def ply_text_faces(rows, properties):
+    """Convert ASCII PLY face lines (count followed by indices) into triangles."""
+    if len(properties) != 1 or properties[0][1] != "list":
+        raise ValueError("ASCII PLY faces must have a single list property")
+    sizes = np.fromiter((len(row.split()) - 1 for row in rows), np.int64, len(rows))
+    values = np.fromstring(b" ".join(rows), dtype=np.int64, sep=" ")
+
+    # Remove o contador no início de cada face
+    starts = np.cumsum(sizes + 1) - (sizes + 1)
+    keep = np.ones(values.size, bool)
+    keep[starts] = False
+    polygons = values[keep]
+    return polygons[fan_triangulate(polygons.size, sizes)]
+
+
+def load_stl(path):
+    """
+    Load an STL file (binary or ASCII).
+
+    STL stores independent triangles, so the mesh is not indexed; each corner
+    gets the normal of its facet (recomputed where the file stores zeros).
+
+    Args:
+        path: Path to the .stl file
+
+    Returns:
+        Mesh (GL_TRIANGLES without index)
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.read(84)
+        binary = len(header) == 84 and size == 84 + 50 * int(np.frombuffer(header[80:84], "<u4")[0])
+        if binary:
+            dtype = np.dtype([("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+            facets = np.fromfile(f, dtype)
+            triangles = facets["vertices"]
+            normals = facets["normal"]
+        else:
+            f.seek(0)
+            triangles, normals = [], []
+            while True:
+                lines = f.readlines(CHUNK_BYTES)
+                if not lines:
+                    break
+                stripped = [l.strip() for l in lines]
+                vertices = parse_rows([l[7:] for l in stripped if l.startswith(b"vertex")])
+                facet_normals = parse_rows([l[13:] for l in stripped if l.startswith(b"facet normal")])
+                if vertices is not None:
+                    triangles.append(vertices)
+                if facet_normals is not None:
+                    normals.append(facet_normals)
+            if not triangles:
+                raise ValueError(f"no facets in {path}")
+            triangles = np.concatenate(triangles).reshape(-1, 3, 3)
+            normals = np.concatenate(normals)
+
+    triangles = to_float32(triangles)
+    normals = to_float32(normals)
+
+    # Facetas com normal zerada recebem a normal calculada pelos vértices
+    missing = ~np.any(normals, axis=1)
+    if np.any(missing):
+        corners = triangles[missing]
+        computed = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        length = np.linalg.norm(computed, axis=1, keepdims=True)
+        normals[missing] = computed / np.where(length > 0, length, 1)
+
+    return Mesh(
+        vertices=np.ascontiguousarray(triangles.reshape(-1, 3)),
+        normals=np.repeat(normals, 3, axis=0),
+        mode=GL_TRIANGLES,
+    )
+
+
+def parse_rows(lines):
+    """
+    Parse lines of whitespace separated numbers with one NumPy call.
+
+    Args:
+        lines: List of byte strings, all with the same number of values
+
+    Returns:
+        (N,K) float64 array, or None for an empty list
+    """
+    if not lines:
+        return None
+    return parse_chunked(lines, len(lines[0].split()))
+
+
+def parse_chunked(lines, width):
+    """Convert text lines with `width` numbers each into an (N,width) float64 array."""
+    values = np.fromstring(b" ".join(lines), dtype=np.float64, sep=" ")
+    if values.size != len(lines) * width:
+        raise ValueError("lines must all have the same number of values")
+    return values.reshape(-1, width)
+
+
+def pad_columns(array, width):
+    """Append -1 columns (missing indices) up to `width` columns."""
+    if array.shape[1] == width:
+        return array
+    padding = np.full((array.shape[0], width - array.shape[1]), -1, array.dtype)
+    return np.concatenate([array, padding], axis=1)
+
+
+def to_float32(array):
+    """Contiguous float32 copy of an array (None stays None)."""
+    if array is None:
+        return None
+    return np.ascontiguousarray(array, dtype=np.float32)
+
+
+LOADERS = {".obj": load_obj, ".ply": load_ply, ".stl": load_stl}
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Level of detail module: quadric error metric simplification and LOD chains.
+
+The simplifier follows Garland and Heckbert ("Surface Simplification Using
+Quadric Error Metrics", 1997): each vertex accumulates the quadrics of the
+planes of its faces and an edge collapse costs the squared distance of the new
+vertex to those planes. Instead of collapsing one edge at a time from a
+priority queue, each pass evaluates every edge at once with NumPy and
+collapses a set of cheap edges that share no vertex (each one is the cheapest
+edge of both of its endpoints), so the work per pass is fully vectorized.
+
+An LODChain keeps a mesh at several triangle ratios and picks the level of an
+object from its projected size on screen.
+"""
+
+import numpy as np
+from OpenGL.GL import GL_TRIANGLES
+
+from renderizador.graphics.geometry import smooth_normals, triangle_index
+from renderizador.graphics.loaders import default_cache_dir, file_hash, load_mesh, read_cache, write_cache
+from renderizador.graphics.mesh import Mesh, fetch_order, remove_degenerate
+
+# Frações de triângulos de cada nível gerado por padrão
+DEFAULT_RATIOS = (1.0, 0.5, 0.25, 0.1)
+
+# Tamanho projetado (fração da altura da tela) abaixo do qual se usa o nível seguinte
+DEFAULT_SCREEN_SIZES = (0.5, 0.25, 0.1)
+
+# Peso dos planos que prendem as bordas abertas da malha
+BOUNDARY_WEIGHT = 1000.0
+
+
+class LODChain:
+    """A mesh at decreasing levels of detail."""
+
+    def __init__(self, levels, screen_sizes=None):
+        """
+        Initialize the chain.
+
+        Args:
+            levels: List of Mesh, from the most to the least detailed
+            screen_sizes: Projected sizes (fraction of the screen height, in
+                decreasing order) below which the next level is used; one
+                less than the number of levels
+        """
+        if not levels:
+            raise ValueError("an LOD chain needs at least one level")
+        if screen_sizes is None:
+            screen_sizes = DEFAULT_SCREEN_SIZES[:len(levels) - 1]
+        if len(screen_sizes) != len(levels) - 1:
+            raise ValueError("screen_sizes must have one entry less than levels")
+
+        self.levels = list(levels)
+        self.screen_sizes = np.asarray(screen_sizes, np.float32)
+
+    def __len__(self):
+        return len(self.levels)
+
+    @classmethod
+    def build(cls, mesh, ratios=DEFAULT_RATIOS, screen_sizes=None):
+        """
+        Build a chain by simplifying a mesh.
+
+        Each level is simplified from the previous one, so the cost of the
+        whole chain is close to the cost of the first simplification.
+
+        Args:
+            mesh: Source Mesh (GL_TRIANGLES or GL_TRIANGLE_STRIP)
+            ratios: Fractions of the original triangle count, in decreasing order
+            screen_sizes: See __init__
+
+        Returns:
+            LODChain
+        """
+        triangle_count = triangle_index(mesh.mode, mesh.index, mesh.vertices.shape[0]).shape[0]
+        levels = []
+        current = mesh
+        for ratio in ratios:
+            if ratio < 1.0:
+                current = simplify(current, int(triangle_count * ratio))
+            levels.append(current)
+        return cls(levels, screen_sizes)
+
+    def select(self, size):
+        """
+        Pick the level for projected sizes.
+
+        Args:
+            size: Projected size (fraction of the screen height), scalar or array
+
+        Returns:
+            Level index (same shape as size)
+        """
+        return np.sum(np.asarray(size)[..., None] < self.screen_sizes, axis=-1)
+
+
+def projected_size(centers, radii, view, projection):
+    """
+    Projected size of bounding spheres as a fraction of the screen height.
+
+    Args:
+        centers: (N,3) array of sphere centers in world space
+        radii: (N,) array of sphere radii
+        view: 4x4 view matrix
+        projection: 4x4 projection matrix
+
+    Returns:
+        (N,) array; spheres containing the eye get infinity
+    """
+    centers = np.asarray(centers, np.float32)
+    depth = -(centers @ view[2, :3] + view[2, 3])
+    # projection[1,1] = cotangente de metade do campo de visão vertical
+    with np.errstate(divide="ignore"):
+        return np.where(depth > radii, radii * projection[1, 1] / np.maximum(depth, 1e-6), np.inf)
+
+
+def simplify(mesh, target_triangles, max_passes=100):
+    """
+    Simplify a mesh with quadric error metrics down to a triangle budget.
+
+    Colors and uvs of collapsed vertices are averaged; normals, if present,
+    are recomputed as smooth normals of the simplified surface.
+
+    Args:
+        mesh: Mesh (GL_TRIANGLES or GL_TRIANGLE_STRIP)
+        target_triangles: Number of triangles to stop at
+        max_passes: Upper bound on collapse passes
+
+    Returns:
+        New indexed GL_TRIANGLES Mesh
+    """
+    mesh.validate()
+    vertices = mesh.vertices.astype(np.float64)
+    triangles = remove_degenerate(triangle_index(mesh.mode, mesh.index, vertices.shape[0]).astype(np.int64))
+    extra = [None if a is None else a.astype(np.float64) for a in (mesh.colors, mesh.uvs)]
+    quadrics = vertex_quadrics(vertices, triangles)
+    target_triangles = max(int(target_triangles), 1)
+
+    for _ in range(max_passes):
+        if triangles.shape[0] <= target_triangles:
+            break
+
+        edges = unique_edges(triangles)
+        combined = quadrics[edges[:, 0]] + quadrics[edges[:, 1]]
+        positions, costs = collapse_positions(combined, vertices[edges[:, 0]], vertices[edges[:, 1]])
+
+        selected = independent_edges(edges, costs, vertices.shape[0])
+        # Cada colapso remove cerca de dois triângulos: não passa muito do alvo
+        budget = max((triangles.shape[0] - target_triangles) // 2, 1)
+        selected = selected[:budget]
+        if selected.size == 0:
+            break
+
+        keep, drop = edges[selected, 0], edges[selected, 1]
+        vertices[keep] = positions[selected]
+        quadrics[keep] = combined[selected]
+        for attribute in extra:
+            if attribute is not None:
+                attribute[keep] = (attribute[keep] + attribute[drop]) / 2
+
+        remap = np.arange(vertices.shape[0])
+        remap[drop] = keep
+        triangles = remove_degenerate(remap[triangles])
+
+    order, triangles = fetch_order(triangles, vertices.shape[0])
+    vertices = vertices[order].astype(np.float32)
+    colors, uvs = [None if a is None else a[order].astype(np.float32) for a in extra]
+    normals = None if mesh.normals is None else smooth_normals(vertices, triangles)
+
+    return Mesh(
+        vertices=vertices, normals=normals, colors=colors, uvs=uvs,
+        mode=GL_TRIANGLES, index=triangles.reshape(-1).astype(np.uint32),
+    )
+
+
+def vertex_quadrics(vertices, triangles):
+    """
+    Accumulate the plane quadric of every face (weighted by area) on its vertices.
+
+    Open edges also get a heavily weighted plane perpendicular to their face,
+    which keeps the mesh border in place.
+
+    Args:
+        vertices: (N,3) float64 array
+        triangles: (T,3) integer array
+
+    Returns:
+        (N,4,4) array of quadrics
+    """
+    corners = vertices[triangles]
+    cross = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    double_area = np.linalg.norm(cross, axis=1)
+    normals = cross / np.where(double_area > 0, double_area, 1)[:, None]
+
+    # Plano (a, b, c, d) com a*x + b*y + c*z + d = 0, ponderado pela área
+    planes = np.column_stack([normals, -np.einsum("ij,ij->i", normals, corners[:, 0])])
+    face_quadrics = planes[:, :, None] * planes[:, None, :] * (double_area / 2)[:, None, None]
+
+    quadrics = scatter_quadrics(triangles, face_quadrics, vertices.shape[0])
+
+    # Bordas abertas: arestas que pertencem a um único triângulo
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]])
+    face = np.tile(np.arange(triangles.shape[0]), 3)
+    key = np.sort(edges, axis=1).astype(np.int64)
+    key = key[:, 0] * vertices.shape[0] + key[:, 1]
+    order = np.argsort(key)
+    ordered = key[order]
+    different = ordered[1:] != ordered[:-1]
+    boundary = np.empty(key.size, bool)
+    boundary[order] = np.concatenate(([True], different)) & np.concatenate((different, [True]))
+    if np.any(boundary):
+        edges, face = edges[boundary], face[boundary]
+        direction = vertices[edges[:, 1]] - vertices[edges[:, 0]]
+        length = np.linalg.norm(direction, axis=1)
+        side = np.cross(direction, normals[face])
+        side_length = np.linalg.norm(side, axis=1)
+        side /= np.where(side_length > 0, side_length, 1)[:, None]
+        planes = np.column_stack([side, -np.einsum("ij,ij->i", side, vertices[edges[:, 0]])])
+        edge_quadrics = planes[:, :, None] * planes[:, None, :] * (BOUNDARY_WEIGHT * length ** 2)[:, None, None]
+        quadrics += scatter_quadrics(edges, edge_quadrics, vertices.shape[0])
+
+    return quadrics
+
+
+def scatter_quadrics(targets, values, vertex_count):
+    """
+    Add the (K,4,4) quadric of each primitive to each of its (K,C) vertices with np.bincount.
+
+    Quadrics are symmetric, so only the upper triangle is accumulated.
+    """
+    result = np.empty((vertex_count, 4, 4))
+    for i, j in zip(*np.triu_indices(4)):
+        weights = np.ascontiguousarray(values[:, i, j])
+        result[:, i, j] = sum(np.bincount(column, weights, minlength=vertex_count) for column in targets.T)
+        result[:, j, i] = result[:, i, j]
+    return result
+
+
+def unique_edges(triangles):
+    """(E,2) array of the distinct edges of a triangle list, smaller index first."""
+    edges = np.sort(np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]]), axis=1)
+    edges = edges.astype(np.int64)
+    vertex_count = edges.max() + 1
+    keys = np.sort(edges[:, 0] * vertex_count + edges[:, 1])
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return np.column_stack([keys // vertex_count, keys % vertex_count])
+
+
+def collapse_positions(quadrics, first, second):
+    """
+    Best position and cost of collapsing each edge.
+
+    The optimal point solves the 3x3 linear system of the summed quadric;
+    when it is ill-conditioned, the best of the endpoints and the midpoint is used.
+
+    Args:
+        quadrics: (E,4,4) summed quadrics
+        first: (E,3) positions of the first endpoints
+        second: (E,3) positions of the second endpoints
+
+    Returns:
+        Tuple of ((E,3) positions, (E,) costs)
+    """
+    candidates = [first, second, (first + second) / 2]
+
+    system = quadrics[:, :3, :3]
+    solvable = np.abs(np.linalg.det(system)) > 1e-12
+    if np.any(solvable):
+        optimal = candidates[2].copy()
+        optimal[solvable] = np.linalg.solve(system[solvable], -quadrics[solvable, :3, 3][..., None])[..., 0]
+        candidates.append(optimal)
+
+    positions = np.stack(candidates, axis=1)
+    homogeneous = np.concatenate([positions, np.ones(positions.shape[:2] + (1,))], axis=2)
+    costs = np.sum(np.matmul(homogeneous, quadrics) * homogeneous, axis=2)
+    if len(candidates) == 4:
+        costs[~solvable, 3] = np.inf
+
+    best = np.argmin(costs, axis=1)
+    rows = np.arange(positions.shape[0])
+    return positions[rows, best], np.maximum(costs[rows, best], 0)
+
+
+def independent_edges(edges, costs, vertex_count):
+    """
+    Select edges that are the cheapest edge of both of their endpoints.
+
+    No two selected edges share a vertex, so they can all be collapsed at once.
+
+    Args:
+        edges: (E,2) integer array
+        costs: (E,) collapse costs
+        vertex_count: Number of vertices
+
+    Returns:
+        Indices of the selected edges, cheapest first
+    """
+    # Empates (ex.: regiões planas, todas com custo zero) são desfeitos com uma ordem
+    # pseudoaleatória fixa; em ordem de índice quase nenhuma aresta seria escolhida
+    tie_break = np.random.default_rng(0).random(costs.size)
+    order = np.lexsort((tie_break, costs))
+    rank = np.empty(order.size, np.int64)
+    rank[order] = np.arange(order.size)
+
+    # Posição, na ordem de custo, da aresta mais barata de cada vértice
+    cheapest = np.full(vertex_count, order.size, np.int64)
+    np.minimum.at(cheapest, edges[:, 0], rank)
+    np.minimum.at(cheapest, edges[:, 1], rank)
+
+    mutual = (cheapest[edges[:, 0]] == rank) & (cheapest[edges[:, 1]] == rank)
+    return order[mutual[order]]
+
+
+def load_lod_chain(path, ratios=DEFAULT_RATIOS, screen_sizes=None, cache=True, cache_dir=None):
+    """
+    Load a mesh file and its LOD chain, caching every level next to the mesh.
+
+    Levels are stored in the mesh cache of loaders.load_mesh under the same
+    content hash, so a second load memory-maps them without simplifying again.
+
+    Args:
+        path: Path to an .obj, .ply or .stl file
+        ratios: Fractions of the original triangle count, in decreasing order
+        screen_sizes: See LODChain
+        cache: Whether to read and write the cache
+        cache_dir: Cache directory (default: ~/.cache/renderizador/meshes)
+
+    Returns:
+        LODChain
+    """
+    mesh = load_mesh(path, cache, cache_dir)
+    if not cache:
+        return LODChain.build(mesh, ratios, screen_sizes)
+
+    cache_dir = cache_dir or default_cache_dir()
+    key = file_hash(path, cache_dir)
+    level_keys = [f"{key}.lod{int(round(ratio * 1000)):04d}" for ratio in ratios]
+
+    levels = [mesh if ratio >= 1.0 else read_cache(cache_dir, level_key) for ratio, level_key in zip(ratios, level_keys)]
+    if any(level is None for level in levels):
+        chain = LODChain.build(mesh, ratios, screen_sizes)
+        for ratio, level_key, level in zip(ratios, level_keys, chain.levels):
+            if ratio < 1.0:
+                write_cache(cache_dir, level_key, level)
+        return chain
+    return LODChain(levels, screen_sizes)
@@ -11,16 +11,68 @@ Benefits:
 - Clear separation of authoring arrays (vertices, normals, colors, uvs)
   from the interleaved GPU buffer.
 - Shape/dtype validation in one place.
+
+It also hosts the mesh optimization stage (Mesh.optimize): vertex welding,
+triangle reordering for the post-transform vertex cache (Tipsify) and vertex
+reordering for fetch locality, reported as ACMR (average cache miss ratio,
+vertex shader invocations per triangle) before and after.
 """
 
 from dataclasses import dataclass
 from typing import Optional, Tuple, Dict
 import numpy as np
+from OpenGL.GL import GL_TRIANGLES
+
+from .geometry import smooth_normals, triangle_index
+from .vertex_format import VertexLayout
 
 
 Attr = Optional[np.ndarray]
 
 
+def _shared_interleaved(attrs):
+    """Return (data_flat, stride, offsets) if the attributes are consecutive columns of one 2D float32 buffer."""
+    arrays = list(attrs.values())
+    base = arrays[0]
+    while isinstance(base.base, np.ndarray):
+        base = base.base
+    width = sum(arr.shape[1] for arr in arrays)
+    if base is arrays[0] or base.ndim != 2 or base.dtype != np.float32 or base.shape != (arrays[0].shape[0], width):
+        return None
+    if not base.flags.c_contiguous:
+        return None
+
+    stride = width * 4
+    offsets: Dict[str, int] = {}
+    offset = 0
+    for name, arr in attrs.items():
+        if arr.ctypes.data != base.ctypes.data + offset or arr.strides != (stride, 4):
+            return None
+        offsets[name] = offset
+        offset += arr.shape[1] * 4
+    return base.reshape(-1), stride, offsets
+
+
+@dataclass
+class OptimizationReport:
+    """Result of Mesh.optimize."""
+
+    vertices_before: int
+    vertices_after: int
+    triangles_before: int
+    triangles_after: int
+    acmr_before: float
+    acmr_after: float
+    cache_size: int
+
+    def __str__(self) -> str:
+        return (
+            f"vértices: {self.vertices_before} -> {self.vertices_after}, "
+            f"triângulos: {self.triangles_before} -> {self.triangles_after}, "
+            f"ACMR (cache {self.cache_size}): {self.acmr_before:.3f} -> {self.acmr_after:.3f}"
+        )
+
+
 @dataclass
 class Mesh:
     """Container for mesh attributes.
@@ -32,6 +84,7 @@ class Mesh:
       - uvs:      (N,2) float32 (optional)
 
     mode: OpenGL primitive mode (e.g., GL_TRIANGLE_STRIP, GL_TRIANGLES, ...)
+    index: optional 1D integer array of vertex indices for indexed drawing
     """
 
     vertices: np.ndarray
@@ -39,6 +92,7 @@ class Mesh:
     colors: Attr = None
     uvs: Attr = None
     mode: int = 0
+    index: Attr = None
 
     def validate(self) -> None:
         """Validate shapes and dtypes for safety before packing."""
@@ -59,6 +113,25 @@ class Mesh:
             assert self.uvs.dtype == np.float32 and self.uvs.shape == (N, 2), (
                 "uvs must be float32 with shape (N,2)"
             )
+        if self.index is not None:
+            assert np.issubdtype(self.index.dtype, np.integer) and self.index.ndim == 1, (
+                "index must be a 1D integer array"
+            )
+
+    def compute_smooth_normals(self, weighting: str = "area") -> "Mesh":
+        """Replace normals with smooth vertex normals accumulated from the faces.
+
+        The vertex count is preserved, so an indexed mesh stays compact.
+
+        Args:
+            weighting: "area" (default) or "angle" weighting of face normals.
+
+        Returns:
+            self, to allow chaining.
+        """
+        triangles = triangle_index(self.mode, self.index, self.vertices.shape[0])
+        self.normals = smooth_normals(self.vertices, triangles, weighting)
+        return self
 
     def interleaved(self, layout: Tuple[str, ...] = ("position", "normal", "color", "uv")) -> Tuple[np.ndarray, int, Dict[str, int]]:
         """Pack attributes into a single interleaved float32 buffer.
@@ -81,6 +154,12 @@ class Mesh:
             "uv": self.uvs,
         }
 
+        # Atributos que já são colunas de um mesmo buffer intercalado (ex.: cache
+        # em memória mapeada) são devolvidos sem cópia
+        shared = _shared_interleaved({name: attrs[name] for name in layout if attrs.get(name) is not None})
+        if shared is not None:
+            return shared
+
         cols = []
         offsets: Dict[str, int] = {}
         offset_floats = 0
@@ -99,3 +178,221 @@ class Mesh:
         stride = stride_floats * 4  # bytes
 
         return data_flat, stride, offsets
+
+    def vertex_layout(self, layout: Tuple[str, ...] = ("position", "normal", "color", "uv")) -> Tuple[np.ndarray, VertexLayout]:
+        """Pack the attributes and describe the resulting record for the VAO setup.
+
+        Only the attributes present in the mesh are stored, so a position-only
+        mesh takes 12 bytes per vertex.
+
+        Args:
+            layout: order of attributes in the interleaved buffer.
+
+        Returns:
+            data_flat:     1D float32 numpy array, as returned by interleaved()
+            vertex_layout: VertexLayout with the stride and offsets of the present attributes
+        """
+        data_flat, stride, offsets = self.interleaved(layout)
+        arrays = {"position": self.vertices, "normal": self.normals, "color": self.colors, "uv": self.uvs}
+        components = {name: arrays[name].shape[1] for name in offsets}
+        return data_flat, VertexLayout.from_offsets(stride, offsets, components)
+
+    def optimize(self, tolerance: float = 1e-6, cache_size: int = 16) -> OptimizationReport:
+        """Weld duplicate vertices and reorder triangles and vertices for the GPU caches.
+
+        The mesh becomes an indexed GL_TRIANGLES mesh (strips are expanded and
+        degenerate triangles removed) and unused vertices are dropped.
+
+        Args:
+            tolerance: attributes closer than this (per component) are welded.
+            cache_size: FIFO size of the post-transform cache being optimized for.
+
+        Returns:
+            OptimizationReport with vertex counts and ACMR before and after.
+        """
+        self.validate()
+        vertex_count = self.vertices.shape[0]
+        triangles = triangle_index(self.mode, self.index, vertex_count)
+        triangles_before = triangles.shape[0]
+        acmr_before = acmr(triangles, cache_size)
+
+        attrs = [a for a in (self.vertices, self.normals, self.colors, self.uvs) if a is not None]
+        remap, representatives = weld_vertices(attrs, tolerance)
+        triangles = remove_degenerate(remap[triangles])
+
+        triangles = tipsify(triangles, representatives.size, cache_size)
+        order, triangles = fetch_order(triangles, representatives.size)
+        kept = representatives[order]
+
+        self.vertices = np.ascontiguousarray(self.vertices[kept])
+        self.normals = None if self.normals is None else np.ascontiguousarray(self.normals[kept])
+        self.colors = None if self.colors is None else np.ascontiguousarray(self.colors[kept])
+        self.uvs = None if self.uvs is None else np.ascontiguousarray(self.uvs[kept])
+        self.index = triangles.reshape(-1).astype(np.uint32)
+        self.mode = GL_TRIANGLES
+
+        return OptimizationReport(
+            vertices_before=vertex_count,
+            vertices_after=self.vertices.shape[0],
+            triangles_before=triangles_before,
+            triangles_after=triangles.shape[0],
+            acmr_before=acmr_before,
+            acmr_after=acmr(triangles, cache_size),
+            cache_size=cache_size,
+        )
+
+
+def weld_vertices(attrs, tolerance: float = 1e-6) -> Tuple[np.ndarray, np.ndarray]:
+    """Find vertices whose attributes are equal after quantization.
+
+    Rows are quantized to integer multiples of `tolerance` and combined into a
+    64-bit FNV-style hash; vertices are grouped by hash with a 1D np.unique.
+    Hash collisions are detected and then resolved by grouping the quantized
+    rows themselves.
+
+    Args:
+        attrs: list of (N,K) arrays (positions, normals, ...)
+        tolerance: quantization step
+
+    Returns:
+        remap:           (N,) array mapping each vertex to its welded vertex
+        representatives: (M,) array with the original vertex kept for each welded vertex
+    """
+    quantized = np.concatenate(
+        [np.round(np.asarray(a, np.float64) / tolerance).astype(np.int64) for a in attrs], axis=1
+    )
+
+    keys = np.full(quantized.shape[0], 0xCBF29CE484222325, np.uint64)
+    for column in quantized.T:
+        keys = (keys ^ column.view(np.uint64)) * np.uint64(0x100000001B3)
+
+    _, representatives, remap = np.unique(keys, return_index=True, return_inverse=True)
+    if not np.array_equal(quantized[representatives[remap]], quantized):
+        # Colisão de hash: agrupa pelas linhas quantizadas (mais lento, mas exato)
+        _, representatives, remap = np.unique(quantized, axis=0, return_index=True, return_inverse=True)
+    return remap.reshape(-1), representatives
+
+
+def remove_degenerate(triangles: np.ndarray) -> np.ndarray:
+    """Drop triangles that repeat a vertex."""
+    keep = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    return triangles[keep]
+
+
+def tipsify(triangles: np.ndarray, vertex_count: int, cache_size: int = 16) -> np.ndarray:
+    """Reorder triangles for the post-transform vertex cache.
+
+    Implements Tipsify (Sander, Nehab and Barczak, "Fast Triangle Reordering
+    for Vertex Locality and Reduced Overdraw", 2007): triangles are emitted as
+    fans around a vertex, and the next fanning vertex is the adjacent one
+    expected to still be in the cache.
+
+    Args:
+        triangles: (T,3) integer array
+        vertex_count: number of vertices
+        cache_size: FIFO size of the cache
+
+    Returns:
+        (T,3) array with the triangles in the new order
+    """
+    if triangles.shape[0] == 0:
+        return triangles
+
+    # Adjacência vértice -> triângulos em formato CSR
+    corners = triangles.reshape(-1)
+    order = np.argsort(corners, kind="stable")
+    adjacency = (order // 3).tolist()
+    starts = np.concatenate(([0], np.cumsum(np.bincount(corners, minlength=vertex_count)))).tolist()
+
+    tris = triangles.tolist()
+    live = np.bincount(corners, minlength=vertex_count).tolist()
+    timestamp = [0] * vertex_count
+    emitted = [False] * len(tris)
+    dead_end = []
+    output = []
+
+    time = cache_size + 1
+    cursor = 1
+    fanning = 0
+    while fanning >= 0:
+        candidates = []
+        for t in adjacency[starts[fanning]:starts[fanning + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = True
+            output.append(t)
+            for v in tris[t]:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if time - timestamp[v] > cache_size:
+                    timestamp[v] = time
+                    time += 1
+
+        # Próximo vértice: o vizinho com triângulos pendentes que ainda estará no cache
+        fanning, priority = -1, -1
+        for v in candidates:
+            if live[v] > 0:
+                p = 0
+                if time - timestamp[v] + 2 * live[v] <= cache_size:
+                    p = time - timestamp[v]
+                if p > priority:
+                    fanning, priority = v, p
+
+        if fanning == -1:
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    fanning = v
+                    break
+        if fanning == -1:
+            while cursor < vertex_count:
+                if live[cursor] > 0:
+                    fanning = cursor
+                    break
+                cursor += 1
+
+    return triangles[np.array(output)]
+
+
+def fetch_order(triangles: np.ndarray, vertex_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Renumber vertices in order of first use, dropping unused ones.
+
+    Args:
+        triangles: (T,3) integer array
+        vertex_count: number of vertices
+
+    Returns:
+        order:     (M,) array of old vertex indices in their new order
+        triangles: (T,3) array using the new vertex indices
+    """
+    corners = triangles.reshape(-1)
+    used, first = np.unique(corners, return_index=True)
+    order = used[np.argsort(first)]
+
+    remap = np.full(vertex_count, -1, np.int64)
+    remap[order] = np.arange(order.size)
+    return order, remap[triangles]
+
+
+def acmr(triangles: np.ndarray, cache_size: int = 16) -> float:
+    """Average cache miss ratio: vertex shader invocations per triangle with a FIFO cache.
+
+    Args:
+        triangles: (T,3) integer array
+        cache_size: FIFO size of the post-transform cache
+
+    Returns:
+        ACMR (between 0.5 for an ideal grid and 3.0 without any reuse)
+    """
+    if triangles.shape[0] == 0:
+        return 0.0
+
+    # Um vértice está no cache se entrou há menos de cache_size faltas
+    inserted = {}
+    misses = 0
+    for v in triangles.reshape(-1).tolist():
+        if misses - inserted.get(v, -cache_size) >= cache_size:
+            inserted[v] = misses
+            misses += 1
+    return misses / triangles.shape[0]
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+ShaderToy multipass rendering: Buffer A-D drawn before the image.
+
+Each buffer pass has its own program (a mainImage shader, like the image)
+and renders a fullscreen quad into a float framebuffer with the size of the
+output. Its channels iChannel0..3 are wired per pass to images or to the
+output of any buffer, with the ShaderToy semantics: the passes run in the
+order A, B, C, D, so a buffer reads the current frame of the buffers before
+it and the previous frame of itself and of the buffers after it.
+
+A pass that reads its own output (feedback) keeps two framebuffers and
+alternates between them (ping-pong): it draws into one while sampling the
+other. Framebuffers are only reallocated when the output size changes, and
+passes whose output does not reach the image, directly or through other
+buffers, are neither compiled nor drawn.
+
+The built-in uniforms are shared with the image through the ShaderToy
+uniform block; only iChannelResolution differs between passes, so the block
+is uploaded again when a pass needs other values.
+"""
+
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.graphics.framebuffer import Framebuffer
+from renderizador.graphics.geometry import parse_geometry
+from renderizador.graphics.primitives import fullscreen_quad
+from renderizador.graphics.shaders import compile_shader, link_shader, default_vertex_shader
+from renderizador.graphics.shadertoy import shadertoy_source
+from renderizador.graphics.state import gl_state
+from renderizador.graphics.texture import Texture, parse_textures
+from renderizador.utils.uniforms import bind_uniforms, set_uniforms
+
+BUFFER_NAMES = ("A", "B", "C", "D")
+
+# Formatos dos buffers: meia precisão (padrão do ShaderToy) ou float completo
+BUFFER_FORMATS = (GL_RGBA16F, GL_RGBA32F)
+
+
+class BufferPass:
+    """One buffer pass (Buffer A-D) with its program, channels and render targets."""
+
+    def __init__(self, name, source, channels=None, internal_format=GL_RGBA16F, filter=GL_LINEAR):
+        """
+        Args:
+            name: "A", "B", "C" or "D"
+            source: Fragment shader source using mainImage
+            channels: Dictionary of channel number (0-3) to input: a buffer
+                name or the file name of an image
+            internal_format: GL_RGBA16F or GL_RGBA32F
+            filter: Filter used when the output is sampled (GL_LINEAR or GL_NEAREST)
+        """
+        if name not in BUFFER_NAMES:
+            raise ValueError(f"buffer name must be one of {BUFFER_NAMES}")
+        if internal_format not in BUFFER_FORMATS:
+            raise ValueError("buffer format must be GL_RGBA16F or GL_RGBA32F")
+
+        self.name = name
+        self.source = source
+        self.internal_format = internal_format
+        self.filter = filter
+        self.channels = {}
+        self.textures = []
+        for channel, value in (channels or {}).items():
+            channel = int(channel)
+            if not 0 <= channel <= 3:
+                raise ValueError("channel must be between 0 and 3")
+            self.channels[channel] = value
+            if value not in BUFFER_NAMES:
+                self.textures.append(Texture(value, channel))
+
+        # A saída mais recente fica em targets[0]; com realimentação desenha em targets[1]
+        self.feedback = name in self.channels.values()
+        self.targets = []
+        self.resolutions = np.zeros((4, 4), np.float32)
+        self.program_id = None
+        self.uniform_setters = []
+
+    @property
+    def inputs(self):
+        """Names of the buffers read by this pass."""
+        return {value for value in self.channels.values() if value in BUFFER_NAMES}
+
+    @property
+    def texture(self):
+        """Color texture with the latest output of the pass (0 before the first resize)."""
+        return self.targets[0].texture if self.targets else 0
+
+    def setup(self, shadertoy, hw_performance=0, uniforms_source={}):
+        """
+        Load the images and compile the program (needs a current context).
+
+        Args:
+            shadertoy: ShaderToyUniforms shared with the image
+            hw_performance: Value of the HW_PERFORMANCE define
+            uniforms_source: User uniforms, bound when the pass declares them
+        """
+        parse_textures(self.textures)
+        for texture in self.textures:
+            self.resolutions[texture.channel, :2] = texture.image.shape[1], texture.image.shape[0]
+
+        vertex_shader = compile_shader(GL_VERTEX_SHADER, "#version 330 core\n" + default_vertex_shader)
+        fragment_shader = compile_shader(
+            GL_FRAGMENT_SHADER, "#version 330 core\n" + shadertoy_source(self.source, hw_performance)
+        )
+        self.program_id = link_shader(vertex_shader, fragment_shader)
+        glDeleteShader(vertex_shader)
+        glDeleteShader(fragment_shader)
+
+        shadertoy.attach(self.program_id)
+        self.uniform_setters = bind_uniforms(self.program_id, uniforms_source)
+
+    def resize(self, width, height):
+        """
+        Allocate the render targets for a new output size.
+
+        Returns:
+            True if the targets were (re)allocated
+        """
+        if self.targets and self.targets[0].size == (width, height):
+            return False
+        for target in self.targets:
+            target.delete()
+        self.targets = [
+            Framebuffer(width, height, self.internal_format, depth=False, filter=self.filter)
+            for _ in range(2 if self.feedback else 1)
+        ]
+        # O conteúdo inicial de uma textura não é definido: começa em zero, como no ShaderToy
+        for target in self.targets:
+            target.bind()
+            glClearBufferfv(GL_COLOR, 0, np.zeros(4, np.float32))
+        for channel, value in self.channels.items():
+            if value in BUFFER_NAMES:
+                self.resolutions[channel, :2] = width, height
+        return True
+
+    def draw(self, passes, quad):
+        """
+        Render the pass into its target.
+
+        Args:
+            passes: MultiPass with the other buffers (inputs)
+            quad: VAO of the fullscreen quad
+        """
+        target = self.targets[-1]
+        target.bind()
+        gl_state.use_program(self.program_id)
+        for channel, value in self.channels.items():
+            if value in BUFFER_NAMES:
+                gl_state.bind_texture(passes.texture(value), channel)
+        for texture in self.textures:
+            gl_state.bind_texture(texture.texture_id, texture.channel)
+        set_uniforms(self.uniform_setters)
+
+        gl_state.bind_vertex_array(quad)
+        glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+
+        # Troca os alvos: o quadro desenhado passa a ser lido pelos próximos passos
+        if self.feedback:
+            self.targets.reverse()
+
+    def delete(self):
+        """Release the program, the images and the render targets."""
+        for target in self.targets:
+            target.delete()
+        self.targets = []
+        if self.textures:
+            glDeleteTextures(len(self.textures), [texture.texture_id for texture in self.textures])
+        if self.program_id is not None:
+            glDeleteProgram(self.program_id)
+            self.program_id = None
+
+
+class MultiPass:
+    """Buffer passes drawn before the image pass, in ShaderToy order."""
+
+    def __init__(self):
+        self.passes = {}
+        self.active = []
+        self.quad = None
+
+    def __len__(self):
+        return len(self.passes)
+
+    def add(self, buffer_pass):
+        """Add (or replace) a buffer pass."""
+        self.passes[buffer_pass.name] = buffer_pass
+
+    def used(self, image_inputs):
+        """
+        Find the passes whose output reaches the image.
+
+        Args:
+            image_inputs: Buffer names read by the image
+
+        Returns:
+            List of passes, in drawing order (A, B, C, D)
+        """
+        used = set()
+        pending = list(image_inputs)
+        while pending:
+            name = pending.pop()
+            if name in used:
+                continue
+            if name not in self.passes:
+                raise ValueError(f"buffer {name} is read but was not added")
+            used.add(name)
+            pending.extend(self.passes[name].inputs)
+        return [self.passes[name] for name in BUFFER_NAMES if name in used]
+
+    def setup(self, image_inputs, shadertoy, hw_performance=0, uniforms_source={}):
+        """
+        Compile the passes used by the image (needs a current context).
+
+        Args:
+            image_inputs: Buffer names read by the image
+            shadertoy: ShaderToyUniforms shared with the image
+            hw_performance: Value of the HW_PERFORMANCE define
+            uniforms_source: User uniforms, bound in the passes that declare them
+        """
+        self.active = self.used(image_inputs)
+        if not self.active:
+            return
+        for buffer_pass in self.active:
+            buffer_pass.setup(shadertoy, hw_performance, uniforms_source)
+
+        data, layout = fullscreen_quad(with_uv=False).vertex_layout()
+        self.quad, _ = parse_geometry(data, GL_TRIANGLE_STRIP, 4, None, layout)
+
+    def texture(self, name):
+        """Color texture with the latest output of a buffer."""
+        return self.passes[name].texture
+
+    def resize(self, width, height):
+        """
+        Match the render targets to the output size (a no-op when unchanged).
+
+        Returns:
+            True if the targets were reallocated
+        """
+        if width <= 0 or height <= 0:
+            # Janela minimizada: mantém os alvos atuais
+            return False
+        resized = False
+        for buffer_pass in self.active:
+            resized |= buffer_pass.resize(width, height)
+        return resized
+
+    def draw(self, shadertoy):
+        """
+        Draw every used pass; the caller binds the output framebuffer afterwards.
+
+        Args:
+            shadertoy: ShaderToyUniforms already updated for this frame
+        """
+        if not all(buffer_pass.targets for buffer_pass in self.active):
+            # Janela minimizada desde o início: ainda não há alvos onde desenhar
+            return
+        resolutions = shadertoy.data["iChannelResolution"]
+        image = resolutions.copy()
+        for buffer_pass in self.active:
+            # Só reenvia o bloco quando as resoluções dos canais mudam entre passos
+            if not np.array_equal(resolutions, buffer_pass.resolutions):
+                resolutions[:] = buffer_pass.resolutions
+                shadertoy.upload()
+            buffer_pass.draw(self, self.quad)
+        if not np.array_equal(resolutions, image):
+            resolutions[:] = image
+            shadertoy.upload()
+
+    def delete(self):
+        """Release the GL objects of every pass."""
+        for buffer_pass in self.active:
+            buffer_pass.delete()
+        self.active = []
+        if self.quad is not None:
+            gl_state.delete_vertex_array(self.quad)
+            self.quad = None
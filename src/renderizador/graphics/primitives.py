@@ -5,13 +5,26 @@
 Primitive mesh builders.
 
 Provide small helpers that return Mesh objects for common primitives like
-the fullscreen quad used for ShaderToy-style rendering.
+the fullscreen quad used for ShaderToy-style rendering, and parametric
+generators (sphere, torus, cylinder, plane grid, capsule, icosphere).
+
+The parametric generators build every attribute with NumPy broadcasting over
+the parameter grid and return indexed GL_TRIANGLES meshes with normals and
+uvs, counter-clockwise seen from outside. Results are memoized by their
+parameters (LRU): each call returns a new Mesh that shares the cached,
+read-only arrays, so a sphere drawn many times is tessellated once.
 """
 
+import functools
+from dataclasses import replace
+
 import numpy as np
-from OpenGL.GL import GL_TRIANGLE_STRIP
+from OpenGL.GL import GL_TRIANGLE_STRIP, GL_TRIANGLES
 from .mesh import Mesh
 
+# Quantidade de primitivas diferentes guardadas no cache
+CACHE_SIZE = 64
+
 
 def fullscreen_quad(color=(1.0, 1.0, 1.0), with_uv=True) -> Mesh:
     """Create a fullscreen quad in NDC with optional UVs.
@@ -30,3 +43,270 @@ def fullscreen_quad(color=(1.0, 1.0, 1.0), with_uv=True) -> Mesh:
     uvs = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]], dtype=np.float32) if with_uv else None
 
     return Mesh(vertices=vertices, colors=colors, uvs=uvs, mode=GL_TRIANGLE_STRIP)
+
+
+def cached_primitive(builder):
+    """Memoize a primitive builder by its parameters, returning fresh Mesh objects over read-only arrays."""
+    @functools.lru_cache(maxsize=CACHE_SIZE)
+    def build(*args, **kwargs):
+        mesh = builder(*args, **kwargs)
+        for array in (mesh.vertices, mesh.normals, mesh.colors, mesh.uvs, mesh.index):
+            if array is not None:
+                array.setflags(write=False)
+        return mesh
+
+    @functools.wraps(builder)
+    def primitive(*args, **kwargs):
+        return replace(build(*args, **kwargs))
+
+    primitive.cache_info = build.cache_info
+    primitive.cache_clear = build.cache_clear
+    return primitive
+
+
+def grid_index(rows, columns):
+    """
+    Triangle index of a (rows+1) x (columns+1) vertex grid, two triangles per cell.
+
+    Args:
+        rows: Number of cells along the first grid axis
+        columns: Number of cells along the second grid axis
+
+    Returns:
+        (rows*columns*6,) uint32 array
+    """
+    corner = (np.arange(rows)[:, None] * (columns + 1) + np.arange(columns)[None, :]).reshape(-1)
+    below = corner + columns + 1
+    return np.stack(
+        [corner, below, corner + 1, corner + 1, below, below + 1], axis=1
+    ).reshape(-1).astype(np.uint32)
+
+
+def grid_mesh(positions, normals, uvs, rows, columns, poles=False):
+    """
+    Indexed mesh from (rows+1, columns+1, K) attribute grids.
+
+    With poles=True the first and last grid rows collapse to a point, and the
+    zero-area triangle of each cell touching them is left out.
+    """
+    index = grid_index(rows, columns)
+    if poles:
+        triangles = index.reshape(rows, columns, 2, 3)
+        keep = np.ones((rows, columns, 2), bool)
+        keep[0, :, 0] = False
+        keep[-1, :, 1] = False
+        index = triangles[keep].reshape(-1)
+
+    return Mesh(
+        vertices=np.ascontiguousarray(positions.reshape(-1, 3), np.float32),
+        normals=np.ascontiguousarray(normals.reshape(-1, 3), np.float32),
+        uvs=np.ascontiguousarray(uvs.reshape(-1, 2), np.float32),
+        mode=GL_TRIANGLES,
+        index=index,
+    )
+
+
+@cached_primitive
+def sphere(radius=1.0, segments=32, rings=16) -> Mesh:
+    """UV sphere centered at the origin with the poles on the y axis.
+
+    Args:
+        radius: Sphere radius
+        segments: Divisions around the y axis
+        rings: Divisions from pole to pole
+    """
+    v = np.linspace(0.0, 1.0, rings + 1)[:, None]
+    u = np.linspace(0.0, 1.0, segments + 1)[None, :]
+    theta, phi = v * np.pi, u * 2 * np.pi
+
+    normals = np.stack(np.broadcast_arrays(
+        np.sin(theta) * np.sin(phi), np.cos(theta), np.sin(theta) * np.cos(phi)
+    ), axis=-1)
+    uvs = np.stack(np.broadcast_arrays(u, 1.0 - v), axis=-1)
+    return grid_mesh(radius * normals, normals, uvs, rings, segments, poles=True)
+
+
+@cached_primitive
+def torus(major_radius=1.0, minor_radius=0.25, radial_segments=32, tubular_segments=16) -> Mesh:
+    """Torus around the y axis.
+
+    Args:
+        major_radius: Distance from the center to the middle of the tube
+        minor_radius: Radius of the tube
+        radial_segments: Divisions around the y axis
+        tubular_segments: Divisions around the tube
+    """
+    v = np.linspace(0.0, 1.0, tubular_segments + 1)[:, None]
+    u = np.linspace(0.0, 1.0, radial_segments + 1)[None, :]
+    tube, around = v * 2 * np.pi, u * 2 * np.pi
+
+    normals = np.stack(np.broadcast_arrays(
+        -np.cos(tube) * np.sin(around), np.sin(tube), -np.cos(tube) * np.cos(around)
+    ), axis=-1)
+    ring = np.stack(np.broadcast_arrays(np.sin(around), 0.0 * tube, np.cos(around)), axis=-1)
+    positions = major_radius * ring + minor_radius * normals
+    uvs = np.stack(np.broadcast_arrays(u, v), axis=-1)
+    return grid_mesh(positions, normals, uvs, tubular_segments, radial_segments)
+
+
+@cached_primitive
+def plane_grid(width=1.0, depth=1.0, width_segments=1, depth_segments=1) -> Mesh:
+    """Plane on XZ centered at the origin, facing +y.
+
+    Args:
+        width: Size along x
+        depth: Size along z
+        width_segments: Divisions along x
+        depth_segments: Divisions along z
+    """
+    v = np.linspace(0.0, 1.0, depth_segments + 1)[:, None]
+    u = np.linspace(0.0, 1.0, width_segments + 1)[None, :]
+
+    positions = np.stack(np.broadcast_arrays((u - 0.5) * width, 0.0 * u * v, (v - 0.5) * depth), axis=-1)
+    normals = np.broadcast_to(np.array([0.0, 1.0, 0.0]), positions.shape)
+    uvs = np.stack(np.broadcast_arrays(u, 1.0 - v), axis=-1)
+    return grid_mesh(positions, normals, uvs, depth_segments, width_segments)
+
+
+@cached_primitive
+def cylinder(radius=1.0, height=2.0, segments=32, height_segments=1, caps=True) -> Mesh:
+    """Cylinder along the y axis centered at the origin.
+
+    Args:
+        radius: Cylinder radius
+        height: Size along y
+        segments: Divisions around the y axis
+        height_segments: Divisions along y
+        caps: Whether to close the top and bottom
+    """
+    v = np.linspace(0.0, 1.0, height_segments + 1)[:, None]
+    u = np.linspace(0.0, 1.0, segments + 1)[None, :]
+    around = u * 2 * np.pi
+
+    normals = np.stack(np.broadcast_arrays(np.sin(around), 0.0 * v, np.cos(around)), axis=-1)
+    positions = radius * normals + np.stack(np.broadcast_arrays(0.0 * u, (0.5 - v) * height, 0.0 * u), axis=-1)
+    uvs = np.stack(np.broadcast_arrays(u, 1.0 - v), axis=-1)
+    side = grid_mesh(positions, normals, uvs, height_segments, segments)
+    if not caps:
+        return side
+
+    # Tampas: um vértice central e um anel com a normal do eixo
+    angles = around[0, :-1]
+    ring = np.stack([np.sin(angles), np.zeros_like(angles), np.cos(angles)], axis=1)
+    parts = [side]
+    for direction in (1.0, -1.0):
+        center = np.array([[0.0, direction * height / 2, 0.0]])
+        cap_positions = np.concatenate([center, radius * ring + center])
+        cap_uvs = np.concatenate([[[0.5, 0.5]], 0.5 + 0.5 * ring[:, [0, 2]] * [1.0, -direction]])
+        following = np.roll(np.arange(segments), -1) + 1
+        current = np.arange(segments) + 1
+        triangles = np.stack([np.zeros(segments, np.int64), current, following], axis=1)
+        if direction < 0:
+            triangles = triangles[:, [0, 2, 1]]
+        parts.append(Mesh(
+            vertices=cap_positions.astype(np.float32),
+            normals=np.tile(np.array([0.0, direction, 0.0], np.float32), (segments + 1, 1)),
+            uvs=cap_uvs.astype(np.float32),
+            mode=GL_TRIANGLES,
+            index=triangles.reshape(-1).astype(np.uint32),
+        ))
+    return merge_meshes(parts)
+
+
+@cached_primitive
+def capsule(radius=0.5, height=1.0, segments=32, rings=8) -> Mesh:
+    """Capsule along the y axis: a cylinder of `height` closed by two hemispheres.
+
+    Args:
+        radius: Radius of the cylinder and hemispheres
+        height: Length of the cylindrical part (total length is height + 2*radius)
+        segments: Divisions around the y axis
+        rings: Divisions of each hemisphere from pole to equator
+    """
+    # O equador aparece duas vezes: uma vez em cada hemisfério, ligados pelo cilindro
+    theta = np.concatenate([np.linspace(0.0, np.pi / 2, rings + 1), np.linspace(np.pi / 2, np.pi, rings + 1)])[:, None]
+    offset = np.where(np.arange(2 * rings + 2) <= rings, height / 2, -height / 2)[:, None]
+    u = np.linspace(0.0, 1.0, segments + 1)[None, :]
+    phi = u * 2 * np.pi
+
+    normals = np.stack(np.broadcast_arrays(
+        np.sin(theta) * np.sin(phi), np.cos(theta), np.sin(theta) * np.cos(phi)
+    ), axis=-1)
+    positions = radius * normals + np.stack(np.broadcast_arrays(0.0 * u, offset, 0.0 * u), axis=-1)
+    total = height + 2 * radius
+    v = (positions[..., 1] + total / 2) / total
+    uvs = np.stack(np.broadcast_arrays(u, v), axis=-1)
+    return grid_mesh(positions, normals, uvs, 2 * rings + 1, segments, poles=True)
+
+
+@cached_primitive
+def icosphere(radius=1.0, subdivisions=2) -> Mesh:
+    """Sphere made by subdividing an icosahedron, with evenly sized triangles.
+
+    Each subdivision splits every triangle in four; midpoints of shared
+    edges are created once by numbering the unique edges.
+
+    Args:
+        radius: Sphere radius
+        subdivisions: Number of subdivision steps (20 * 4**n triangles)
+    """
+    t = (1.0 + np.sqrt(5.0)) / 2.0
+    vertices = np.array([
+        [-1, t, 0], [1, t, 0], [-1, -t, 0], [1, -t, 0],
+        [0, -1, t], [0, 1, t], [0, -1, -t], [0, 1, -t],
+        [t, 0, -1], [t, 0, 1], [-t, 0, -1], [-t, 0, 1],
+    ], np.float64)
+    triangles = np.array([
+        [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+        [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+        [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+        [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
+    ], np.int64)
+    vertices /= np.linalg.norm(vertices, axis=1, keepdims=True)
+
+    for _ in range(subdivisions):
+        edges = np.sort(np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]]), axis=1)
+        keys, edge_index = np.unique(edges[:, 0] * vertices.shape[0] + edges[:, 1], return_inverse=True)
+        first, second = keys // vertices.shape[0], keys % vertices.shape[0]
+        midpoints = vertices[first] + vertices[second]
+        midpoints /= np.linalg.norm(midpoints, axis=1, keepdims=True)
+
+        # Índices dos pontos médios das arestas (a,b), (b,c) e (c,a) de cada triângulo
+        ab, bc, ca = (vertices.shape[0] + edge_index.reshape(3, -1))
+        a, b, c = triangles.T
+        triangles = np.stack([
+            np.stack([a, ab, ca], axis=1), np.stack([ab, b, bc], axis=1),
+            np.stack([ca, bc, c], axis=1), np.stack([ab, bc, ca], axis=1),
+        ], axis=1).reshape(-1, 3)
+        vertices = np.concatenate([vertices, midpoints])
+
+    # Coordenadas de textura esféricas (a costura em u = 0/1 não é duplicada)
+    uvs = np.stack([
+        0.5 + np.arctan2(vertices[:, 0], vertices[:, 2]) / (2 * np.pi),
+        0.5 + np.arcsin(np.clip(vertices[:, 1], -1.0, 1.0)) / np.pi,
+    ], axis=1)
+    return Mesh(
+        vertices=(radius * vertices).astype(np.float32),
+        normals=vertices.astype(np.float32),
+        uvs=uvs.astype(np.float32),
+        mode=GL_TRIANGLES,
+        index=triangles.reshape(-1).astype(np.uint32),
+    )
+
+
+def merge_meshes(meshes) -> Mesh:
+    """Concatenate indexed GL_TRIANGLES meshes with the same attributes into one."""
+    offsets = np.cumsum([0] + [mesh.vertices.shape[0] for mesh in meshes[:-1]])
+
+    def concatenate(name):
+        arrays = [getattr(mesh, name) for mesh in meshes]
+        return None if arrays[0] is None else np.concatenate(arrays)
+
+    return Mesh(
+        vertices=concatenate("vertices"),
+        normals=concatenate("normals"),
+        colors=concatenate("colors"),
+        uvs=concatenate("uvs"),
+        mode=GL_TRIANGLES,
+        index=np.concatenate([mesh.index + offset for mesh, offset in zip(meshes, offsets)]).astype(np.uint32),
+    )
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Progressive rendering of expensive shaders in tiles spread over many frames.
+
+The output is split into tiles that are drawn, a few per frame, into an
+accumulation framebuffer with the scissor test; the framebuffer is copied to
+the output every frame, so the image is shown partially updated while the
+window, the GUI and the input keep running at the display rate. A sweep
+draws every tile once with the time of the frame that started it, so a
+finished image is consistent.
+
+Each tile is finished (glFinish) before the next one is issued: the time of
+the tiles drawn so far is measured on the CPU and no tile is started when the
+last one would not fit in the frame budget. This adapts immediately to tiles
+of very different cost, and keeps every submission to the driver short
+(long ones can trip the GPU watchdog).
+"""
+
+import time
+
+from OpenGL.GL import *
+
+from renderizador.graphics.framebuffer import Framebuffer
+from renderizador.graphics.state import gl_state
+
+
+class ProgressiveTiles:
+    """Accumulation framebuffer filled a few tiles per frame."""
+
+    def __init__(self, tile_size=128, budget=0.010):
+        """
+        Args:
+            tile_size: Width and height of the tiles in pixels
+            budget: Time per frame (seconds) spent drawing tiles; at least
+                one tile is drawn every frame
+        """
+        if tile_size <= 0:
+            raise ValueError("tile_size must be positive")
+        if budget <= 0:
+            raise ValueError("budget must be positive")
+
+        self.tile_size = int(tile_size)
+        self.budget = budget
+        self.framebuffer = None
+        self.tiles = []
+        self.next = 0
+
+        # Varredura atual: tempo do quadro que a começou e intervalo desde a anterior
+        self.sweeps = 0
+        self.time = None
+        self.time_delta = 0.0
+        self.sweep_frames = 0
+        self.last_sweep_frames = None
+        self.tile_time = None
+
+    @property
+    def progress(self):
+        """Fraction of the tiles of the current sweep already drawn."""
+        return self.next / len(self.tiles) if self.tiles else 0.0
+
+    def begin(self, width, height):
+        """
+        Bind the accumulation framebuffer, reallocating it for a new output size.
+
+        Returns:
+            Framebuffer object name
+        """
+        if self.framebuffer is None or self.framebuffer.size != (width, height):
+            if self.framebuffer is not None:
+                self.framebuffer.delete()
+            self.framebuffer = Framebuffer(width, height)
+            size = self.tile_size
+            self.tiles = [
+                (x, y, min(size, width - x), min(size, height - y))
+                for y in range(0, height, size)
+                for x in range(0, width, size)
+            ]
+            # Tamanho novo: recomeça a varredura (as regiões já desenhadas têm outro tamanho)
+            self.next = 0
+            self.framebuffer.bind()
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+        self.framebuffer.bind()
+        return self.framebuffer.fbo
+
+    def start_sweep(self, passed_time):
+        """
+        Whether a new sweep starts this frame; if so, record its time.
+
+        Args:
+            passed_time: Time of the current frame
+        """
+        if self.next != 0:
+            return False
+        self.time_delta = 0.0 if self.time is None else passed_time - self.time
+        self.time = passed_time
+        self.sweeps += 1
+        self.sweep_frames = 0
+        return True
+
+    def draw(self, draw_tile):
+        """
+        Draw tiles until the frame budget is used or the sweep ends.
+
+        Args:
+            draw_tile: Function that clears and draws the scene; the scissor
+                rectangle of the tile is already set
+        """
+        glEnable(GL_SCISSOR_TEST)
+        start = time.perf_counter()
+        elapsed = 0.0
+        while self.next < len(self.tiles):
+            glScissor(*self.tiles[self.next])
+            draw_tile()
+            glFinish()
+            self.next += 1
+
+            now = time.perf_counter()
+            self.tile_time = now - start - elapsed
+            elapsed = now - start
+            # Para antes de um ladrilho que (pelo último) estouraria o orçamento
+            if elapsed + self.tile_time > self.budget:
+                break
+        glDisable(GL_SCISSOR_TEST)
+
+        self.sweep_frames += 1
+        if self.next == len(self.tiles):
+            self.next = 0
+            self.last_sweep_frames = self.sweep_frames
+
+    def present(self, fbo, width, height):
+        """
+        Copy the accumulated image to the output.
+
+        Args:
+            fbo: Output framebuffer (0 for the window)
+            width, height: Output size
+        """
+        gl_state.bind_framebuffer(GL_READ_FRAMEBUFFER, self.framebuffer.fbo)
+        gl_state.bind_framebuffer(GL_DRAW_FRAMEBUFFER, fbo)
+        glBlitFramebuffer(0, 0, width, height, 0, 0, width, height, GL_COLOR_BUFFER_BIT, GL_NEAREST)
+        gl_state.viewport(0, 0, width, height)
+
+    def delete(self):
+        """Release the accumulation framebuffer."""
+        if self.framebuffer is not None:
+            self.framebuffer.delete()
+            self.framebuffer = None
+        self.tiles = []
+        self.next = 0
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Scene module: many meshes batched into shared buffers.
+
+All meshes of a scene are packed into one interleaved vertex buffer and one
+index buffer, recording where each mesh starts. Meshes that share the same
+primitive mode are then issued together with glMultiDrawArrays or
+glMultiDrawElementsBaseVertex, so hundreds of small objects cost a handful of
+GL calls per frame instead of one bind and draw per object.
+
+Objects may also be LOD chains: every level is packed into the shared buffers
+and, when drawn with a camera, each object uses the level that matches its
+projected size on screen.
+
+When drawn with a camera, objects outside the view frustum are culled through
+a BVH over their bounding boxes before the multi-draw arguments are built.
+"""
+
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.graphics.geometry import check_index, interleave_attributes, normalize_rows, parse_geometry
+from renderizador.graphics.culling import BVH, CullingStats, aabb, bounding_sphere, frustum_planes
+from renderizador.graphics.lod import LODChain, projected_size
+from renderizador.graphics.state import gl_state
+
+
+class DrawRange:
+    """Location of one mesh inside the scene buffers."""
+
+    def __init__(self, mode, first_vertex, vertex_count, first_index=0, index_count=0):
+        self.mode = mode
+        self.first_vertex = first_vertex    # base vertex dentro do VBO compartilhado
+        self.vertex_count = vertex_count
+        self.first_index = first_index      # primeiro índice dentro do EBO compartilhado
+        self.index_count = index_count      # zero para malhas não indexadas
+
+    @property
+    def indexed(self):
+        return self.index_count > 0
+
+
+class DrawBatch:
+    """Arguments of one glMultiDrawArrays/glMultiDrawElementsBaseVertex call."""
+
+    def __init__(self, mode, ranges, index_dtype=None):
+        self.mode = mode
+        self.drawcount = len(ranges)
+        self.indexed = index_dtype is not None
+
+        # Os vetores são montados uma única vez e reutilizados a cada quadro
+        if self.indexed:
+            self.type = GL_UNSIGNED_SHORT if index_dtype == np.uint16 else GL_UNSIGNED_INT
+            item_size = np.dtype(index_dtype).itemsize
+            self.counts = np.array([r.index_count for r in ranges], np.int32)
+            self.basevertex = np.array([r.first_vertex for r in ranges], np.int32)
+            self.offsets = (ctypes.c_void_p * self.drawcount)(
+                *[r.first_index * item_size for r in ranges]
+            )
+        else:
+            self.firsts = np.array([r.first_vertex for r in ranges], np.int32)
+            self.counts = np.array([r.vertex_count for r in ranges], np.int32)
+
+    def draw(self):
+        if self.indexed:
+            glMultiDrawElementsBaseVertex(
+                self.mode, self.counts, self.type, self.offsets, self.drawcount, self.basevertex
+            )
+        else:
+            glMultiDrawArrays(self.mode, self.firsts, self.counts, self.drawcount)
+
+
+class Scene:
+    """Collection of meshes rendered from shared vertex and index buffers."""
+
+    def __init__(self):
+        self.meshes = []        # lista de (Mesh ou LODChain, transformação 4x4 ou None)
+        self.ranges = []        # lista de DrawRange por nível de cada objeto, na ordem de inserção
+        self.batches = []       # chamadas de multi-draw agrupadas por modo
+        self.levels = None      # nível de detalhe escolhido para cada objeto
+        self.screen_sizes = None
+        self.centers = None     # esfera envolvente de cada objeto (em coordenadas do mundo)
+        self.radii = None
+        self.low = None         # caixa envolvente (AABB) de cada objeto
+        self.high = None
+        self.bvh = None
+        self.visible = None     # objetos dentro do frustum no último quadro
+        self.culling = True
+        self.stats = CullingStats()
+        self.data = None
+        self.index = None
+        self.index_dtype = np.uint16
+        self.vao = None
+
+    def __len__(self):
+        return len(self.meshes)
+
+    def add(self, mesh, transform=None):
+        """
+        Add a mesh to the scene.
+
+        Args:
+            mesh: Mesh object (vertices, optional normals/colors/uvs/index) or
+                LODChain, whose level is picked per frame from the camera
+            transform: Optional 4x4 model matrix baked into the vertices when packing
+
+        Returns:
+            Position of the mesh in the scene
+        """
+        for level in levels_of(mesh):
+            level.validate()
+        self.meshes.append((mesh, None if transform is None else np.asarray(transform, np.float32)))
+        return len(self.meshes) - 1
+
+    def pack(self):
+        """
+        Pack every mesh into one interleaved vertex buffer and one index buffer.
+
+        Indices are kept local to each mesh (glMultiDrawElementsBaseVertex adds
+        the base vertex), so the index type only depends on the largest mesh.
+
+        Returns:
+            Tuple of (data, index); index is None when no mesh is indexed
+        """
+        levels = [mesh for item, _ in self.meshes for mesh in levels_of(item)]
+        vertex_total = sum(mesh.vertices.shape[0] for mesh in levels)
+        largest = max((mesh.vertices.shape[0] for mesh in levels), default=0)
+        self.index_dtype = np.uint16 if largest <= 0x10000 else np.uint32
+
+        data = np.empty((vertex_total, 11), np.float32)
+        indices = []
+        self.ranges = []
+        self.centers = np.zeros((len(self.meshes), 3), np.float32)
+        self.radii = np.zeros(len(self.meshes), np.float32)
+        self.low = np.zeros((len(self.meshes), 3), np.float32)
+        self.high = np.zeros((len(self.meshes), 3), np.float32)
+
+        first_vertex = 0
+        first_index = 0
+        for position, (item, transform) in enumerate(self.meshes):
+            object_ranges = []
+            for level, mesh in enumerate(levels_of(item)):
+                vertices, normals = mesh.vertices, mesh.normals
+                if transform is not None:
+                    vertices, normals = transform_attributes(transform, vertices, normals)
+                if level == 0:
+                    self.centers[position], self.radii[position] = bounding_sphere(vertices)
+                    self.low[position], self.high[position] = aabb(vertices)
+
+                count = vertices.shape[0]
+                data[first_vertex:first_vertex + count] = interleave_attributes(vertices, normals, mesh.colors, mesh.uvs)
+
+                index_count = 0
+                if mesh.index is not None:
+                    index = check_index(mesh.index, count)
+                    indices.append(index.astype(self.index_dtype))
+                    index_count = index.size
+
+                object_ranges.append(DrawRange(mesh.mode, first_vertex, count, first_index, index_count))
+                first_vertex += count
+                first_index += index_count
+            self.ranges.append(object_ranges)
+
+        # Limiares de troca de nível por objeto (-inf completa as cadeias mais curtas)
+        depth = max((len(item) - 1 for item, _ in self.meshes if isinstance(item, LODChain)), default=0)
+        self.screen_sizes = np.full((len(self.meshes), depth), -np.inf, np.float32)
+        for position, (item, _) in enumerate(self.meshes):
+            if isinstance(item, LODChain):
+                self.screen_sizes[position, :len(item) - 1] = item.screen_sizes
+        self.levels = np.zeros(len(self.meshes), np.int64)
+        self.visible = np.ones(len(self.meshes), bool)
+        self.bvh = BVH(self.low, self.high)
+
+        self.data = data.reshape(-1)
+        self.index = np.concatenate(indices) if indices else None
+        self.rebuild_batches()
+        return self.data, self.index
+
+    def rebuild_batches(self):
+        """Rebuild the multi-draw batches for the selected level of every visible object."""
+        selected = [
+            object_ranges[level]
+            for object_ranges, level, visible in zip(self.ranges, self.levels.tolist(), self.visible.tolist())
+            if visible
+        ]
+        self.batches = build_batches(selected, self.index_dtype)
+
+    def select_levels(self, view, projection):
+        """
+        Pick the level of detail of every object from its projected size.
+
+        Args:
+            view: 4x4 view matrix
+            projection: 4x4 projection matrix
+
+        Returns:
+            True if any object changed level
+        """
+        if self.screen_sizes.shape[1] == 0:
+            return False
+        size = projected_size(self.centers, self.radii, view, projection)
+        levels = np.sum(size[:, None] < self.screen_sizes, axis=1)
+        if np.array_equal(levels, self.levels):
+            return False
+        self.levels = levels
+        return True
+
+    def cull(self, view, projection):
+        """
+        Find the objects inside the view frustum, updating self.stats.
+
+        Args:
+            view: 4x4 view matrix
+            projection: 4x4 projection matrix
+
+        Returns:
+            True if the set of visible objects changed
+        """
+        visible = self.bvh.cull(frustum_planes(projection @ view), self.stats)
+        if np.array_equal(visible, self.visible):
+            return False
+        self.visible = visible
+        return True
+
+    def update_view(self, camera):
+        """
+        Cull objects and pick levels of detail for a camera.
+
+        The multi-draw batches are rebuilt only when visibility or a level changed.
+
+        Args:
+            camera: Camera used to draw the frame
+        """
+        view, projection = camera.get_view_matrix(), camera.get_projection_matrix()
+        changed = self.cull(view, projection) if self.culling else False
+        if self.select_levels(view, projection) or changed:
+            self.rebuild_batches()
+
+    def upload(self):
+        """Pack the scene and upload it to a VAO with shared VBO/EBO."""
+        self.pack()
+        self.vao, _ = parse_geometry(self.data, None, 0, self.index)
+        return self.vao
+
+    def draw(self, camera=None):
+        """
+        Issue every mesh with one multi-draw call per primitive mode.
+
+        Args:
+            camera: Optional Camera used to cull objects outside the view
+                frustum and to pick the level of LOD chains
+        """
+        if camera is not None:
+            self.update_view(camera)
+
+        gl_state.bind_vertex_array(self.vao)
+        for batch in self.batches:
+            batch.draw()
+
+    def delete(self):
+        """Release the GL resources of the scene."""
+        if self.vao is not None:
+            gl_state.delete_vertex_array(self.vao)
+            self.vao = None
+
+
+def levels_of(item):
+    """Meshes of a scene object: every level of an LODChain, or the mesh itself."""
+    return item.levels if isinstance(item, LODChain) else [item]
+
+
+def build_batches(ranges, index_dtype):
+    """
+    Group draw ranges by primitive mode and indexing into multi-draw batches.
+
+    Args:
+        ranges: List of DrawRange
+        index_dtype: NumPy dtype of the shared index buffer
+
+    Returns:
+        List of DrawBatch
+    """
+    groups = {}
+    for draw_range in ranges:
+        groups.setdefault((draw_range.mode, draw_range.indexed), []).append(draw_range)
+    return [
+        DrawBatch(mode, group, index_dtype if indexed else None)
+        for (mode, indexed), group in groups.items()
+    ]
+
+
+def transform_attributes(transform, vertices, normals=None):
+    """
+    Apply a 4x4 model matrix to positions and normals.
+
+    Args:
+        transform: 4x4 matrix (column vectors, as built by translate/rotate/scale)
+        vertices: (N,3) float32 array
+        normals: (N,3) float32 array or None
+
+    Returns:
+        Tuple of transformed (vertices, normals)
+    """
+    linear = transform[:3, :3]
+    vertices = (vertices @ linear.T + transform[:3, 3]).astype(np.float32)
+    if normals is not None:
+        # Normais usam a inversa transposta para suportar escalas não uniformes
+        normals = normalize_rows((normals @ np.linalg.inv(linear)).astype(np.float32))
+    return vertices, normals
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+ShaderToy compatibility: source wrapping and the built-in uniforms.
+
+The built-in uniforms (iResolution, iTime, iFrame, iMouse, ...) live in a
+std140 uniform block. Each frame they are packed into one preallocated NumPy
+structure that mirrors the std140 layout and uploaded with a single
+glBufferSubData. The buffer stays bound to a fixed binding point, so every
+program that declares the block (all passes of a multipass shader) reads the
+same values without any per-program call.
+
+The samplers iChannel0..3 cannot be inside a block; they are ordinary
+uniforms set once after linking (sampler iChannelN uses texture unit N).
+"""
+
+import ctypes
+import re
+import time
+
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.graphics.state import gl_state
+
+# Ponto de ligação do bloco de uniforms do ShaderToy
+SHADERTOY_BINDING = 0
+
+SHADERTOY_BLOCK = "ShaderToy"
+
+SHADERTOY_UNIFORMS = f"""layout(std140) uniform {SHADERTOY_BLOCK} {{
+    vec2 iResolution;
+    float iTime;
+    float iTimeDelta;
+    float iFrameRate;
+    uint iFrame;
+    vec4 iMouse;
+    vec4 iDate;
+    vec2 iChannelResolution[4];
+    float iChannelTime[4];
+}};
+uniform sampler2D iChannel0;
+uniform sampler2D iChannel1;
+uniform sampler2D iChannel2;
+uniform sampler2D iChannel3;
+"""
+
+# Layout std140 do bloco: elementos de arranjos ocupam 16 bytes cada
+SHADERTOY_DTYPE = np.dtype({
+    "names": ["iResolution", "iTime", "iTimeDelta", "iFrameRate", "iFrame",
+              "iMouse", "iDate", "iChannelResolution", "iChannelTime"],
+    "formats": [(np.float32, 2), np.float32, np.float32, np.float32, np.uint32,
+                (np.float32, 4), (np.float32, 4), (np.float32, (4, 4)), (np.float32, (4, 4))],
+    "offsets": [0, 8, 12, 16, 20, 32, 48, 64, 128],
+    "itemsize": 192,
+})
+
+
+def shadertoy_source(source, hw_performance=0):
+    """
+    Turn a ShaderToy fragment shader (mainImage) into a GLSL 330 body.
+
+    Adds the HW_PERFORMANCE define, the built-in uniform block and samplers,
+    and replaces mainImage(out vec4, in vec2) by main().
+
+    Args:
+        source: Fragment shader source using mainImage
+        hw_performance: Value of the HW_PERFORMANCE define
+
+    Returns:
+        Source without the #version line
+    """
+    header = [f"#define HW_PERFORMANCE {hw_performance}\n" + SHADERTOY_UNIFORMS]
+
+    def main_image(match):
+        signature = re.search(r'\((.*?)\)', match.group()).group(1)
+        for argument in (x.strip() for x in signature.split(',')):
+            words = argument.split()
+            if words[0] == "out":
+                header[0] += f"out vec4 {words[2]};\n"
+            elif words[0] == "in":
+                header[0] += f"in vec4 gl_FragCoord;vec2 {words[2]} = gl_FragCoord.xy;\n"
+        return "void main(){\n"
+
+    source = re.sub(r"void\s*mainImage\(([^\)]+)\)\s*\{", main_image, source)
+    return header[0] + source
+
+
+class ShaderToyUniforms:
+    """Uniform buffer with the ShaderToy built-ins, shared by all programs."""
+
+    def __init__(self, binding=SHADERTOY_BINDING):
+        """
+        Create the buffer and bind it; needs a current context.
+
+        Args:
+            binding: Uniform buffer binding point
+        """
+        self.binding = binding
+        self.data = np.zeros((), SHADERTOY_DTYPE)
+        self.pointer = self.data.ctypes.data_as(ctypes.c_void_p)
+
+        self.ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferData(GL_UNIFORM_BUFFER, SHADERTOY_DTYPE.itemsize, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, binding, self.ubo)
+
+    def attach(self, program_id):
+        """
+        Connect a program's ShaderToy block to the buffer and set its samplers.
+
+        Args:
+            program_id: Linked program (programs without the block are ignored)
+        """
+        block = glGetUniformBlockIndex(program_id, SHADERTOY_BLOCK)
+        if block != GL_INVALID_INDEX:
+            glUniformBlockBinding(program_id, block, self.binding)
+
+        # Sampler iChannelN -> unidade de textura N (fixo, definido uma vez)
+        gl_state.use_program(program_id)
+        for channel in range(4):
+            location = glGetUniformLocation(program_id, f"iChannel{channel}")
+            if location != -1:
+                glUniform1i(location, channel)
+
+    def set_channel(self, channel, resolution=None, time=None):
+        """
+        Set the iChannelResolution and iChannelTime of a channel.
+
+        Args:
+            channel: Channel number (0-3)
+            resolution: (width, height) of the input
+            time: Playback time in seconds
+        """
+        if resolution is not None:
+            self.data["iChannelResolution"][channel, :2] = resolution
+        if time is not None:
+            self.data["iChannelTime"][channel, 0] = time
+
+    def update(self, resolution, passed_time, time_delta, frame_rate, frame, mouse, date=None):
+        """
+        Fill the per-frame values and upload the block with one glBufferSubData.
+
+        Args:
+            resolution: (width, height) of the output
+            passed_time: iTime in seconds
+            time_delta: iTimeDelta in seconds
+            frame_rate: iFrameRate
+            frame: iFrame
+            mouse: iMouse (4 values)
+            date: iDate (year, month, day, seconds); the current date if None
+        """
+        data = self.data
+        data["iResolution"] = resolution
+        data["iTime"] = passed_time
+        data["iTimeDelta"] = time_delta
+        data["iFrameRate"] = frame_rate
+        data["iFrame"] = frame
+        data["iMouse"] = mouse
+        data["iDate"] = current_date() if date is None else date
+        self.upload()
+
+    def upload(self):
+        """Send the whole block to the buffer."""
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, SHADERTOY_DTYPE.itemsize, self.pointer)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+    def delete(self):
+        """Release the buffer."""
+        if self.ubo is not None:
+            glDeleteBuffers(1, [self.ubo])
+            self.ubo = None
+
+
+def current_date():
+    """
+    ShaderToy iDate: (year, month 1-12, day, seconds since midnight).
+
+    Returns:
+        Tuple of four floats
+    """
+    ts = time.time()  # epoch com fração
+    lt = time.localtime(ts)
+    seconds_in_day = lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec + (ts % 1.0)
+    return float(lt.tm_year), float(lt.tm_mon), float(lt.tm_mday), float(seconds_in_day)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Cache of the OpenGL binding state.
+
+Every call through PyOpenGL costs tens of microseconds, even when it does not
+change anything. GLState remembers the bound program, vertex array, active
+texture unit, texture of each unit, framebuffers and viewport, and skips the
+calls that would set the value already in place. The render loop then no
+longer needs to unbind objects after drawing: the next bind of the same
+object is free.
+
+The cache only knows about calls made through it. Code that changes this
+state directly (imgui, other libraries, a new context) must be followed by
+invalidate() or forget_texture(). Deleting a bound object also unbinds it in
+OpenGL (and its name may be reused), so objects are deleted through the cache
+or followed by invalidate().
+
+Generic buffer bindings (GL_ARRAY_BUFFER, GL_ELEMENT_ARRAY_BUFFER, ...) are
+not cached: they are only used for uploads, and the element buffer belongs
+to the bound vertex array.
+"""
+
+from dataclasses import dataclass
+
+from OpenGL.GL import *
+
+
+@dataclass
+class GLStateStats:
+    """Number of state changes requested in one frame."""
+
+    issued: int
+    elided: int
+
+    def __str__(self):
+        total = self.issued + self.elided
+        percent = 100.0 * self.elided / total if total else 0.0
+        return f"{self.issued} chamadas emitidas, {self.elided} evitadas ({percent:.0f}%)"
+
+
+class GLState:
+    """Tracks the GL binding state and skips redundant calls."""
+
+    def __init__(self):
+        self.issued = 0
+        self.elided = 0
+        self.last_frame = None
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget everything; the next call of each kind is always issued."""
+        self.program = None
+        self.vertex_array = None
+        self.unit = None
+        self.textures = {}
+        self.draw_framebuffer = None
+        self.read_framebuffer = None
+        self.viewport_rect = None
+
+    def forget_texture(self, unit):
+        """Forget the textures bound to a unit (changed outside the cache)."""
+        for key in [key for key in self.textures if key[0] == unit]:
+            del self.textures[key]
+
+    def count(self, changed):
+        if changed:
+            self.issued += 1
+        else:
+            self.elided += 1
+        return changed
+
+    def use_program(self, program):
+        """glUseProgram, if the program is not already in use."""
+        if self.count(self.program != program):
+            glUseProgram(program)
+            self.program = program
+
+    def bind_vertex_array(self, vao):
+        """glBindVertexArray, if the vertex array is not already bound."""
+        if self.count(self.vertex_array != vao):
+            glBindVertexArray(vao)
+            self.vertex_array = vao
+
+    def delete_vertex_array(self, vao):
+        """glDeleteVertexArrays; a bound vertex array becomes unbound."""
+        glDeleteVertexArrays(1, [vao])
+        if self.vertex_array == vao:
+            self.vertex_array = 0
+
+    def active_texture(self, unit):
+        """glActiveTexture(GL_TEXTURE0 + unit), if the unit is not already active."""
+        if self.count(self.unit != unit):
+            glActiveTexture(GL_TEXTURE0 + unit)
+            self.unit = unit
+
+    def bind_texture(self, texture, unit=None, target=GL_TEXTURE_2D):
+        """
+        Bind a texture to a texture unit.
+
+        With a unit, the active unit only changes when the bind is issued.
+        To modify a texture (glTexSubImage2D, glTexParameter, ...) call
+        active_texture(unit) and then bind_texture(texture) without a unit.
+
+        Args:
+            texture: Texture name (0 unbinds)
+            unit: Texture unit; None uses the active unit
+            target: Texture target
+        """
+        if unit is not None:
+            if self.count(self.textures.get((unit, target)) != texture):
+                self.active_texture(unit)
+                glBindTexture(target, texture)
+                self.textures[(unit, target)] = texture
+            return
+        if self.unit is None:
+            # Unidade ativa desconhecida: não dá para saber o que está ligado nela
+            glBindTexture(target, texture)
+            self.count(True)
+            return
+        key = (self.unit, target)
+        if self.count(self.textures.get(key) != texture):
+            glBindTexture(target, texture)
+            self.textures[key] = texture
+
+    def bind_framebuffer(self, target, framebuffer):
+        """
+        glBindFramebuffer, skipped when the framebuffer is already bound.
+
+        Args:
+            target: GL_FRAMEBUFFER (draw and read), GL_DRAW_FRAMEBUFFER or GL_READ_FRAMEBUFFER
+            framebuffer: Framebuffer name (0 is the default framebuffer)
+        """
+        draw = target in (GL_FRAMEBUFFER, GL_DRAW_FRAMEBUFFER)
+        read = target in (GL_FRAMEBUFFER, GL_READ_FRAMEBUFFER)
+        changed = (draw and self.draw_framebuffer != framebuffer) or (read and self.read_framebuffer != framebuffer)
+        if self.count(changed):
+            glBindFramebuffer(target, framebuffer)
+            if draw:
+                self.draw_framebuffer = framebuffer
+            if read:
+                self.read_framebuffer = framebuffer
+
+    def viewport(self, x, y, width, height):
+        """glViewport, if the rectangle changed."""
+        rect = (x, y, width, height)
+        if self.count(self.viewport_rect != rect):
+            glViewport(x, y, width, height)
+            self.viewport_rect = rect
+
+    def end_frame(self):
+        """
+        Close the counters of the frame.
+
+        Returns:
+            GLStateStats of the frame that ended
+        """
+        self.last_frame = GLStateStats(self.issued, self.elided)
+        self.issued = 0
+        self.elided = 0
+        return self.last_frame
+
+
+# Estado do contexto atual (o renderizador usa um contexto por vez)
+gl_state = GLState()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Out-of-core geometry building.
+
+StreamingGeometry consumes vertex and index data in chunks (from a generator,
+or from slices of memory-mapped arrays) and interleaves each chunk straight
+into its place in a preallocated output, which can be an np.memmap file. The
+result is then uploaded to the GPU in slices with glBufferSubData, so the
+memory in use at any time is one chunk plus one slice, whatever the size of
+the mesh.
+"""
+
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.graphics.geometry import index_type, interleave_attributes, set_vertex_layout, vertex_attributes
+from renderizador.graphics.state import gl_state
+
+FLOATS_PER_VERTEX = 11
+
+# Tamanho padrão de cada envio com glBufferSubData (bytes)
+SLICE_BYTES = 16 << 20
+
+
+class StreamingGeometry:
+    """Geometry assembled chunk by chunk into a preallocated or memory-mapped buffer."""
+
+    def __init__(self, mode, vertex_count, index_count=0, path=None, out=None):
+        """
+        Allocate the output buffers.
+
+        Args:
+            mode: OpenGL drawing mode
+            vertex_count: Total number of vertices that will be added
+            index_count: Total number of indices (0 for glDrawArrays geometry)
+            path: Optional file prefix; the buffers are np.memmap files
+                "<path>.vertices" and "<path>.index" instead of RAM arrays
+            out: Optional preallocated (vertex_count, 11) float32 array for the vertices
+        """
+        self.mode = mode
+        self.vertex_count = int(vertex_count)
+        self.index_count = int(index_count)
+        shape = (self.vertex_count, FLOATS_PER_VERTEX)
+
+        if out is not None:
+            if out.shape != shape or out.dtype != np.float32:
+                raise ValueError(f"out must be a float32 array with shape {shape}")
+            self.data = out
+        elif path is not None:
+            self.data = np.memmap(f"{path}.vertices", np.float32, "w+", shape=shape)
+        else:
+            self.data = np.empty(shape, np.float32)
+
+        self.index = None
+        if self.index_count:
+            dtype = np.uint16 if self.vertex_count <= 0x10000 else np.uint32
+            if path is not None:
+                self.index = np.memmap(f"{path}.index", dtype, "w+", shape=(self.index_count,))
+            else:
+                self.index = np.empty(self.index_count, dtype)
+
+        # Posições de escrita dos próximos blocos
+        self.vertices_written = 0
+        self.indices_written = 0
+
+        self.vao = None
+        self.buffers = []
+
+    @property
+    def count(self):
+        """Number of vertices (or indices) drawn."""
+        return self.index_count if self.index is not None else self.vertex_count
+
+    def add_vertices(self, vertices, normals=None, colors=None, uvs=None):
+        """
+        Interleave a chunk of vertices into the next rows of the output.
+
+        Args:
+            vertices: (N,3) array of positions
+            normals: Optional (N,3) array of normals
+            colors: Optional (N,3) array of colors
+            uvs: Optional (N,2) array of texture coordinates
+        """
+        vertices, normals, colors, uvs = vertex_attributes(vertices, normals, colors, uvs)
+        start = self.vertices_written
+        stop = start + vertices.shape[0]
+        if stop > self.vertex_count:
+            raise ValueError("more vertices than the declared vertex_count")
+
+        interleave_attributes(vertices, normals, colors, uvs, out=self.data[start:stop])
+        self.vertices_written = stop
+
+    def add_index(self, index):
+        """
+        Copy a chunk of indices (global vertex numbers) into the output.
+
+        Args:
+            index: 1D array-like of vertex indices
+        """
+        index = np.asarray(index).reshape(-1)
+        start = self.indices_written
+        stop = start + index.size
+        if self.index is None or stop > self.index_count:
+            raise ValueError("more indices than the declared index_count")
+        if index.size and (index.min() < 0 or index.max() >= self.vertex_count):
+            raise ValueError("index refers to a vertex outside the geometry")
+
+        self.index[start:stop] = index
+        self.indices_written = stop
+
+    def consume(self, chunks, index_chunks=()):
+        """
+        Add every chunk produced by iterables of vertex and index data.
+
+        Args:
+            chunks: Iterable of (N,3) position arrays, tuples
+                (vertices, normals, colors, uvs) or dicts with those keys
+            index_chunks: Iterable of index arrays
+
+        Returns:
+            self
+        """
+        for chunk in chunks:
+            if isinstance(chunk, dict):
+                self.add_vertices(**chunk)
+            elif isinstance(chunk, tuple):
+                self.add_vertices(*chunk)
+            else:
+                self.add_vertices(chunk)
+        for index in index_chunks:
+            self.add_index(index)
+        return self
+
+    def flush(self):
+        """Write memory-mapped buffers to disk."""
+        for array in (self.data, self.index):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def upload(self, slice_bytes=SLICE_BYTES):
+        """
+        Create the VAO and upload the buffers in slices.
+
+        Args:
+            slice_bytes: Size of each glBufferSubData call
+
+        Returns:
+            VAO
+        """
+        if self.vertices_written != self.vertex_count or self.indices_written != self.index_count:
+            raise ValueError("the geometry was not completely written")
+
+        self.vao = glGenVertexArrays(1)
+        gl_state.bind_vertex_array(self.vao)
+
+        vertex_buffer = upload_in_slices(GL_ARRAY_BUFFER, self.data, slice_bytes)
+        set_vertex_layout()
+        self.buffers = [vertex_buffer]
+
+        if self.index is not None:
+            self.buffers.append(upload_in_slices(GL_ELEMENT_ARRAY_BUFFER, self.index, slice_bytes))
+
+        gl_state.bind_vertex_array(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        return self.vao
+
+    def draw(self):
+        """Draw the geometry."""
+        gl_state.bind_vertex_array(self.vao)
+        if self.index is not None:
+            glDrawElements(self.mode, self.count, index_type(self.index), None)
+        else:
+            glDrawArrays(self.mode, 0, self.count)
+
+    def delete(self):
+        """Release the GL resources."""
+        if self.vao is None:
+            return
+        glDeleteBuffers(len(self.buffers), self.buffers)
+        gl_state.delete_vertex_array(self.vao)
+        self.vao = None
+        self.buffers = []
+
+
+def upload_in_slices(target, array, slice_bytes=SLICE_BYTES):
+    """
+    Create a buffer and fill it with glBufferSubData, one slice of rows at a time.
+
+    Only one slice of a memory-mapped array has to be paged in at once.
+
+    Args:
+        target: GL_ARRAY_BUFFER or GL_ELEMENT_ARRAY_BUFFER
+        array: Array whose first axis is split into slices
+        slice_bytes: Approximate size of each slice
+
+    Returns:
+        Buffer name, left bound to target
+    """
+    buffer = glGenBuffers(1)
+    glBindBuffer(target, buffer)
+    glBufferData(target, array.nbytes, None, GL_STATIC_DRAW)
+
+    row_bytes = array.nbytes // max(array.shape[0], 1)
+    rows = max(slice_bytes // max(row_bytes, 1), 1)
+    for start in range(0, array.shape[0], rows):
+        part = np.ascontiguousarray(array[start:start + rows])
+        glBufferSubData(target, start * row_bytes, part.nbytes, part)
+    return buffer
+
+
+def iter_chunks(vertices, normals=None, colors=None, uvs=None, chunk_size=1 << 20):
+    """
+    Split attribute arrays (e.g. np.load(..., mmap_mode="r")) into chunks.
+
+    Args:
+        vertices: (N,3) array
+        normals, colors, uvs: Optional arrays with N rows
+        chunk_size: Vertices per chunk
+
+    Yields:
+        Tuples (vertices, normals, colors, uvs) of slices
+    """
+    for start in range(0, vertices.shape[0], chunk_size):
+        stop = start + chunk_size
+        yield tuple(None if a is None else a[start:stop] for a in (vertices, normals, colors, uvs))
@@ -9,6 +9,7 @@ from PIL import Image
 import numpy as np
 from OpenGL.GL import *
 from renderizador.utils.utils import get_pointer
+from renderizador.graphics.state import gl_state
 
 class Texture:
     """Class representing a texture."""
@@ -54,7 +55,7 @@ def parse_textures(textures):
     
         texture.texture_id = glGenTextures(1)
         
-        glBindTexture(GL_TEXTURE_2D, texture.texture_id)
+        gl_state.bind_texture(texture.texture_id)
 
         # detectar número de canais e usar formato/ internalformat corretos
         if texture.image.ndim == 3:
@@ -86,4 +87,4 @@ def parse_textures(textures):
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, texture.filter)
 
         # unbind textura
-        glBindTexture(GL_TEXTURE_2D, 0)
\ No newline at end of file
+        gl_state.bind_texture(0)
\ No newline at end of file
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Render at a fraction of the output resolution and upscale the result.
+
+Upscaler owns a framebuffer the size of the output. The scene is drawn into
+its lower-left corner (viewport of the scaled size), so changing the scale
+never reallocates it; only a new output size does. The corner is then drawn
+over the output with bilinear filtering, optionally followed by a sharpening
+filter: an unsharp mask over the four neighbours, clamped to their range so
+edges do not ring.
+"""
+
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.graphics.framebuffer import Framebuffer
+from renderizador.graphics.geometry import parse_geometry
+from renderizador.graphics.primitives import fullscreen_quad
+from renderizador.graphics.shaders import compile_shader, link_shader
+from renderizador.graphics.state import gl_state
+
+FILTERS = ("bilinear", "sharpen")
+
+UPSCALE_VERTEX_SHADER = r'''#version 330 core
+layout (location = 0) in vec3 position;
+uniform vec2 uv_scale;
+out vec2 uv;
+void main() {
+    uv = (position.xy * 0.5 + 0.5) * uv_scale;
+    gl_Position = vec4(position, 1.0);
+}
+'''
+
+UPSCALE_FRAGMENT_SHADER = r'''#version 330 core
+uniform sampler2D source;
+uniform vec2 texel;
+uniform vec2 uv_max;
+uniform float sharpness;
+in vec2 uv;
+out vec4 fragColor;
+
+// Não lê fora da região desenhada (o resto da textura é de quadros antigos)
+vec3 sample_at(vec2 p) {
+    return texture(source, clamp(p, 0.5 * texel, uv_max)).rgb;
+}
+
+void main() {
+    vec3 color = sample_at(uv);
+    if (sharpness > 0.0) {
+        vec3 n = sample_at(uv + vec2(0.0, texel.y));
+        vec3 s = sample_at(uv - vec2(0.0, texel.y));
+        vec3 e = sample_at(uv + vec2(texel.x, 0.0));
+        vec3 w = sample_at(uv - vec2(texel.x, 0.0));
+        vec3 low = min(color, min(min(n, s), min(e, w)));
+        vec3 high = max(color, max(max(n, s), max(e, w)));
+        color = clamp(color + sharpness * (4.0 * color - n - s - e - w), low, high);
+    }
+    fragColor = vec4(color, 1.0);
+}
+'''
+
+
+class Upscaler:
+    """Scaled render target and the pass that upscales it to the output."""
+
+    def __init__(self, filter="bilinear", sharpness=0.5):
+        """
+        Args:
+            filter: "bilinear" or "sharpen"
+            sharpness: Strength of the sharpening filter (0-1)
+        """
+        if filter not in FILTERS:
+            raise ValueError(f"filter must be one of {FILTERS}")
+        self.filter = filter
+        self.sharpness = sharpness
+        self.framebuffer = None
+        self.program_id = None
+        self.quad = None
+        self.size = None
+
+    def setup(self):
+        """Compile the upscaling program (needs a current context)."""
+        vertex_shader = compile_shader(GL_VERTEX_SHADER, UPSCALE_VERTEX_SHADER)
+        fragment_shader = compile_shader(GL_FRAGMENT_SHADER, UPSCALE_FRAGMENT_SHADER)
+        self.program_id = link_shader(vertex_shader, fragment_shader)
+        glDeleteShader(vertex_shader)
+        glDeleteShader(fragment_shader)
+
+        self.locations = {
+            name: glGetUniformLocation(self.program_id, name)
+            for name in ("source", "uv_scale", "texel", "uv_max", "sharpness")
+        }
+        gl_state.use_program(self.program_id)
+        glUniform1i(self.locations["source"], 0)
+
+        data, layout = fullscreen_quad(with_uv=False).vertex_layout()
+        self.quad, _ = parse_geometry(data, GL_TRIANGLE_STRIP, 4, None, layout)
+
+    def begin(self, width, height, scale):
+        """
+        Bind the scaled target for drawing.
+
+        Args:
+            width, height: Output size
+            scale: Fraction of the output size to render
+
+        Returns:
+            (fbo, (scaled width, scaled height))
+        """
+        if self.framebuffer is None or self.framebuffer.size != (width, height):
+            if self.framebuffer is not None:
+                self.framebuffer.delete()
+            self.framebuffer = Framebuffer(width, height)
+        self.size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+        gl_state.bind_framebuffer(GL_FRAMEBUFFER, self.framebuffer.fbo)
+        gl_state.viewport(0, 0, *self.size)
+        # O glClear da cena só apaga a região usada
+        glEnable(GL_SCISSOR_TEST)
+        glScissor(0, 0, *self.size)
+        return self.framebuffer.fbo, self.size
+
+    def present(self, fbo, width, height):
+        """
+        Draw the scaled image over the whole output.
+
+        Args:
+            fbo: Output framebuffer (0 for the window)
+            width, height: Output size
+        """
+        texture_width, texture_height = self.framebuffer.size
+        texel = np.array([1.0 / texture_width, 1.0 / texture_height], np.float32)
+        uv_scale = np.array([self.size[0] / texture_width, self.size[1] / texture_height], np.float32)
+
+        glDisable(GL_SCISSOR_TEST)
+        gl_state.bind_framebuffer(GL_FRAMEBUFFER, fbo)
+        gl_state.viewport(0, 0, width, height)
+        gl_state.use_program(self.program_id)
+        gl_state.bind_texture(self.framebuffer.texture, 0)
+        glUniform2f(self.locations["uv_scale"], *uv_scale)
+        glUniform2f(self.locations["texel"], *texel)
+        glUniform2f(self.locations["uv_max"], *(uv_scale - 0.5 * texel))
+        glUniform1f(self.locations["sharpness"], self.sharpness if self.filter == "sharpen" else 0.0)
+
+        # Cobre a saída inteira: sem teste de profundidade
+        glDisable(GL_DEPTH_TEST)
+        gl_state.bind_vertex_array(self.quad)
+        glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+        glEnable(GL_DEPTH_TEST)
+
+    def delete(self):
+        """Release the target, the program and the quad."""
+        if self.framebuffer is not None:
+            self.framebuffer.delete()
+            self.framebuffer = None
+        if self.program_id is not None:
+            glDeleteProgram(self.program_id)
+            self.program_id = None
+        if self.quad is not None:
+            gl_state.delete_vertex_array(self.quad)
+            self.quad = None
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Vertex layouts and compact packed vertex formats.
+
+A VertexLayout describes where each attribute lives inside an interleaved
+vertex record (location, component count, GL type, normalization and byte
+offset) and sets the matching glVertexAttribPointer calls. VertexFormat packs
+vertex attributes into compact encodings:
+
+    position: "float32" (12 bytes), "float16" (8 bytes) or "int16" (8 bytes,
+              quantized over the mesh bounding box)
+    normal:   "float32" (12 bytes) or "int2_10_10_10" (4 bytes)
+    color:    "float32" (12 bytes) or "uint8" (4 bytes, normalized)
+    uv:       "float32" (8 bytes) or "float16" (4 bytes)
+
+Attributes that a mesh does not have are left out of the record instead of
+being filled with default values.
+"""
+
+import ctypes
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+from OpenGL.GL import *
+
+from renderizador.utils.transformations import scale, translate
+
+# Locations usadas pelos shaders do projeto para cada atributo
+ATTRIBUTE_LOCATIONS = {"position": 0, "normal": 1, "color": 2, "uv": 3}
+
+# Valores usados pelo shader quando o atributo não está no buffer
+ATTRIBUTE_DEFAULTS = {"normal": (0.0, 0.0, 1.0), "color": (1.0, 1.0, 1.0)}
+
+
+@dataclass(frozen=True)
+class VertexAttribute:
+    """One attribute inside an interleaved vertex record."""
+
+    name: str
+    location: int
+    components: int
+    gl_type: int
+    normalized: bool
+    offset: int
+
+
+@dataclass(frozen=True)
+class VertexLayout:
+    """Interleaved vertex record: stride in bytes and attribute descriptions."""
+
+    stride: int
+    attributes: Tuple[VertexAttribute, ...]
+
+    def apply(self):
+        """Configure the attribute pointers of the bound VAO for the bound GL_ARRAY_BUFFER."""
+        present = set()
+        for attribute in self.attributes:
+            glVertexAttribPointer(
+                attribute.location,
+                attribute.components,
+                attribute.gl_type,
+                GL_TRUE if attribute.normalized else GL_FALSE,
+                self.stride,
+                ctypes.c_void_p(attribute.offset),
+            )
+            glEnableVertexAttribArray(attribute.location)
+            present.add(attribute.name)
+
+        # Atributos ausentes leem o valor genérico constante do contexto
+        for name, value in ATTRIBUTE_DEFAULTS.items():
+            if name not in present:
+                glVertexAttrib3f(ATTRIBUTE_LOCATIONS[name], *value)
+
+    @classmethod
+    def from_offsets(cls, stride, offsets, components):
+        """
+        Build a float32 layout from byte offsets, as returned by Mesh.interleaved.
+
+        Args:
+            stride: Stride in bytes
+            offsets: Dict mapping attribute name -> byte offset
+            components: Dict mapping attribute name -> number of components
+
+        Returns:
+            VertexLayout
+        """
+        attributes = tuple(
+            VertexAttribute(name, ATTRIBUTE_LOCATIONS[name], components[name], GL_FLOAT, False, offset)
+            for name, offset in offsets.items()
+        )
+        return cls(stride, attributes)
+
+
+# Layout padrão do projeto: posição, normal, cor e uv em 11 floats
+DEFAULT_LAYOUT = VertexLayout.from_offsets(
+    (3 + 3 + 3 + 2) * 4,
+    {"position": 0, "normal": 3 * 4, "color": 6 * 4, "uv": 9 * 4},
+    {"position": 3, "normal": 3, "color": 3, "uv": 2},
+)
+
+
+# Codificações: (dtype numpy de um componente, componentes armazenados, tipo GL, normalizado)
+ENCODINGS = {
+    "position": {
+        "float32": (np.float32, 3, GL_FLOAT, False),
+        "float16": (np.float16, 4, GL_HALF_FLOAT, False),
+        "int16": (np.int16, 4, GL_SHORT, True),
+    },
+    "normal": {
+        "float32": (np.float32, 3, GL_FLOAT, False),
+        "int2_10_10_10": (np.uint32, 1, GL_INT_2_10_10_10_REV, True),
+    },
+    "color": {
+        "float32": (np.float32, 3, GL_FLOAT, False),
+        "uint8": (np.uint8, 4, GL_UNSIGNED_BYTE, True),
+    },
+    "uv": {
+        "float32": (np.float32, 2, GL_FLOAT, False),
+        "float16": (np.float16, 2, GL_HALF_FLOAT, False),
+    },
+}
+
+
+class VertexFormat:
+    """Choice of encoding for each vertex attribute."""
+
+    def __init__(self, position="float32", normal="float32", color="float32", uv="float32"):
+        """
+        Initialize the vertex format.
+
+        Args:
+            position: "float32", "float16" or "int16"
+            normal: "float32" or "int2_10_10_10"
+            color: "float32" or "uint8"
+            uv: "float32" or "float16"
+        """
+        self.encodings = {"position": position, "normal": normal, "color": color, "uv": uv}
+        for name, encoding in self.encodings.items():
+            if encoding not in ENCODINGS[name]:
+                raise ValueError(f"unsupported {name} encoding: {encoding}")
+
+    @classmethod
+    def compact(cls):
+        """Smallest format: 8-byte positions, 4-byte normals, colors and uvs."""
+        return cls(position="float16", normal="int2_10_10_10", color="uint8", uv="float16")
+
+    def pack(self, vertices, normals=None, colors=None, uvs=None):
+        """
+        Pack vertex attributes into one interleaved byte buffer.
+
+        Args:
+            vertices: (N,3) float32 array
+            normals: (N,3) float32 array or None
+            colors: (N,3) float32 array or None
+            uvs: (N,2) float32 array or None
+
+        Returns:
+            Tuple of (data, layout, transform): data is a flat uint8 array, layout
+            the matching VertexLayout and transform a 4x4 matrix that maps the
+            stored positions back to the original ones (identity unless
+            positions are quantized to int16)
+        """
+        arrays = {"position": vertices, "normal": normals, "color": colors, "uv": uvs}
+        transform = np.identity(4, np.float32)
+
+        # Monta um dtype estruturado com os campos presentes, alinhados em 4 bytes
+        names, formats, offsets, attributes = [], [], [], []
+        offset = 0
+        for name, array in arrays.items():
+            if array is None:
+                continue
+            dtype, stored, gl_type, normalized = ENCODINGS[name][self.encodings[name]]
+            components = 3 if gl_type == GL_INT_2_10_10_10_REV else min(stored, array.shape[1])
+            names.append(name)
+            formats.append((dtype, stored) if stored > 1 else dtype)
+            offsets.append(offset)
+            attributes.append(VertexAttribute(
+                name, ATTRIBUTE_LOCATIONS[name], 4 if gl_type == GL_INT_2_10_10_10_REV else components,
+                gl_type, normalized, offset
+            ))
+            offset += -(-np.dtype(dtype).itemsize * stored // 4) * 4
+
+        record = np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": offset})
+        packed = np.zeros(vertices.shape[0], record)
+
+        for name in names:
+            encoding = self.encodings[name]
+            field = packed[name]
+            if name == "position" and encoding == "int16":
+                quantized, transform = quantize_positions(vertices)
+                field[:, :3] = quantized
+                field[:, 3] = 32767
+            elif name == "position" and encoding == "float16":
+                field[:, :3] = vertices
+                field[:, 3] = 1.0
+            elif name == "normal" and encoding == "int2_10_10_10":
+                packed[name] = pack_int_2_10_10_10(normals)
+            elif name == "color" and encoding == "uint8":
+                field[:, :3] = np.round(np.clip(colors, 0.0, 1.0) * 255.0)
+                field[:, 3] = 255
+            else:
+                field[:] = arrays[name]
+
+        layout = VertexLayout(record.itemsize, tuple(attributes))
+        return packed.view(np.uint8).reshape(-1), layout, transform
+
+
+def quantize_positions(vertices):
+    """
+    Quantize positions to int16 over the bounding box of the mesh.
+
+    Args:
+        vertices: (N,3) float32 array
+
+    Returns:
+        Tuple of ((N,3) int16 array, 4x4 matrix mapping normalized shorts back to positions)
+    """
+    low = vertices.min(axis=0) if vertices.size else np.zeros(3, np.float32)
+    high = vertices.max(axis=0) if vertices.size else np.zeros(3, np.float32)
+    center = (low + high) / 2
+    half = np.maximum((high - low) / 2, np.finfo(np.float32).tiny)
+
+    quantized = np.round((vertices - center) / half * 32767.0).astype(np.int16)
+    return quantized, translate(*center) @ scale(*half)
+
+
+def pack_int_2_10_10_10(normals):
+    """
+    Pack unit normals into signed normalized 10:10:10:2 integers (GL_INT_2_10_10_10_REV).
+
+    Args:
+        normals: (N,3) float array
+
+    Returns:
+        (N,) uint32 array
+    """
+    values = np.round(np.clip(normals, -1.0, 1.0) * 511.0).astype(np.int32) & 0x3FF
+    return (values[:, 0] | (values[:, 1] << 10) | (values[:, 2] << 20)).astype(np.uint32)
@@ -12,12 +12,14 @@ Módulo de utilitários contendo funções auxiliares, transformações, callbac
 """
 
 from renderizador.utils.callbacks import Callbacks
-from renderizador.utils.uniforms import parse_uniforms
+from renderizador.utils.uniforms import parse_uniforms, bind_uniforms, set_uniforms
 from renderizador.utils.transformations import translate, rotate, scale, normalize
 
 __all__ = [
     'Callbacks',
     'parse_uniforms',
+    'bind_uniforms',
+    'set_uniforms',
     'get_pointer',
     'translate',
     'rotate',
@@ -113,8 +113,11 @@ class Callbacks:
 
     @staticmethod
     def framebuffer_size_callback(window, width, height):
+        # Import local: o pacote graphics importa este módulo (câmera)
+        from renderizador.graphics.state import gl_state
+
         # Ajusta o tamanho do ViewPort
-        glViewport(0, 0, width, height)
+        gl_state.viewport(0, 0, width, height)
         # Guarda a nova resolucao
         Callbacks.resolution = (width, height)
         Callbacks.framebuffer_size = [width, height]
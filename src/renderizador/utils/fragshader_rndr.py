@@ -17,6 +17,7 @@ import argparse
 from pathlib import Path
 
 from renderizador import Renderizador
+from renderizador.graphics.multipass import BUFFER_NAMES
 from renderizador.utils.transformations import *
 
 IMG_EXTS = ('.png', '.jpg', '.jpeg', '.bmp', '.tga', '.gif', '.tiff')
@@ -24,6 +25,9 @@ AUDIO_EXTS = ('.wav', '.mp3', '.ogg')
 
 
 def set_channel(res: Renderizador, path_str: str, idx: int):
+    if path_str.upper() in BUFFER_NAMES:
+        res.set_buffer_channel(path_str.upper(), idx)
+        return
     p = Path(path_str)
     ext = p.suffix.lower()
     if ext in IMG_EXTS:
@@ -34,6 +38,20 @@ def set_channel(res: Renderizador, path_str: str, idx: int):
         print(f"Erro: Formato não suportado para iChannel{idx}: {p}")
         sys.exit(1)
 
+def add_buffer(res: Renderizador, args):
+    """Add a buffer pass from the --buffer arguments: name, file and CHANNEL=INPUT pairs."""
+    if len(args) < 2 or args[0].upper() not in BUFFER_NAMES:
+        print(f"Erro: use --buffer NOME ARQUIVO [CANAL=ENTRADA ...] com NOME em {', '.join(BUFFER_NAMES)}")
+        sys.exit(1)
+    channels = {}
+    for wiring in args[2:]:
+        channel, _, source = wiring.partition('=')
+        if not channel.isdigit() or not source:
+            print(f"Erro: canal inválido '{wiring}' (use CANAL=ENTRADA, ex.: 0=A)")
+            sys.exit(1)
+        channels[int(channel)] = source.upper() if source.upper() in BUFFER_NAMES else source
+    res.add_buffer(args[0].upper(), load_fragment_shader(args[1]), channels)
+
 def load_fragment_shader(file_path):
     """
     Load fragment shader from a file.
@@ -64,11 +82,44 @@ def main():
                         help='Caminho para o arquivo .frag a ser renderizado')
     parser.add_argument('--resolution', '-r', nargs=2, type=int, default=[600, 400],
                         help='Resolução da janela (largura altura), ex: -r 800 600')
+    parser.add_argument('--pacing', choices=['vsync', 'uncapped', 'fixed', 'adaptive'], default='vsync',
+                        help='Ritmo dos quadros (fixed usa --fps)')
+    parser.add_argument('--fps', type=float, default=60.0,
+                        help='Taxa de quadros alvo do modo fixed (e do relógio no modo sem janela)')
+    parser.add_argument('--stats', action='store_true',
+                        help='Mostra os tempos de quadro, o estado GL e os tempos por passo ao fechar a janela')
+    parser.add_argument('--headless', choices=['egl', 'osmesa'], default=None,
+                        help='Renderiza sem janela (EGL ou OSMesa) num framebuffer')
+    parser.add_argument('--frames', type=int, default=1,
+                        help='Número de quadros renderizados no modo sem janela')
+    parser.add_argument('--output', '-o', default=None,
+                        help='Grava os quadros: saida/quadro_{:05d}.png, saida.raw (RGB24) ou video.mp4 (ffmpeg)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Escala da resolução interna (ex.: 0.5 desenha com metade da largura e da altura)')
+    parser.add_argument('--target-fps', type=float, default=None,
+                        help='Ajusta a escala a cada quadro para manter esta taxa de quadros')
+    parser.add_argument('--upscale', choices=['bilinear', 'sharpen'], default='bilinear',
+                        help='Filtro usado para ampliar a imagem desenhada em escala reduzida')
+    parser.add_argument('--progressive', action='store_true',
+                        help='Desenha a imagem aos poucos, em ladrilhos espalhados por vários quadros')
+    parser.add_argument('--tile-size', type=int, default=128,
+                        help='Tamanho dos ladrilhos do modo progressivo (pixels)')
+    parser.add_argument('--tile-budget', type=float, default=10.0,
+                        help='Tempo por quadro gasto com ladrilhos no modo progressivo (ms)')
     for i in range(4):
         parser.add_argument(f'--iChannel{i}', default=None,
-                            help=f'Caminho para textura ou áudio no iChannel{i}')
+                            help=f'Caminho para textura ou áudio no iChannel{i}, ou um buffer (A-D)')
+    parser.add_argument('--buffer', nargs='+', action='append', default=[], metavar='ARG',
+                        help='Passo Buffer A-D: NOME ARQUIVO [CANAL=ENTRADA ...], '
+                             'ex.: --buffer A buffer_a.frag 0=A 1=textura.png')
   
     args = parser.parse_args()
+
+    # O PyOpenGL escolhe a plataforma (GLX, EGL, OSMesa) ao ser importado:
+    # reinicia o processo com a plataforma do backend sem janela
+    if args.headless and os.environ.get('PYOPENGL_PLATFORM') != args.headless:
+        env = dict(os.environ, PYOPENGL_PLATFORM=args.headless)
+        os.execve(sys.executable, [sys.executable] + sys.argv, env)
     
     # Determine fragment shader file path
     if args.frag_file:
@@ -112,24 +163,40 @@ def main():
                     print("Entrada inválida. Digite um número.")
     
     # Criando renderizador
-    renderizador = Renderizador(resolution=(args.resolution[0], args.resolution[1]), lock_mouse=False)
+    renderizador = Renderizador(resolution=(args.resolution[0], args.resolution[1]), lock_mouse=False,
+                                backend=args.headless or 'glfw')
    
     for i in range(4):
         chan = getattr(args, f'iChannel{i}')
         if chan:
             set_channel(renderizador, chan, i)
 
+    for buffer_args in args.buffer:
+        add_buffer(renderizador, buffer_args)
+
     # Carregar o shader do arquivo
     text = load_fragment_shader(frag_file)
     
     # Set window title to show which file is being rendered
     file_name = os.path.basename(frag_file)
     renderizador.set_title(f"Fragment Shader: {file_name}")
+    renderizador.set_frame_pacing(args.pacing, args.fps)
+    renderizador.set_stats_report(args.stats)
+    if args.scale != 1.0 or args.target_fps is not None:
+        renderizador.set_render_scale(args.scale, args.upscale, args.target_fps)
+    if args.progressive:
+        renderizador.set_progressive(tile_size=args.tile_size, budget=args.tile_budget / 1000.0)
     
     # Passando Shaders e renderizando cena
     renderizador.set_shaders(fragment_shader_source=text)
 
-    renderizador.render()
+    if args.output:
+        renderizador.set_capture(args.output, fps=args.fps)
+
+    if args.headless:
+        renderizador.render(frames=args.frames, fps=args.fps)
+    else:
+        renderizador.render()
 
 if __name__ == '__main__':
     main()
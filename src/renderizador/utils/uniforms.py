@@ -3,14 +3,58 @@
 
 """
 Uniform parsing for shaders.
+
+parse_uniforms inspects every value on every frame. bind_uniforms does that
+work once, after the program is linked: it asks OpenGL for the real GLSL type
+and array size of each active uniform (glGetActiveUniform) and builds one
+setter per uniform. Constant values are converted once to an array of the
+right type whose ctypes pointer is kept, so a frame costs one GL call per
+uniform. NumPy arrays of the matching dtype are used in place, so changing
+their contents (e.g. model[:] = ...) is seen by the shader; lists and arrays
+of another dtype (e.g. float64 matrices) are converted again every frame,
+like the values returned by callables, so their changes are seen too.
 """
 
+import ctypes
+import numbers
+
 import numpy as np
 from OpenGL.GL import *
-import numbers
+from OpenGL.raw.GL.VERSION import GL_2_0, GL_3_0
 
 from renderizador.utils.utils import get_pointer
 
+# Tipo GLSL -> (função glUniform*v sem os invólucros do PyOpenGL, componentes, dtype, é matriz)
+UNIFORM_TYPES = {
+    GL_FLOAT: (GL_2_0.glUniform1fv, 1, np.float32, False),
+    GL_FLOAT_VEC2: (GL_2_0.glUniform2fv, 2, np.float32, False),
+    GL_FLOAT_VEC3: (GL_2_0.glUniform3fv, 3, np.float32, False),
+    GL_FLOAT_VEC4: (GL_2_0.glUniform4fv, 4, np.float32, False),
+    GL_INT: (GL_2_0.glUniform1iv, 1, np.int32, False),
+    GL_INT_VEC2: (GL_2_0.glUniform2iv, 2, np.int32, False),
+    GL_INT_VEC3: (GL_2_0.glUniform3iv, 3, np.int32, False),
+    GL_INT_VEC4: (GL_2_0.glUniform4iv, 4, np.int32, False),
+    GL_BOOL: (GL_2_0.glUniform1iv, 1, np.int32, False),
+    GL_BOOL_VEC2: (GL_2_0.glUniform2iv, 2, np.int32, False),
+    GL_BOOL_VEC3: (GL_2_0.glUniform3iv, 3, np.int32, False),
+    GL_BOOL_VEC4: (GL_2_0.glUniform4iv, 4, np.int32, False),
+    GL_UNSIGNED_INT: (GL_3_0.glUniform1uiv, 1, np.uint32, False),
+    GL_UNSIGNED_INT_VEC2: (GL_3_0.glUniform2uiv, 2, np.uint32, False),
+    GL_UNSIGNED_INT_VEC3: (GL_3_0.glUniform3uiv, 3, np.uint32, False),
+    GL_UNSIGNED_INT_VEC4: (GL_3_0.glUniform4uiv, 4, np.uint32, False),
+    GL_FLOAT_MAT2: (GL_2_0.glUniformMatrix2fv, 4, np.float32, True),
+    GL_FLOAT_MAT3: (GL_2_0.glUniformMatrix3fv, 9, np.float32, True),
+    GL_FLOAT_MAT4: (GL_2_0.glUniformMatrix4fv, 16, np.float32, True),
+}
+
+# Samplers recebem o número da unidade de textura (int)
+SAMPLER_TYPES = (
+    GL_SAMPLER_1D, GL_SAMPLER_2D, GL_SAMPLER_3D, GL_SAMPLER_CUBE, GL_SAMPLER_2D_SHADOW,
+    GL_SAMPLER_2D_ARRAY, GL_INT_SAMPLER_2D, GL_UNSIGNED_INT_SAMPLER_2D,
+)
+
+CTYPES = {np.float32: ctypes.c_float, np.int32: ctypes.c_int, np.uint32: ctypes.c_uint}
+
 def parse_uniforms(uniforms_source, uniforms):
     """
     Parse and set uniform values for the shader program.
@@ -64,4 +108,142 @@ def parse_uniforms(uniforms_source, uniforms):
             glUniform4f(uniforms[field], value[0], value[1], value[2], value[3])
         
         else:
-            print("Tipo não suportado no uniforms: ", field, value)
\ No newline at end of file
+            print("Tipo não suportado no uniforms: ", field, value)
+
+def active_uniforms(program_id):
+    """
+    List the active uniforms of a linked program.
+
+    Args:
+        program_id: Linked shader program
+
+    Returns:
+        Dictionary name -> (location, GLSL type, array size); arrays are listed
+        both as "name" and "name[0]"
+    """
+    uniforms = {}
+    for i in range(glGetProgramiv(program_id, GL_ACTIVE_UNIFORMS)):
+        name, size, gl_type = glGetActiveUniform(program_id, i)
+        name = name.decode() if isinstance(name, bytes) else name
+        location = glGetUniformLocation(program_id, name)
+        if location < 0:
+            # Uniforms dentro de blocos não têm posição própria
+            continue
+        info = (location, int(gl_type), int(size))
+        uniforms[name] = info
+        if name.endswith("[0]"):
+            uniforms[name[:-3]] = info
+    return uniforms
+
+
+def uniform_array(value, dtype, components, size):
+    """
+    Convert a uniform value to a flat contiguous array of the GLSL type.
+
+    NumPy arrays that already have the right dtype and layout are returned as
+    views of the same memory.
+
+    Returns:
+        Tuple of (array, count) where count is the number of GLSL elements
+    """
+    array = np.ascontiguousarray(value, dtype=dtype).reshape(-1)
+    count = min(array.size // components, size)
+    if count == 0 or array.size % components:
+        raise ValueError(f"value with {array.size} elements for a uniform of {components} components")
+    return array, count
+
+
+def uniform_setter(location, gl_type, size, value, name=None):
+    """
+    Build a function that sets one uniform with a single GL call.
+
+    Args:
+        location: Uniform location
+        gl_type: GLSL type from glGetActiveUniform
+        size: Array size (1 for non-arrays)
+        value: Constant, list or NumPy array (read every frame) or callable
+        name: Uniform name, used in the error messages
+
+    Returns:
+        Function without arguments
+    """
+    if gl_type in SAMPLER_TYPES:
+        gl_type = GL_INT
+    if gl_type not in UNIFORM_TYPES:
+        raise ValueError(f"GLSL type 0x{gl_type:x} is not supported")
+    function, components, dtype, matrix = UNIFORM_TYPES[gl_type]
+    pointer_type = ctypes.POINTER(CTYPES[dtype])
+
+    if callable(value):
+        read = value
+    else:
+        array, count = uniform_array(value, dtype, components, size)
+        # Listas e arranjos de outro dtype podem mudar depois: a cópia convertida ficaria velha
+        if isinstance(value, list) or (isinstance(value, np.ndarray) and not np.shares_memory(array, value)):
+            read = lambda: value
+        else:
+            read = None
+
+    if read is not None:
+        # Valor novo a cada quadro: converte (sem cópia se já estiver no tipo certo) e envia
+        def setter():
+            try:
+                array, count = uniform_array(read(), dtype, components, size)
+            except (ValueError, TypeError) as error:
+                print("Tipo não suportado no uniforms: ", name, error)
+                return
+            if matrix:
+                function(location, count, GL_TRUE, array.ctypes.data_as(pointer_type))
+            else:
+                function(location, count, array.ctypes.data_as(pointer_type))
+        return setter
+
+    pointer = array.ctypes.data_as(pointer_type)
+    if matrix:
+        # As matrizes do NumPy são por linhas: transpose = GL_TRUE
+        def setter():
+            function(location, count, GL_TRUE, pointer)
+    else:
+        def setter():
+            function(location, count, pointer)
+    # Mantém o arranjo vivo enquanto o ponteiro for usado
+    setter.array = array
+    return setter
+
+
+def bind_uniforms(program_id, uniforms_source):
+    """
+    Build the setters of a program's uniforms once, after linking.
+
+    Values whose name is not an active uniform (unused by the shader) are
+    skipped; values that do not fit the GLSL type are reported and skipped.
+
+    Args:
+        program_id: Linked shader program
+        uniforms_source: Dictionary of uniform names and values
+
+    Returns:
+        List of setter functions (see set_uniforms)
+    """
+    active = active_uniforms(program_id)
+    setters = []
+    for field, value in uniforms_source.items():
+        if field not in active:
+            continue
+        location, gl_type, size = active[field]
+        try:
+            setters.append(uniform_setter(location, gl_type, size, value, field))
+        except (ValueError, TypeError) as error:
+            print("Tipo não suportado no uniforms: ", field, value, error)
+    return setters
+
+
+def set_uniforms(setters):
+    """
+    Send the uniforms of the current program.
+
+    Args:
+        setters: List returned by bind_uniforms for the program in use
+    """
+    for setter in setters:
+        setter()
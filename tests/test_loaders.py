@@ -0,0 +1,39 @@
+import numpy as np
+
+from renderizador.graphics import loaders
+from renderizador.graphics.loaders import load_obj
+
+
+def write_obj(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_negative_indices_follow_interleaved_vertices(tmp_path):
+    path = write_obj(tmp_path / "interleaved.obj", (
+        "v 0 0 0\nv 1 0 0\nv 0 1 0\n"
+        "f -3 -2 -1\n"
+        "v 0 0 1\nv 1 0 1\nv 0 1 1\n"
+        "f -3 -2 -1\n"
+    ))
+    mesh = load_obj(path)
+    np.testing.assert_array_equal(mesh.index, [0, 1, 2, 3, 4, 5])
+
+
+def test_negative_indices_match_positive_across_chunks(tmp_path, monkeypatch):
+    lines = []
+    for i in range(50):
+        lines += [f"v {i} 0 0", f"v {i} 1 0", f"v {i} 0 1", f"vn 0 0 {i}"]
+        lines.append("f -3//-1 -2//-1 -1//-1")
+    relative = write_obj(tmp_path / "relative.obj", "\n".join(lines) + "\n")
+
+    absolute = [l for l in lines if not l.startswith("f ")]
+    for i in range(50):
+        absolute.append(f"f {3 * i + 1}//{i + 1} {3 * i + 2}//{i + 1} {3 * i + 3}//{i + 1}")
+    absolute = write_obj(tmp_path / "absolute.obj", "\n".join(absolute) + "\n")
+
+    # Blocos pequenos: as faces ficam espalhadas por vários blocos
+    monkeypatch.setattr(loaders, "CHUNK_BYTES", 64)
+    expected, mesh = load_obj(absolute), load_obj(relative)
+    np.testing.assert_array_equal(mesh.vertices[mesh.index], expected.vertices[expected.index])
+    np.testing.assert_array_equal(mesh.normals[mesh.index], expected.normals[expected.index])
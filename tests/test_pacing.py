@@ -0,0 +1,40 @@
+import numpy as np
+
+from renderizador.core import pacing
+from renderizador.core.pacing import FramePacer
+
+
+def fake_clock(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(pacing.time, "perf_counter", lambda: clock[0])
+    monkeypatch.setattr(pacing, "wait_until", lambda deadline, spin: clock.__setitem__(0, max(clock[0], deadline)))
+    return clock
+
+
+def test_adaptive_period_uses_the_latest_frames_after_the_ring_wraps(monkeypatch):
+    clock = fake_clock(monkeypatch)
+    pacer = FramePacer("adaptive", history=200)
+    pacer.refresh_rate = 60.0
+
+    # Quadros lentos (20 fps) seguidos de quadros rápidos, depois de dar a volta no buffer
+    for work in [0.045] * 300 + [0.005] * 150:
+        clock[0] += work
+        pacer.mark_work_done()
+        pacer.end_frame()
+
+    assert np.isclose(pacer.adaptive_period(), 1 / 60)
+
+
+def test_adaptive_period_ignores_the_vblank_wait_in_the_swap(monkeypatch):
+    clock = fake_clock(monkeypatch)
+    pacer = FramePacer("adaptive")
+    pacer.refresh_rate = 60.0
+
+    # Quadros de 5 ms cuja troca de buffers bloqueia até depois do próximo vblank
+    for frame in range(120):
+        clock[0] += 0.005
+        pacer.mark_work_done()
+        clock[0] += 0.0125
+        pacer.end_frame()
+
+    assert np.isclose(pacer.adaptive_period(), 1 / 60)